@@ -3,7 +3,9 @@ Burokrat.site - Main Application Entry Point
 A modular FastHTML application for a Russian seals and stamps company.
 """
 
+import asyncio
 import logging
+import os
 
 # Configure logging with a clear format
 logging.basicConfig(
@@ -13,24 +15,42 @@ logging.basicConfig(
 )
 
 from fasthtml.common import *
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from src.config import load_page_data
+from src.config import load_page_data, preload_data
 from src.routes import register_all_routes
 from src.db import create_db_and_tables
-from src.models import ContactSubmission, Product, Category  # Import models to register them
+from src.models import ContactSubmission, EmailOutbox, Product, Category  # Import models to register them
+from src.services.email_outbox import get_outbox_dispatcher, dispatcher_mode
+from src.services.product_search import get_product_search, search_enabled, sync_interval
+from src.services.typeahead import get_typeahead
+from src.services.fuzzy_search import get_fuzzy_search
+from src.services.assets import asset_url
+from src.services.critical_css import get_critical_css
+from src.middleware import (
+    CompressionMiddleware, CriticalCssMiddleware, PageCacheMiddleware, compression_enabled,
+    get_compression_cache, get_page_cache, page_cache_enabled,
+)
+
+# Development mode enables live reload and the uvicorn code reloader.
+# YAML data is hot-reloaded by the data store either way, so production
+# can run with DEV_MODE=false.
+DEV_MODE = os.environ.get('DEV_MODE', 'true').lower() == 'true'
 
 # Initialize FastHTML app (ASGI app)
 fh_app, rt = fast_app(
     hdrs=(
-        Link(rel='stylesheet', href='/assets/styles/main.css'),
+        Link(rel='stylesheet', href=asset_url('/assets/styles/main.css')),
         Script(src='https://unpkg.com/htmx.org@1.9.10'),
-        Script(src='/assets/scripts/css-hot-reload.js'),
+        *([Script(src=asset_url('/assets/scripts/css-hot-reload.js'))] if DEV_MODE else []),
     ),
-    live=True
+    live=DEV_MODE
 )
 
-# Load configuration data
+# Load configuration data (all files up front unless DATA_PRELOAD=false)
 load_page_data()
+if os.environ.get('DATA_PRELOAD', 'true').lower() == 'true':
+    preload_data()
 
 # Initialize database
 create_db_and_tables()
@@ -64,15 +84,99 @@ async def custom_404_handler(scope, receive, send):
 # Set the default exception handler for 404 errors
 fh_app.router.default = custom_404_handler
 
-# Create FastAPI app and mount the FastHTML app at root
-app = FastAPI(title="burokrat.site")
-app.mount("/", fh_app)
+@asynccontextmanager
+async def lifespan(app):
+    """Run the contact email outbox dispatcher and the product search indexer alongside the server.
+
+    With EMAIL_DISPATCHER=worker the dispatcher runs in email_worker.py instead.
+    """
+    task = None
+    if dispatcher_mode() == 'inprocess':
+        dispatcher = get_outbox_dispatcher()
+        task = asyncio.create_task(dispatcher.run())
+    indexer_task = None
+    if search_enabled():
+        indexer = get_product_search()
+        indexer_task = asyncio.create_task(indexer.run(sync_interval()))
+    yield
+    if task is not None:
+        dispatcher.stop()
+        await task
+    if indexer_task is not None:
+        indexer.stop()
+        await indexer_task
+
+# Create FastAPI app; API routes are registered before the FastHTML app is
+# mounted at root, otherwise the mount would shadow them
+app = FastAPI(title="burokrat.site", lifespan=lifespan)
 
 @app.get("/api/health")
 def health():
     return {"status": "ok"}
 
+@app.get("/api/cache")
+def cache_stats():
+    """Page cache hit/miss counters."""
+    if not page_cache_enabled():
+        return {"enabled": False}
+    return {"enabled": True, **get_page_cache().stats()}
+
+@app.get("/api/compression")
+def compression_stats():
+    """Response compression ratio, CPU time and compressed-body cache counters."""
+    if not compression_enabled():
+        return {"enabled": False}
+    return {"enabled": True, **get_compression_cache().stats()}
+
+@app.get("/api/email")
+def email_stats():
+    """Outbox delivery and SMTP connection pool counters."""
+    return get_outbox_dispatcher().stats()
+
+@app.get("/api/products/search")
+def search_products(q: str = "", limit: int = 20):
+    """Full-text product search: ranked ids with highlighted snippets."""
+    limit = max(1, min(limit, 100))
+    return {"query": q, "results": get_product_search().search(q, limit=limit)}
+
+@app.get("/api/products/suggest")
+def suggest_products(q: str = "", limit: int = 8):
+    """Typeahead suggestions for the product search box (product and category names)."""
+    suggestions = get_typeahead().suggest(q, limit=max(1, min(limit, 10)))
+    return {
+        "query": q,
+        "suggestions": [{k: s[k] for k in ("type", "id", "label", "url")} for s in suggestions],
+    }
+
+@app.get("/api/search/fuzzy")
+def fuzzy_search(q: str = "", limit: int = 10, type: str = ""):
+    """Typo-tolerant search over product names, category names and FAQ questions.
+
+    ``type`` is an optional comma-separated subset of product,category,faq.
+    """
+    types = {t.strip() for t in type.split(",") if t.strip()} or None
+    results = get_fuzzy_search().search(q, limit=max(1, min(limit, 50)), types=types)
+    return {
+        "query": q,
+        "results": [{k: r[k] for k in ("type", "id", "label", "url", "score")} for r in results],
+    }
+
+# Rendered pages get their critical CSS inlined unless CRITICAL_CSS=false
+# (the static export does this at build time instead)
+pages_app = CriticalCssMiddleware(fh_app, get_critical_css()) if get_critical_css().enabled else fh_app
+
+# Rendered pages are served from the page cache unless PAGE_CACHE_ENABLED=false
+if page_cache_enabled():
+    app.mount("/", PageCacheMiddleware(pages_app, get_page_cache()))
+else:
+    app.mount("/", pages_app)
+
+# Text responses (pages, HTMX fragments, API JSON) are gzip/brotli encoded
+# unless COMPRESSION_ENABLED=false; compressed bodies are cached by body hash
+if compression_enabled():
+    app.add_middleware(CompressionMiddleware, cache=get_compression_cache())
+
 if __name__ == '__main__':
     import uvicorn
     logging.info("🚀 Starting burokrat.site server on http://0.0.0.0:8080")
-    uvicorn.run("app:app", host="0.0.0.0", port=8080, log_level="info", reload=True)
+    uvicorn.run("app:app", host="0.0.0.0", port=8080, log_level="info", reload=DEV_MODE)
@@ -1,5 +1,14 @@
 /**
- * Product Filters - Handles filtering, searching, and sorting of products
+ * Product Filters - Sends filter, search and sort changes to the server
+ *
+ * The server renders one page of matching products; every change requests
+ * the results block from /products-and-services/grid and swaps it in.
+ *
+ * A static deployment has no grid endpoint. When it answers with an error,
+ * or the page was not rendered for the filters in the URL, results are
+ * rendered here from the static catalog API (src/pages/catalog/api.py):
+ * catalog/index.json, then only the category shards that can hold matches
+ * and, for a search, the search index.
  */
 
 (function() {
@@ -16,7 +25,7 @@
     };
 
     // DOM elements
-    let productsGrid;
+    let pageContainer;
     let categoryCheckboxes;
     let priceMinSlider;
     let priceMaxSlider;
@@ -27,13 +36,21 @@
     let clearFiltersBtn;
     let searchInput;
     let sortSelect;
-    let resultsCount;
-    let allProducts = [];
+    let suggestionsList;
+    let requestId = 0;
+    let suggestController = null;
+    let activeSuggestion = -1;
+
+    // Static catalog API: used when the page was exported without a server
+    // (data-static) or once the server turns out to be missing
+    const MIN_STEM_LENGTH = 3;
+    const catalog = { index: null, shards: {}, search: null };
+    let staticMode = false;
 
     // Initialize when DOM is ready
     function init() {
         // Get DOM elements
-        productsGrid = document.getElementById('products-grid');
+        pageContainer = document.querySelector('.products-page-container');
         categoryCheckboxes = document.querySelectorAll('.category-checkbox');
         priceMinSlider = document.getElementById('price-min');
         priceMaxSlider = document.getElementById('price-max');
@@ -44,52 +61,85 @@
         clearFiltersBtn = document.querySelector('.btn-clear-filters');
         searchInput = document.getElementById('product-search');
         sortSelect = document.getElementById('product-sort');
-        resultsCount = document.querySelector('.results-count');
-
-        if (!productsGrid) return;
+        suggestionsList = document.getElementById('product-suggestions');
 
-        // Store all products
-        allProducts = Array.from(productsGrid.querySelectorAll('.product-card'));
+        if (!pageContainer || !document.getElementById('products-results')) return;
 
-        // Calculate actual price range from products
-        calculatePriceRange();
+        // The server rendered the controls for the current filters
+        readStateFromControls();
 
         // Set up event listeners
         setupEventListeners();
 
-        // Initial filter
-        applyFilters();
+        // A static host serves the same page for every query string
+        staticMode = pageContainer.dataset.static === 'true';
+        const query = new URLSearchParams(window.location.search);
+        if (staticMode && canonicalQuery(query) !== canonicalQuery(new URLSearchParams(pageContainer.dataset.query))) {
+            readStateFromQuery(query);
+            showCatalogPage(parseInt(query.get('page'), 10) || 1);
+        }
     }
 
-    // Calculate min/max prices from actual products
-    function calculatePriceRange() {
-        let minPrice = Infinity;
-        let maxPrice = -Infinity;
+    // Filters of a query string in a comparable form
+    function canonicalQuery(params) {
+        const number = value => (value === null || value === '' || isNaN(parseFloat(value)) ? '' : parseFloat(value));
+        return JSON.stringify([
+            params.getAll('category').filter(c => c && c !== 'all').sort(),
+            number(params.get('price_min')),
+            number(params.get('price_max')),
+            ['true', '1', 'on'].indexOf((params.get('in_stock') || '').toLowerCase()) !== -1,
+            (params.get('q') || '').trim(),
+            params.get('sort') || 'featured',
+            Math.max(1, parseInt(params.get('page'), 10) || 1)
+        ]);
+    }
 
-        allProducts.forEach(card => {
-            const priceText = card.querySelector('.product-price').textContent;
-            const price = parseFloat(priceText.replace('$', ''));
-            if (price < minPrice) minPrice = price;
-            if (price > maxPrice) maxPrice = price;
+    // Set the state and the controls from a query string
+    function readStateFromQuery(params) {
+        const categories = params.getAll('category').filter(c => c && c !== 'all');
+        categoryCheckboxes.forEach(cb => {
+            cb.checked = categories.length ? categories.indexOf(cb.value) !== -1 : cb.value === 'all';
         });
+        if (priceMinSlider && priceMaxSlider) {
+            if (params.get('price_min')) priceMinSlider.value = params.get('price_min');
+            if (params.get('price_max')) priceMaxSlider.value = params.get('price_max');
+        }
+        if (stockCheckbox) {
+            stockCheckbox.checked = ['true', '1', 'on'].indexOf((params.get('in_stock') || '').toLowerCase()) !== -1;
+        }
+        if (searchInput) searchInput.value = params.get('q') || '';
+        if (sortSelect && params.get('sort')) sortSelect.value = params.get('sort');
+        readStateFromControls();
+    }
 
-        // Round to nice numbers
-        minPrice = Math.floor(minPrice);
-        maxPrice = Math.ceil(maxPrice);
+    // Read the initial state from the server-rendered controls
+    function readStateFromControls() {
+        state.selectedCategories.clear();
+        categoryCheckboxes.forEach(cb => {
+            if (cb.checked) state.selectedCategories.add(cb.value);
+        });
+        if (state.selectedCategories.size === 0) {
+            state.selectedCategories.add('all');
+        }
 
-        // Update sliders
         if (priceMinSlider && priceMaxSlider) {
-            priceMinSlider.min = minPrice;
-            priceMinSlider.max = maxPrice;
-            priceMinSlider.value = minPrice;
-            
-            priceMaxSlider.min = minPrice;
-            priceMaxSlider.max = maxPrice;
-            priceMaxSlider.value = maxPrice;
+            state.priceMin = parseFloat(priceMinSlider.value);
+            state.priceMax = parseFloat(priceMaxSlider.value);
+            updatePriceDisplay();
+        }
 
-            state.priceMin = minPrice;
-            state.priceMax = maxPrice;
+        state.inStockOnly = stockCheckbox ? stockCheckbox.checked : false;
+        state.searchQuery = searchInput ? searchInput.value.trim() : '';
+        state.sortBy = sortSelect ? sortSelect.value : 'featured';
+    }
 
+    // Reset price sliders to the full catalog range
+    function resetPriceRange() {
+        if (priceMinSlider && priceMaxSlider) {
+            priceMinSlider.value = priceMinSlider.min;
+            priceMaxSlider.value = priceMaxSlider.max;
+            state.priceMin = parseFloat(priceMinSlider.min);
+            state.priceMax = parseFloat(priceMaxSlider.max);
             updatePriceDisplay();
         }
     }
@@ -101,12 +151,13 @@
             checkbox.addEventListener('change', handleCategoryChange);
         });
 
-        // Price sliders
+        // Price sliders (display updates immediately, results once dragging pauses)
+        const applyFiltersDebounced = debounce(applyFilters, 250);
         if (priceMinSlider) {
-            priceMinSlider.addEventListener('input', handlePriceMinChange);
+            priceMinSlider.addEventListener('input', e => handlePriceMinChange(e, applyFiltersDebounced));
         }
         if (priceMaxSlider) {
-            priceMaxSlider.addEventListener('input', handlePriceMaxChange);
+            priceMaxSlider.addEventListener('input', e => handlePriceMaxChange(e, applyFiltersDebounced));
         }
 
         // Stock checkbox
@@ -124,10 +175,47 @@
             searchInput.addEventListener('input', debounce(handleSearchChange, 300));
         }
 
+        // Typeahead suggestions (served from an in-memory index, so no debounce)
+        if (searchInput && suggestionsList) {
+            searchInput.addEventListener('input', handleSuggestInput);
+            searchInput.addEventListener('keydown', handleSuggestKeydown);
+            searchInput.addEventListener('blur', () => setTimeout(hideSuggestions, 150));
+        }
+
         // Sort select
         if (sortSelect) {
             sortSelect.addEventListener('change', handleSortChange);
         }
+
+        // Pagination without a server (capturing, so HTMX never sees the click)
+        pageContainer.addEventListener('click', handlePaginationClick, true);
+        // The grid request of an HTMX pagination link failed: no server after all
+        pageContainer.addEventListener('htmx:responseError', handleResultsError);
+        pageContainer.addEventListener('htmx:sendError', handleResultsError);
+    }
+
+    // Page number a pagination link points to
+    function linkPage(link) {
+        return parseInt(new URL(link.href, window.location.href).searchParams.get('page'), 10) || 1;
+    }
+
+    // Show another page of results from the static catalog
+    function handlePaginationClick(e) {
+        const link = e.target.closest('a.pagination-link');
+        if (!staticMode || !link) return;
+        e.preventDefault();
+        e.stopPropagation();
+        history.replaceState(history.state, '', link.href);
+        showCatalogPage(linkPage(link));
+    }
+
+    // Fall back to the static catalog for a failed results request
+    function handleResultsError(e) {
+        const link = e.target.closest && e.target.closest('#products-results a.pagination-link');
+        if (!link) return;
+        staticMode = true;
+        history.replaceState(history.state, '', link.href);
+        showCatalogPage(linkPage(link));
     }
 
     // Handle category checkbox changes
@@ -174,7 +262,7 @@
     }
 
     // Handle price min slider change
-    function handlePriceMinChange(e) {
+    function handlePriceMinChange(e, onChange) {
         const value = parseFloat(e.target.value);
         
         // Ensure min doesn't exceed max
@@ -186,11 +274,11 @@
         }
 
         updatePriceDisplay();
-        applyFilters();
+        onChange();
     }
 
     // Handle price max slider change
-    function handlePriceMaxChange(e) {
+    function handlePriceMaxChange(e, onChange) {
         const value = parseFloat(e.target.value);
         
         // Ensure max doesn't go below min
@@ -202,7 +290,7 @@
         }
 
         updatePriceDisplay();
-        applyFilters();
+        onChange();
     }
 
     // Update price display values
@@ -236,10 +324,88 @@
 
     // Handle search input change
     function handleSearchChange(e) {
-        state.searchQuery = e.target.value.toLowerCase().trim();
+        state.searchQuery = e.target.value.trim();
         applyFilters();
     }
 
+    // Request suggestions for the current search text
+    function handleSuggestInput(e) {
+        const query = e.target.value.trim();
+
+        // Only the latest keystroke's suggestions matter
+        if (suggestController) suggestController.abort();
+
+        if (!query) {
+            hideSuggestions();
+            return;
+        }
+
+        // Suggestions need the server
+        if (staticMode) return;
+
+        suggestController = new AbortController();
+        fetch(`${searchInput.dataset.suggestUrl}?q=${encodeURIComponent(query)}`, { signal: suggestController.signal })
+            .then(response => {
+                if (!response.ok) return { suggestions: [] };
+                return response.json();
+            })
+            .then(data => renderSuggestions(data.suggestions || []))
+            .catch(error => {
+                if (error.name !== 'AbortError') console.error('Failed to load suggestions:', error);
+            });
+    }
+
+    // Render the suggestions list under the search box
+    function renderSuggestions(suggestions) {
+        suggestionsList.innerHTML = '';
+        activeSuggestion = -1;
+
+        suggestions.forEach((suggestion, i) => {
+            const item = document.createElement('li');
+            item.id = `product-suggestion-${i}`;
+            item.className = `search-suggestion search-suggestion-${suggestion.type}`;
+            item.setAttribute('role', 'option');
+
+            const link = document.createElement('a');
+            link.href = suggestion.url;
+            link.textContent = suggestion.label;
+            item.appendChild(link);
+
+            suggestionsList.appendChild(item);
+        });
+
+        suggestionsList.hidden = suggestions.length === 0;
+        searchInput.setAttribute('aria-expanded', String(!suggestionsList.hidden));
+    }
+
+    // Hide the suggestions list
+    function hideSuggestions() {
+        if (!suggestionsList) return;
+        suggestionsList.hidden = true;
+        activeSuggestion = -1;
+        searchInput.setAttribute('aria-expanded', 'false');
+        searchInput.removeAttribute('aria-activedescendant');
+    }
+
+    // Keyboard navigation through the suggestions
+    function handleSuggestKeydown(e) {
+        const items = suggestionsList.querySelectorAll('.search-suggestion');
+        if (suggestionsList.hidden || items.length === 0) return;
+
+        if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+            e.preventDefault();
+            const step = e.key === 'ArrowDown' ? 1 : -1;
+            activeSuggestion = (activeSuggestion + step + items.length) % items.length;
+            items.forEach((item, i) => item.classList.toggle('active', i === activeSuggestion));
+            searchInput.setAttribute('aria-activedescendant', items[activeSuggestion].id);
+        } else if (e.key === 'Enter' && activeSuggestion >= 0) {
+            e.preventDefault();
+            window.location.href = items[activeSuggestion].querySelector('a').href;
+        } else if (e.key === 'Escape') {
+            hideSuggestions();
+        }
+    }
+
     // Handle sort select change
     function handleSortChange(e) {
         state.sortBy = e.target.value;
@@ -273,124 +439,253 @@
         }
 
         // Reset price sliders to full range
-        calculatePriceRange();
+        resetPriceRange();
 
         applyFilters();
     }
 
-    // Apply all filters
-    function applyFilters() {
-        let visibleProducts = allProducts.filter(card => {
-            // Category filter
-            const productCategory = card.dataset.category;
-            const categoryMatch = state.selectedCategories.has('all') || 
-                                 state.selectedCategories.has(productCategory);
-            
-            if (!categoryMatch) return false;
+    // Build the query string for the current filters (defaults are omitted)
+    function buildQuery() {
+        const params = new URLSearchParams();
 
-            // Price filter
-            const priceText = card.querySelector('.product-price').textContent;
-            const price = parseFloat(priceText.replace('$', ''));
-            if (price < state.priceMin || price > state.priceMax) return false;
+        if (!state.selectedCategories.has('all')) {
+            state.selectedCategories.forEach(category => params.append('category', category));
+        }
 
-            // Stock filter (currently all products are in stock, but keeping for future)
-            if (state.inStockOnly) {
-                const inStock = card.dataset.inStock !== 'false';
-                if (!inStock) return false;
+        if (priceMinSlider && priceMaxSlider) {
+            if (state.priceMin > parseFloat(priceMinSlider.min)) {
+                params.set('price_min', state.priceMin);
             }
-
-            // Search filter
-            if (state.searchQuery) {
-                const productName = card.querySelector('.product-name').textContent.toLowerCase();
-                if (!productName.includes(state.searchQuery)) return false;
+            if (state.priceMax < parseFloat(priceMaxSlider.max)) {
+                params.set('price_max', state.priceMax);
             }
+        }
+
+        if (state.inStockOnly) params.set('in_stock', 'true');
+        if (state.searchQuery) params.set('q', state.searchQuery);
+        if (state.sortBy !== 'featured') params.set('sort', state.sortBy);
+
+        return params.toString();
+    }
+
+    // Request the first page of results for the current filters
+    function applyFilters() {
+        const query = buildQuery();
+        const gridUrl = pageContainer.dataset.gridUrl + (query ? `?${query}` : '');
+        const pageUrl = pageContainer.dataset.pageUrl + (query ? `?${query}` : '');
+
+        // Keep the address bar shareable without adding history entries per keystroke
+        history.replaceState(history.state, '', pageUrl);
+
+        if (staticMode) {
+            showCatalogPage(1);
+            return;
+        }
+
+        const currentRequest = ++requestId;
+        fetch(gridUrl, { headers: { 'HX-Request': 'true' } })
+            .then(response => {
+                // No server behind a static host: filter the catalog here from now on
+                if (!response.ok) {
+                    staticMode = true;
+                    return null;
+                }
+                return response.text();
+            })
+            .then(html => {
+                // Ignore responses that arrive after a newer request was made
+                if (currentRequest !== requestId) return;
+                if (html === null) {
+                    showCatalogPage(1);
+                    return;
+                }
+                swapResults(html);
+            })
+            .catch(error => console.error('Failed to load products:', error));
+    }
+
+    // Replace the results block, letting HTMX wire up its pagination links
+    function swapResults(html) {
+        const results = document.getElementById('products-results');
+        if (!results) return;
+        results.outerHTML = html;
+        const swapped = document.getElementById('products-results');
+        if (window.htmx && swapped) htmx.process(swapped);
+    }
 
-            return true;
+    function loadJson(url) {
+        return fetch(url).then(response => {
+            if (!response.ok) throw new Error(`${url}: ${response.status}`);
+            return response.json();
         });
+    }
 
-        // Sort products
-        visibleProducts = sortProducts(visibleProducts);
+    function loadCatalogIndex() {
+        if (!catalog.index) catalog.index = loadJson(pageContainer.dataset.catalogUrl);
+        return catalog.index;
+    }
 
-        // Update display
-        updateProductsDisplay(visibleProducts);
-        updateResultsCount(visibleProducts.length);
+    function loadShard(category) {
+        if (!catalog.shards[category.id]) catalog.shards[category.id] = loadJson(category.shard);
+        return catalog.shards[category.id];
     }
 
-    // Sort products based on selected sort option
-    function sortProducts(products) {
-        const sorted = [...products];
+    function fold(text) {
+        return text.toLowerCase().replace(/ё/g, 'е');
+    }
 
-        switch (state.sortBy) {
-            case 'price-asc':
-                sorted.sort((a, b) => {
-                    const priceA = parseFloat(a.querySelector('.product-price').textContent.replace('$', ''));
-                    const priceB = parseFloat(b.querySelector('.product-price').textContent.replace('$', ''));
-                    return priceA - priceB;
+    // Ids of the products matching every word of the query (null without a query)
+    function searchIds(index, query) {
+        const words = fold(query).match(/[\p{L}\p{N}_]+/gu) || [];
+        if (!words.length) return Promise.resolve(null);
+        if (!catalog.search) catalog.search = loadJson(index.search);
+
+        return catalog.search.then(postings => {
+            const stems = Object.keys(postings);
+            let found = null;
+            words.forEach(word => {
+                // Index terms are stems: a word matches stems it starts, or that start it
+                const ids = new Set();
+                stems.forEach(stem => {
+                    if (stem.startsWith(word) || (word.startsWith(stem) && stem.length >= Math.min(word.length, MIN_STEM_LENGTH))) {
+                        postings[stem].forEach(id => ids.add(id));
+                    }
                 });
-                break;
+                found = found ? new Set(Array.from(found).filter(id => ids.has(id))) : ids;
+            });
+            return found;
+        });
+    }
 
-            case 'price-desc':
-                sorted.sort((a, b) => {
-                    const priceA = parseFloat(a.querySelector('.product-price').textContent.replace('$', ''));
-                    const priceB = parseFloat(b.querySelector('.product-price').textContent.replace('$', ''));
-                    return priceB - priceA;
-                });
-                break;
+    // Price bounds in effect: the sliders' ends mean no bound, as in buildQuery()
+    function priceBounds() {
+        if (!priceMinSlider || !priceMaxSlider) return { min: null, max: null };
+        return {
+            min: state.priceMin > parseFloat(priceMinSlider.min) ? state.priceMin : null,
+            max: state.priceMax < parseFloat(priceMaxSlider.max) ? state.priceMax : null
+        };
+    }
 
-            case 'rating':
-                sorted.sort((a, b) => {
-                    const ratingA = parseFloat(a.querySelector('.rating-value').textContent);
-                    const ratingB = parseFloat(b.querySelector('.rating-value').textContent);
-                    return ratingB - ratingA;
-                });
-                break;
+    const SORTS = {
+        'price-asc': (a, b) => a.price - b.price,
+        'price-desc': (a, b) => b.price - a.price,
+        'rating': (a, b) => b.rating - a.rating || b.reviews - a.reviews
+    };
 
-            case 'featured':
-            default:
-                // Keep original order
-                break;
-        }
+    // Filter, sort and paginate the catalog like CatalogIndex.query()
+    function queryCatalog(page) {
+        return loadCatalogIndex().then(index => searchIds(index, state.searchQuery).then(ids => {
+            const allCategories = state.selectedCategories.has('all');
+            const categories = index.categories.filter(category =>
+                (allCategories || state.selectedCategories.has(category.id)) &&
+                (!ids || category.ids.some(id => ids.has(id)))
+            );
+            return Promise.all(categories.map(loadShard)).then(shards => {
+                const bounds = priceBounds();
+                const matched = [].concat.apply([], shards)
+                    .filter(p =>
+                        (!ids || ids.has(p.id)) &&
+                        (bounds.min === null || p.price >= bounds.min) &&
+                        (bounds.max === null || p.price <= bounds.max) &&
+                        (!state.inStockOnly || p.in_stock)
+                    )
+                    .sort((a, b) => a.rank - b.rank);
+                if (SORTS[state.sortBy]) matched.sort(SORTS[state.sortBy]);
+
+                const pageSize = parseInt(pageContainer.dataset.pageSize, 10) || matched.length || 1;
+                const pages = Math.max(1, Math.ceil(matched.length / pageSize));
+                page = Math.min(Math.max(page, 1), pages);
+                return {
+                    items: matched.slice((page - 1) * pageSize, page * pageSize),
+                    total: matched.length,
+                    page: page,
+                    pages: pages
+                };
+            });
+        }));
+    }
 
-        return sorted;
+    // Render one page of results from the static catalog
+    function showCatalogPage(page) {
+        const currentRequest = ++requestId;
+        queryCatalog(page)
+            .then(results => {
+                if (currentRequest !== requestId) return;
+                swapResults(renderResults(results));
+            })
+            .catch(error => console.error('Failed to load the product catalog:', error));
     }
 
-    // Update products display
-    function updateProductsDisplay(visibleProducts) {
-        // Hide all products first
-        allProducts.forEach(card => {
-            card.style.display = 'none';
-        });
+    function escapeHtml(text) {
+        const div = document.createElement('div');
+        div.textContent = text;
+        return div.innerHTML.replace(/"/g, '&quot;');
+    }
 
-        // Show and reorder visible products
-        visibleProducts.forEach(card => {
-            card.style.display = '';
-            productsGrid.appendChild(card);
-        });
+    // Same markup as create_product_card()
+    function renderCard(product) {
+        const data = pageContainer.dataset;
+        const rating = Number.isInteger(product.rating) ? product.rating.toFixed(1) : String(product.rating);
+        const name = product.url
+            ? `<a href="${escapeHtml(product.url)}">${escapeHtml(product.name)}</a>`
+            : escapeHtml(product.name);
+        const badge = product.badge
+            ? `<span class="product-badge ${product.badge_class}">${escapeHtml(product.badge)}</span>`
+            : '';
+        return `<div class="product-card" data-product-id="${product.id}" data-category="${escapeHtml(product.category)}" data-in-stock="${product.in_stock ? 'true' : 'false'}">` +
+            `<div class="product-image-container">${badge}<img src="${escapeHtml(product.image)}" alt="${escapeHtml(product.name)}" class="product-image" loading="lazy"></div>` +
+            '<div class="product-content">' +
+            `<div class="product-rating"><svg width="16" height="16" aria-hidden="true"><use href="${escapeHtml(data.starIcon)}"></use></svg>` +
+            `<span class="rating-value">${rating}</span><span class="review-count">(${product.reviews} отзывов)</span></div>` +
+            `<h3 class="product-name">${name}</h3>` +
+            `<div class="product-footer"><span class="product-price">$${product.price.toFixed(2)}</span>` +
+            `<button class="btn-add-cart">${escapeHtml(data.addToCartText)}</button></div>` +
+            '</div></div>';
+    }
 
-        // Show "no results" message if needed
-        const existingMessage = productsGrid.querySelector('.no-results-message');
-        if (existingMessage) {
-            existingMessage.remove();
-        }
+    // Same markup as create_pagination()
+    function renderPagination(results) {
+        if (results.pages <= 1) return '';
+        const data = pageContainer.dataset;
+        const page = results.page;
+        const link = (label, n, current, disabled) => {
+            if (disabled) return `<span class="pagination-link disabled">${escapeHtml(label)}</span>`;
+            const query = buildQuery();
+            const params = new URLSearchParams(query);
+            if (n > 1) params.set('page', n);
+            const suffix = params.toString() ? `?${params}` : '';
+            return `<a href="${escapeHtml(data.pageUrl + suffix)}" class="pagination-link${current ? ' active' : ''}"` +
+                `${current ? ' aria-current="page"' : ''}>${escapeHtml(label)}</a>`;
+        };
 
-        if (visibleProducts.length === 0) {
-            const noResultsMessage = document.createElement('div');
-            noResultsMessage.className = 'no-results-message';
-            noResultsMessage.style.cssText = 'grid-column: 1 / -1; text-align: center; padding: 3rem; color: #6b7280;';
-            noResultsMessage.innerHTML = '<p style="font-size: 1.125rem; margin-bottom: 0.5rem;">Товары не найдены</p><p style="font-size: 0.875rem;">Попробуйте изменить фильтры или поисковый запрос</p>';
-            productsGrid.appendChild(noResultsMessage);
-        }
+        // First, last and up to two pages on each side of the current one
+        const shown = new Set([1, results.pages]);
+        for (let n = Math.max(1, page - 2); n <= Math.min(results.pages, page + 2); n++) shown.add(n);
+        const links = [link(data.previousText, page - 1, false, page === 1)];
+        let last = 0;
+        Array.from(shown).sort((a, b) => a - b).forEach(n => {
+            if (n - last > 1) links.push('<span class="pagination-gap">…</span>');
+            links.push(link(String(n), n, n === page, false));
+            last = n;
+        });
+        links.push(link(data.nextText, page + 1, false, page === results.pages));
+        return `<nav aria-label="Страницы" class="products-pagination">${links.join('')}</nav>`;
     }
 
-    // Update results count
-    function updateResultsCount(count) {
-        if (resultsCount) {
-            const total = allProducts.length;
-            const showingText = resultsCount.textContent.split(' ')[0]; // Get "Показано" text
-            const ofText = resultsCount.textContent.split(' ')[2]; // Get "из" text
-            const productsText = resultsCount.textContent.split(' ').slice(-1)[0]; // Get "товаров" text
-            resultsCount.textContent = `${showingText} ${count} ${ofText} ${total} ${productsText}`;
-        }
+    // Same markup as create_products_results()
+    function renderResults(results) {
+        const data = pageContainer.dataset;
+        const cards = results.items.length
+            ? results.items.map(renderCard).join('')
+            : '<div class="no-results-message">' +
+                `<p class="no-results-title">${escapeHtml(data.noResultsTitle)}</p>` +
+                `<p class="no-results-text">${escapeHtml(data.noResultsText)}</p>` +
+                '</div>';
+        return '<div class="products-results" id="products-results">' +
+            `<div class="results-info"><span class="results-count">${escapeHtml(`${data.showingText} ${results.items.length} ${data.ofText} ${results.total} ${data.productsText}`)}</span></div>` +
+            `<div class="products-grid" id="products-grid">${cards}</div>` +
+            renderPagination(results) +
+            '</div>';
     }
 
     // Debounce utility function
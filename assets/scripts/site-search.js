@@ -0,0 +1,228 @@
+/**
+ * Site Search - Answers /search queries from the static JSON index
+ *
+ * The server renders results itself. On the static build there is no
+ * server, so when the query in the URL differs from the rendered one this
+ * script loads /search/index.json (documents and shard list) and the
+ * postings shards for the typed words, then ranks documents the same way as
+ * src/services/site_search.py. Index terms are stems, which are prefixes of
+ * the folded words, so a word maps to the longest matching term.
+ */
+
+(function() {
+    'use strict';
+
+    const TITLE_WEIGHT = 3.0;
+    const BM25_K1 = 1.2;
+    const BM25_B = 0.75;
+    const MIN_STEM_LENGTH = 3;
+    const LIMIT = 30;
+
+    const shardCache = {};
+    let manifest = null;
+
+    function fold(text) {
+        return text.toLowerCase().replace(/ё/g, 'е');
+    }
+
+    function words(text) {
+        return fold(text).match(/[\p{L}\p{N}_]+/gu) || [];
+    }
+
+    function shardName(word) {
+        return word.codePointAt(0).toString(16);
+    }
+
+    function loadJson(url) {
+        return fetch(url).then(function(response) {
+            if (!response.ok) throw new Error(url + ': ' + response.status);
+            return response.json();
+        });
+    }
+
+    function loadShard(name) {
+        if (!shardCache[name]) {
+            const base = container.dataset.indexUrl.replace(/[^/]*$/, '');
+            shardCache[name] = manifest.shards.indexOf(name) === -1
+                ? Promise.resolve({})
+                : loadJson(base + 'terms-' + name + '.json');
+        }
+        return shardCache[name];
+    }
+
+    // Longest index term the word starts with (the word's stem)
+    function termFor(word, shard) {
+        let best = null;
+        for (let length = word.length; length >= Math.min(word.length, MIN_STEM_LENGTH); length--) {
+            const candidate = word.slice(0, length);
+            if (shard[candidate]) {
+                best = candidate;
+                break;
+            }
+        }
+        // Fleeting vowel: "ручек" is indexed as "ручк"
+        if (!best && /[ео]к$/.test(word)) {
+            const candidate = word.slice(0, -2) + 'к';
+            if (shard[candidate]) best = candidate;
+        }
+        return best;
+    }
+
+    // Quoted parts are phrases; every other word is a phrase of its own
+    function parseQuery(query) {
+        const phrases = [];
+        const parts = query.split('"');
+        parts.forEach(function(part, i) {
+            const partWords = words(part);
+            if (i % 2 === 1) {
+                if (partWords.length) phrases.push(partWords);
+            } else {
+                partWords.forEach(function(word) { phrases.push([word]); });
+            }
+        });
+        return phrases;
+    }
+
+    function phraseDocs(phrase, postings) {
+        const lists = phrase.map(function(term) { return postings[term]; });
+        if (lists.some(function(list) { return !list; })) return new Set();
+        const found = new Set();
+        Object.keys(lists[0]).forEach(function(docId) {
+            if (!lists.every(function(list) { return list[docId]; })) return;
+            const following = lists.slice(1).map(function(list) { return new Set(list[docId]); });
+            const match = lists[0][docId].some(function(start) {
+                return following.every(function(positions, k) { return positions.has(start + k + 1); });
+            });
+            if (match) found.add(Number(docId));
+        });
+        return found;
+    }
+
+    function termScore(postings, term, docId, averageLength) {
+        const positions = postings[term][docId];
+        const titleLength = manifest.title_lengths[docId];
+        const tf = positions.reduce(function(sum, p) { return sum + (p < titleLength ? TITLE_WEIGHT : 1); }, 0);
+        const df = Object.keys(postings[term]).length;
+        const idf = Math.log(1 + (manifest.documents.length - df + 0.5) / (df + 0.5));
+        const norm = BM25_K1 * (1 - BM25_B + BM25_B * manifest.lengths[docId] / (averageLength || 1));
+        return idf * tf * (BM25_K1 + 1) / (tf + norm);
+    }
+
+    function escapeHtml(text) {
+        const div = document.createElement('div');
+        div.textContent = text;
+        return div.innerHTML;
+    }
+
+    function snippet(text, stems) {
+        const tokens = text.split(/(\s+)/);
+        const first = tokens.findIndex(function(token) {
+            const folded = fold(token);
+            return stems.some(function(stem) { return folded.replace(/^[^\p{L}\p{N}]+/u, '').startsWith(stem); });
+        });
+        if (first === -1) return '';
+        const start = Math.max(0, first - 16);
+        const end = Math.min(tokens.length, first + 17);
+        const html = tokens.slice(start, end).map(function(token) {
+            const folded = fold(token).replace(/^[^\p{L}\p{N}]+/u, '');
+            const hit = stems.some(function(stem) { return folded.startsWith(stem); });
+            return hit ? '<mark>' + escapeHtml(token) + '</mark>' : escapeHtml(token);
+        }).join('');
+        return (start > 0 ? '…' : '') + html + (end < tokens.length ? '…' : '');
+    }
+
+    function search(query) {
+        const rawPhrases = parseQuery(query);
+        if (!rawPhrases.length) return Promise.resolve([]);
+        const allWords = [].concat.apply([], rawPhrases);
+        const names = Array.from(new Set(allWords.map(shardName)));
+
+        return Promise.all(names.map(loadShard)).then(function(shards) {
+            const postings = {};
+            names.forEach(function(name, i) {
+                Object.keys(shards[i]).forEach(function(term) {
+                    const docs = {};
+                    shards[i][term].forEach(function(entry) { docs[entry[0]] = entry[1]; });
+                    postings[term] = docs;
+                });
+            });
+
+            const phrases = rawPhrases.map(function(phrase) {
+                return phrase.map(function(word) { return termFor(word, postings) || word; });
+            });
+            const matches = phrases.map(function(phrase) { return phraseDocs(phrase, postings); });
+            const docIds = Array.from(matches[0]).filter(function(docId) {
+                return matches.every(function(set) { return set.has(docId); });
+            });
+
+            const terms = Array.from(new Set([].concat.apply([], phrases)));
+            const averageLength = manifest.lengths.reduce(function(a, b) { return a + b; }, 0) / (manifest.lengths.length || 1);
+            return docIds
+                .map(function(docId) {
+                    const score = terms.reduce(function(sum, term) {
+                        return sum + termScore(postings, term, docId, averageLength);
+                    }, 0);
+                    return { docId: docId, score: score };
+                })
+                .sort(function(a, b) { return b.score - a.score || a.docId - b.docId; })
+                .slice(0, LIMIT)
+                .map(function(hit) {
+                    const doc = manifest.documents[hit.docId];
+                    return Object.assign({}, doc, {
+                        snippet: snippet(doc.text, terms) || snippet(doc.title, terms)
+                    });
+                });
+        });
+    }
+
+    function render(query, results) {
+        const data = container.dataset;
+        container.dataset.query = query;
+        if (!results.length) {
+            container.innerHTML =
+                '<div class="no-results-message">' +
+                '<p class="no-results-title">' + escapeHtml(data.noResultsTitle) + '</p>' +
+                '<p class="no-results-text">' + escapeHtml(data.noResultsText) + '</p>' +
+                '</div>';
+            return;
+        }
+        const items = results.map(function(result) {
+            return '<li class="site-search-result">' +
+                '<a class="site-search-title" href="' + escapeHtml(result.url) + '">' + escapeHtml(result.title) + '</a>' +
+                (result.page_title !== result.title
+                    ? '<div class="site-search-page">' + escapeHtml(result.page_title) + '</div>' : '') +
+                (result.snippet ? '<p class="site-search-snippet">' + result.snippet + '</p>' : '') +
+                '</li>';
+        }).join('');
+        container.innerHTML =
+            '<p class="site-search-count">' + escapeHtml(data.resultsText) + ': ' + results.length + '</p>' +
+            '<ol class="site-search-list">' + items + '</ol>';
+    }
+
+    let container;
+
+    function init() {
+        container = document.getElementById('site-search-results');
+        if (!container) return;
+        const query = (new URLSearchParams(window.location.search).get('q') || '').trim();
+        // Rendered by the server already
+        if (!query || container.dataset.query === query) return;
+
+        const input = document.getElementById('site-search-input');
+        if (input) input.value = query;
+
+        loadJson(container.dataset.indexUrl)
+            .then(function(data) {
+                manifest = data;
+                return search(query);
+            })
+            .then(function(results) { render(query, results); })
+            .catch(function(error) { console.error('Site search index unavailable:', error); });
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
+})();
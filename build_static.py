@@ -4,92 +4,533 @@ Static site generator for Burokrat.site FastHTML application
 Generates static HTML files for deployment to Netlify
 """
 
+import asyncio
+import gzip
+import hashlib
+import json
+import multiprocessing
 import os
+import re
 import shutil
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+import fasthtml
 from fasthtml.common import *
-from src.config import load_page_data
+from starlette.requests import Request
+from starlette.routing import Match
+from src.config import get_data_store, load_page_data, preload_data, recording_reads
 from src.routes import register_all_routes
+from src.pages.catalog.api import CATALOG_URL, INDEX_URL as CATALOG_INDEX_URL
+from src.routes.static_export import exporting, is_exported, param_generator
+from src.services.site_search import get_site_search
+from src.services.build_cache import BuildCache, file_digest, inputs_digest
+from src.services.catalog import CATALOG_INPUT, get_catalog
+from src.services.assets import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, asset_url, get_asset_manifest, hashed_name
+from src.services.compression import precompress_tree
+from src.services.critical_css import get_critical_css
+from src.services.icons import get_icon_sprite
+from src.services.css import allowlisted_tokens, filter_rules, html_tokens, parse_stylesheet, script_tokens, serialize
 
-def create_static_site():
-    """Generate static HTML files from FastHTML application"""
-    
-    # Create dist directory
-    dist_dir = Path("dist")
-    if dist_dir.exists():
-        shutil.rmtree(dist_dir)
-    dist_dir.mkdir()
-    
-    # Copy assets
-    assets_src = Path("assets")
-    assets_dst = dist_dir / "assets"
-    if assets_src.exists():
-        shutil.copytree(assets_src, assets_dst)
-        print(f"✅ Copied assets to {assets_dst}")
-    
-    # Copy database
-    db_src = Path("data/burokrat.db")
-    if db_src.exists():
-        data_dst = dist_dir / "data"
-        data_dst.mkdir(exist_ok=True)
-        shutil.copy2(db_src, data_dst / "burokrat.db")
-        print(f"✅ Copied database to {data_dst}")
-    else:
-        print(f"⚠️  Warning: Database not found at {db_src}")
-        print("   Run 'python3 migrate_products.py' to create and populate the database")
-    
-    # Initialize FastHTML app
+
+# Classes set by code the purge cannot see (htmx is loaded from a CDN) or
+# assembled from pieces; glob patterns are allowed
+PURGE_ALLOWLIST = ('active', 'open', 'htmx-*')
+
+# Dead rules removed from main.css by the last build
+PURGE_REPORT = Path("css-purge-report.txt")
+
+# Cached pages and file digests of the last build, and the files it changed
+BUILD_CACHE_DIR = Path(".build-cache")
+CHANGES_MANIFEST = Path("build-changes.json")
+
+# Rewrite rules for Netlify, one per exported page
+REDIRECTS_FILE = "_redirects"
+
+# App of the current process; set in the parent before workers fork
+_app = None
+
+
+def create_app():
+    """Create the FastHTML app with every route registered"""
     app, rt = fast_app(
         hdrs=(
-            Link(rel='stylesheet', href='/assets/styles/main.css'),
+            Link(rel='stylesheet', href=asset_url('/assets/styles/main.css')),
             Script(src='https://unpkg.com/htmx.org@1.9.10'),
         ),
         live=False
     )
-    
-    # Load configuration data
     load_page_data()
-    
-    # Register all routes
     register_all_routes(rt)
+    return app
+
+def page_filename(path):
+    """File of a page in dist/: '/' -> 'index.html', '/products/pens' -> 'products/pens.html'
     
-    # Define pages to generate
-    pages = [
-        ('/', 'index.html'),
-        ('/seals-and-stamps', 'seals-and-stamps.html'),
-        ('/self-inking-stamps', 'self-inking-stamps.html'),
-        ('/engraving', 'engraving.html'),
-        ('/stationery', 'stationery.html'),
-        ('/products-and-services', 'products-and-services.html'),
-        ('/about', 'about.html'),
-        ('/contact', 'contact.html'),
-    ]
-    
-    print("🏗️  Generating static pages...")
-    
-    # Generate each page
-    for route, filename in pages:
+    Paths with an extension are files already: '/products/pens.json' -> 'products/pens.json'
+    """
+    if path == '/':
+        return 'index.html'
+    if '.' in path.rsplit('/', 1)[-1]:
+        return path.strip('/')
+    return path.strip('/') + '.html'
+
+def discover_pages(app):
+    """Every page the app can export, as [(path, filename)] in route order.
+    
+    GET routes are taken from the app's router. Routes matching NOT_EXPORTED
+    (src/routes/static_export.py) are left out, and parameterized routes are
+    expanded with the parameters their static_params generator yields.
+    """
+    paths, skipped = [], []
+    for route in app.router.routes:
+        path = getattr(route, 'path', None)
+        if path is None or 'GET' not in (getattr(route, 'methods', None) or ()) or not is_exported(path):
+            continue
+        if not route.param_convertors:
+            paths.append(path)
+            continue
+        generator = param_generator(path)
+        if generator is None:
+            skipped.append(path)
+            continue
+        paths += [route.path_format.format(**params) for params in generator()]
+    if skipped:
+        print(f"⚠️  Not exported, no static_params generator: {', '.join(skipped)}")
+    return [(path, page_filename(path)) for path in dict.fromkeys(paths)]
+
+def preload_snapshot():
+    """Load everything pages read and stop checking it for changes.
+    
+    The build renders one fixed state of data/, the catalog and assets/.
+    Workers forked afterwards share these structures instead of each
+    parsing YAML, querying the database and hashing assets again.
+    """
+    preload_data()
+    get_data_store().hot_reload = False
+    catalog = get_catalog()
+    catalog.index
+    catalog.check_interval = float('inf')
+    # The icon sprite is generated; make sure it is current before freezing assets
+    get_icon_sprite().symbols()
+    manifest = get_asset_manifest()
+    manifest.refresh(force=True)
+    manifest.check_interval = float('inf')
+
+def input_versions():
+    """Content hashes of everything a page can depend on, by input name.
+    
+    Data files are keyed like the data store ('about', ...; '*' is all of
+    them), plus the catalog rows, the code, the asset hashes and settings.
+    """
+    store = get_data_store()
+    versions = {
+        key: file_digest(store.data_dir / name) if (store.data_dir / name).exists() else None
+        for key, name in store.files.items()
+    }
+    versions['*'] = inputs_digest(versions)
+    index = get_catalog().index
+    versions[CATALOG_INPUT] = inputs_digest(
+        index.all_products, index.all_categories, [p['id'] for p in index.all_featured_products]
+    )
+    
+    root = Path(__file__).parent
+    code = hashlib.sha256(fasthtml.__version__.encode())
+    for path in sorted((root / "src").rglob("*.py")) + [root / "build_static.py"]:
+        code.update(path.relative_to(root).as_posix().encode() + b"\0" + path.read_bytes())
+    versions['code'] = code.hexdigest()
+    
+    manifest = get_asset_manifest()
+    versions['assets'] = inputs_digest(manifest.manifest(), manifest.enabled)
+    return versions
+
+def page_inputs(route, reads, versions):
+    """Hash of a page's inputs, given the inputs it reads."""
+    return inputs_digest(route, versions['code'], versions['assets'], {name: versions.get(name) for name in reads})
+
+async def _call_route(app, route):
+    """Call the handler of a GET route in-process and return its response."""
+    path, _, query = route.partition('?')
+    scope = {
+        'type': 'http', 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'server': ('localhost', 80), 'client': ('127.0.0.1', 0), 'root_path': '',
+        'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+        'headers': [(b'host', b'localhost')], 'app': app,
+    }
+    
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+    
+    for candidate in app.router.routes:
+        match, child_scope = candidate.matches(scope)
+        if match == Match.FULL:
+            scope.update(child_scope)
+            return await candidate.endpoint(Request(scope, receive))
+    return None
+
+def render_page(route, filename):
+    """Render one page with the current process's app.
+    
+    Returns:
+        (filename, status code, html or error message, seconds, inputs read)
+    """
+    started = time.perf_counter()
+    with exporting(), recording_reads() as reads:
         try:
-            # Use Starlette's TestClient directly
-            from starlette.testclient import TestClient
-            client = TestClient(app)
-            
-            # Get the page content
-            response = client.get(route)
-            
-            if response.status_code == 200:
-                # Write HTML file
-                html_file = dist_dir / filename
-                html_file.write_text(response.text, encoding='utf-8')
-                print(f"✅ Generated {filename}")
+            response = asyncio.run(_call_route(_app, route))
+            if response is None:
+                status, html = 404, f"no route matches {route}"
             else:
-                print(f"❌ Failed to generate {filename} (status: {response.status_code})")
-                
+                status, html = response.status_code, response.body.decode('utf-8')
         except Exception as e:
-            print(f"❌ Error generating {filename}: {str(e)}")
+            status, html = None, str(e)
+    seconds = time.perf_counter() - started
+    return filename, status, html, seconds, sorted(reads)
+
+def _init_worker():
+    global _app
+    if _app is None:
+        # Not forked (spawn start method): build this worker's own copy
+        _app = create_app()
+        preload_snapshot()
+    # Pooled SQLite connections must not be shared with the parent
+    from src.db import engine, read_engine
+    engine.dispose(close=False)
+    read_engine.dispose(close=False)
+
+def build_workers(page_count):
+    """Number of render processes: BUILD_WORKERS, or one per CPU."""
+    workers = int(os.environ.get('BUILD_WORKERS', '0')) or os.cpu_count() or 1
+    return max(1, min(workers, page_count))
+
+def render_pages(pages, workers):
+    """Render pages across a pool of worker processes.
+    
+    Returns:
+        ({filename: html} of the pages rendered with status 200,
+         [(filename, status, seconds)] of every page,
+         {filename: inputs read} of the pages rendered)
+    """
+    rendered, timings, reads = {}, [], {}
+    
+    def collect(filename, status, html, seconds, page_reads):
+        timings.append((filename, status, seconds))
+        if status == 200:
+            rendered[filename] = html
+            reads[filename] = page_reads
+            print(f"✅ Generated {filename}")
+        elif status is None:
+            print(f"❌ Error generating {filename}: {html}")
+        else:
+            print(f"❌ Failed to generate {filename} (status: {status})")
+    
+    if workers == 1:
+        for route, filename in pages:
+            collect(*render_page(route, filename))
+        return rendered, timings, reads
+    
+    method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(method), initializer=_init_worker) as pool:
+        futures = [pool.submit(render_page, route, filename) for route, filename in pages]
+        for future in as_completed(futures):
+            collect(*future.result())
+    # Keep the output in page order regardless of which worker finished first
+    order = {filename: i for i, (_, filename) in enumerate(pages)}
+    rendered = dict(sorted(rendered.items(), key=lambda item: order[item[0]]))
+    return rendered, timings, reads
+
+def build_pages(cache, pages, workers):
+    """Render the pages whose inputs changed; reuse the others from the cache.
+    
+    Returns:
+        {filename: html} of every page built, in page order.
+    """
+    versions = input_versions()
+    cached, todo = {}, []
+    for route, filename in pages:
+        html = cache.cached_page(filename, page_inputs(route, cache.page_reads(filename), versions))
+        if html is None:
+            todo.append((route, filename))
+        else:
+            cached[filename] = html
+    if cached:
+        print(f"♻️  Reusing {len(cached)} unchanged pages")
+    if not todo:
+        return cached
+    
+    workers = min(workers, len(todo))
+    print(f"🏗️  Generating {len(todo)} static pages ({workers} workers)...")
+    started = time.perf_counter()
+    rendered, timings, reads = render_pages(todo, workers)
+    report_timings(timings, time.perf_counter() - started, workers)
+    
+    routes = {filename: route for route, filename in todo}
+    for filename, html in rendered.items():
+        cache.store_page(filename, page_inputs(routes[filename], reads[filename], versions), html, reads[filename])
+    built = {**cached, **rendered}
+    return {filename: built[filename] for _, filename in pages if filename in built}
+
+def report_timings(timings, wall, workers):
+    """Print render time per page, slowest first."""
+    total = sum(seconds for _, _, seconds in timings)
+    print(f"⏱️  Rendered {len(timings)} pages in {wall:.2f}s on {workers} "
+          f"worker{'s' if workers > 1 else ''} ({total:.2f}s of rendering):")
+    width = max((len(filename) for filename, _, _ in timings), default=0)
+    for filename, status, seconds in sorted(timings, key=lambda t: -t[2]):
+        mark = '' if status == 200 else f"  [{status or 'error'}]"
+        print(f"   {filename:<{width}} {seconds * 1000:>7.1f} ms{mark}")
+
+
+def dedupe_pages(pages, rendered):
+    """Serve routes that render the same page as an earlier route from its file.
+    
+    Aliases such as /privacy (of /privacy-statement) then cost a rewrite
+    rule instead of a copy of the page.
+    
+    Returns:
+        ({filename: html} of the distinct pages, {path: filename} serving every page)
+    """
+    files, routes, by_html = {}, {}, {}
+    for path, filename in pages:
+        if filename not in rendered:
+            continue
+        html = rendered[filename]
+        if html in by_html:
+            routes[path] = by_html[html]
+            continue
+        by_html[html] = filename
+        files[filename] = html
+        routes[path] = filename
+    return files, routes
+
+def write_redirects(cache, routes):
+    """Write Netlify's _redirects: each page path rewritten to its file.
+    
+    Netlify answers unknown paths with 404.html by itself, and serves
+    files such as products/pens.json under their own path.
+    """
+    lines = ["# Generated by build_static.py from the app's routes"]
+    lines += [f"{path}  /{filename}  200" for path, filename in routes.items() if path not in ('/', f"/{filename}")]
+    cache.write(REDIRECTS_FILE, "\n".join(lines) + "\n")
+    aliases = sum(1 for path, filename in routes.items() if filename != page_filename(path))
+    print(f"✅ Wrote {len(lines) - 1} rewrite rules to {REDIRECTS_FILE} ({aliases} aliases)")
+
+def write_search_index(cache):
+    """Write the site search index as a manifest plus postings shards.
+    
+    site-search.js loads search/index.json and only the shards for the
+    words being looked up.
+    """
+    manifest, shards = get_site_search().index.shards()
+    
+    def dump(path, data):
+        cache.write(path, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+    
+    dump("search/index.json", manifest)
+    for name, postings in shards.items():
+        dump(f"search/terms-{name}.json", postings)
+    print(f"✅ Wrote search index: {len(manifest['documents'])} documents, {len(shards)} shards")
+
+def write_assets(cache, replacements, immutable=()):
+    """Copy assets under their plain and fingerprinted names and write _headers.
+    
+    Fingerprinted files never change, so Netlify may cache them for good;
+    plain names must be revalidated. Every file is listed explicitly because
+    Netlify merges the values of overlapping header rules.
+    
+    Args:
+        cache: BuildCache of dist/.
+        replacements: {asset path: content} written instead of the source
+            file (and fingerprinted by that content).
+        immutable: Further fingerprinted URLs, outside /assets/ (the
+            catalog API shards).
+    
+    Returns:
+        {path: fingerprinted path} of every asset.
+    """
+    manifest = get_asset_manifest()
+    hashed = {}
+    for path in manifest.manifest():
+        asset = manifest.get(path)
+        if path in replacements:
+            data = replacements[path]
+            hashed[path] = hashed_name(path, hashlib.sha256(data).hexdigest())
+            cache.write(f"assets/{path}", data)
+            cache.write(f"assets/{hashed[path]}", data)
+        else:
+            hashed[path] = asset.hashed_path
+            cache.copy(f"assets/{path}", manifest.root / path, asset.digest)
+            cache.copy(f"assets/{hashed[path]}", manifest.root / path, asset.digest)
+    cache.write("assets/manifest.json", json.dumps(hashed, indent=2, ensure_ascii=False))
+    
+    lines = []
+    for path, hashed_path in hashed.items():
+        lines += [f"/assets/{hashed_path}", f"  Cache-Control: {IMMUTABLE_CACHE_CONTROL}"]
+        lines += [f"/assets/{path}", f"  Cache-Control: {REVALIDATE_CACHE_CONTROL}"]
+    for path in immutable:
+        lines += [path, f"  Cache-Control: {IMMUTABLE_CACHE_CONTROL}"]
+    cache.write("_headers", "\n".join(lines) + "\n")
+    print(f"✅ Copied {len(hashed)} assets with fingerprinted names to {cache.out_dir / 'assets'}")
+    return hashed
+
+def snapshot_database(db_src, target):
+    """Write a consistent copy of a SQLite database with the online backup API.
+    
+    The production profile runs the database in WAL mode, so recent commits
+    may still be in data/burokrat.db-wal; copying the main file alone would
+    leave them out. The backup includes them, even while the app writes.
+    """
+    source = sqlite3.connect(f"file:{db_src}?mode=ro", uri=True)
+    try:
+        destination = sqlite3.connect(target)
+        try:
+            source.backup(destination)
+            # One self-contained file, readable without -wal/-shm siblings
+            destination.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            destination.close()
+    finally:
+        source.close()
+
+def write_precompressed(dist_dir):
+    """Write .gz/.br siblings of every text file in dist/.
+    
+    Servers that look for pre-compressed files (nginx gzip_static, Caddy
+    precompressed, the app's own assets route) send these as they are.
+    """
+    stats = precompress_tree(dist_dir)
+    saved = ', '.join(f"{encoding} -{size // 1024} KB" for encoding, size in stats['saved'].items())
+    print(f"✅ Pre-compressed {stats['files']} text files ({stats['bytes'] // 1024} KB): {saved}")
+
+def inline_critical_css(rendered):
+    """Inline each page's critical rules and load main.css asynchronously.
+    
+    Pages are rendered with a plain stylesheet link and rewritten here, once
+    per build, so renders reused from the build cache need no extraction
+    either (see src/services/critical_css.py).
+    """
+    critical_css = get_critical_css()
+    return {
+        filename: critical_css.inline(html) if filename.endswith('.html') else html
+        for filename, html in rendered.items()
+    }
+
+def report_critical_css(rendered):
+    """Print how many render-blocking stylesheet bytes each page no longer waits for.
+    
+    The first paint needs the inline <style> instead of the whole main.css.
+    """
+    critical_css = get_critical_css()
+    if not critical_css.enabled:
+        return
+    stylesheet = (critical_css.manifest.root / critical_css.path[len('/assets/'):]).read_bytes()
+    full, full_gz = len(stylesheet), len(gzip.compress(stylesheet))
+    print(f"🎨 Critical CSS (main.css: {full // 1024} KB, {full_gz // 1024} KB gzipped):")
+    width = max((len(filename) for filename in rendered), default=0)
+    for filename, html in rendered.items():
+        match = re.search(r'<style>(.*?)</style>', html, re.S)
+        inline = match.group(1).encode('utf-8') if match else b''
+        inline_gz = len(gzip.compress(inline))
+        print(f"   {filename:<{width}} inline {len(inline) // 1024:>3} KB, "
+              f"saved {(full - len(inline)) // 1024:>3} KB ({(full_gz - inline_gz) // 1024} KB gzipped) before first paint")
+
+def purge_css(rendered):
+    """Reduce main.css to the rules the rendered site can use.
+    
+    Names come from every rendered page (inline scripts and event handlers
+    included), every script in assets/scripts/ and PURGE_ALLOWLIST. The
+    removed rules are listed in PURGE_REPORT with their line numbers.
+    
+    Returns:
+        {asset path: purged content} for write_assets, which gives the
+        purged file its own fingerprint.
+    """
+    manifest = get_asset_manifest()
+    asset = manifest.get('styles/main.css')
+    rules = parse_stylesheet((manifest.root / asset.path).read_text(encoding='utf-8'))
+    
+    tokens = allowlisted_tokens(rules, PURGE_ALLOWLIST)
+    for html in rendered.values():
+        tokens |= html_tokens(html, scripts=True)
+    for script in sorted((manifest.root / "scripts").glob("*.js")):
+        tokens |= script_tokens(script.read_text(encoding='utf-8'))
+    
+    removed = []
+    purged = serialize(filter_rules(rules, tokens, removed)).encode('utf-8')
+    
+    lines = [f"{asset.path}: {len(removed)} dead rules, {asset.size // 1024} KB -> {len(purged) // 1024} KB", ""]
+    for context, rule in removed:
+        name = rule.at or ', '.join(rule.selectors)
+        lines.append(f"{rule.line:>5}  {name}" + (f"  [{context}]" if context else ""))
+    PURGE_REPORT.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    print(f"✅ Purged main.css: {len(removed)} dead rules removed, "
+          f"{asset.size // 1024} KB -> {len(purged) // 1024} KB (see {PURGE_REPORT})")
+    return {asset.path: purged}
+
+def create_static_site(clean=False):
+    """Generate static HTML files from FastHTML application
+    
+    dist/ is updated in place: only pages whose inputs changed are rendered
+    and only changed files are written (see src/services/build_cache.py).
+    The files changed since the last build are listed in CHANGES_MANIFEST.
+    With clean, dist/ and the build cache are deleted first.
+    """
+    dist_dir = Path("dist")
+    if clean:
+        for directory in (dist_dir, BUILD_CACHE_DIR):
+            if directory.exists():
+                shutil.rmtree(directory)
+        print("🧹 Removed dist/ and the build cache")
+    cache = BuildCache(dist_dir, BUILD_CACHE_DIR)
+    
+    # Load the data once; forked workers share it
+    global _app
+    _app = create_app()
+    preload_snapshot()
+    
+    pages = discover_pages(_app)
+    rendered, routes = dedupe_pages(pages, build_pages(cache, pages, build_workers(len(pages))))
+    rendered = inline_critical_css(rendered)
+    html_pages = {filename: html for filename, html in rendered.items() if filename.endswith('.html')}
+    report_critical_css(html_pages)
+    
+    # Copy assets, with the purged stylesheet in place of main.css
+    manifest = get_asset_manifest()
+    replacements = purge_css(html_pages)
+    hashed = write_assets(cache, replacements, [
+        path for path in routes if path.startswith(CATALOG_URL) and path != CATALOG_INDEX_URL
+    ])
+    urls = {f"/assets/{manifest.get(path).hashed_path}": f"/assets/{hashed[path]}" for path in replacements}
+    
+    # Write HTML files, pointing at the purged stylesheet
+    for filename, html in rendered.items():
+        for old_url, new_url in urls.items():
+            html = html.replace(old_url, new_url)
+        cache.write(filename, html)
+    write_redirects(cache, routes)
+    
+    # Copy database, committed WAL frames included
+    db_src = Path("data/burokrat.db")
+    if db_src.exists():
+        snapshot = BUILD_CACHE_DIR / "burokrat.db"
+        snapshot.unlink(missing_ok=True)
+        snapshot_database(db_src, snapshot)
+        if cache.copy("data/burokrat.db", snapshot):
+            print(f"✅ Copied database to {dist_dir / 'data'}")
+    else:
+        print(f"⚠️  Warning: Database not found at {db_src}")
+        print("   Run 'python3 migrate_products.py' to create and populate the database")
+    
+    write_search_index(cache)
+    write_precompressed(dist_dir)
     
+    changes = cache.finish(CHANGES_MANIFEST)
     print(f"\n🎉 Static site generated successfully in {dist_dir}/")
     print(f"📁 Total files: {len(list(dist_dir.rglob('*')))}")
+    print(f"📦 {len(changes['changed'])} files changed, {len(changes['deleted'])} deleted, "
+          f"{changes['unchanged']} unchanged (see {CHANGES_MANIFEST})")
 
 if __name__ == "__main__":
-    create_static_site()
+    create_static_site(clean="--clean" in sys.argv[1:])
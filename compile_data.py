@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""Compile data/*.yaml into a single pre-parsed bundle for fast cold starts
+
+Run after editing YAML files or as part of a deploy:
+    python3 compile_data.py
+
+Files whose content no longer matches the bundle are parsed from YAML as
+usual, so a stale bundle only costs speed, never correctness.
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.config.data_bundle import compile_bundle, YamlLoader
+
+
+def main():
+    data_dir = Path(__file__).parent / "data"
+    start = time.perf_counter()
+    bundle_path = compile_bundle(data_dir)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"✅ Compiled {len(list(data_dir.glob('*.yaml')))} YAML files into {bundle_path}")
+    print(f"   Loader: {YamlLoader.__name__}, size: {bundle_path.stat().st_size} bytes, took {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
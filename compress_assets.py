@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Write pre-compressed .gz (and .br, with the brotli package) siblings of text assets
+
+Run after editing CSS/JS or as part of a deploy:
+    python3 compress_assets.py [directory ...]
+
+Defaults to assets/ (and dist/ when it exists). The server sends these
+siblings instead of compressing at request time; siblings older than their
+file are ignored and rewritten on the next run.
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.services.compression import available_encodings, precompress_tree
+
+
+def main():
+    root = Path(__file__).parent
+    dirs = [Path(d) for d in sys.argv[1:]] or [d for d in (root / "assets", root / "dist") if d.exists()]
+    for directory in dirs:
+        start = time.perf_counter()
+        stats = precompress_tree(directory)
+        elapsed = (time.perf_counter() - start) * 1000
+        saved = ', '.join(f"{encoding}: -{stats['saved'][encoding] // 1024} KB" for encoding in available_encodings())
+        print(f"✅ {directory}: {stats['files']} text files ({stats['bytes'] // 1024} KB), "
+              f"{stats['written']} siblings written, {saved}, took {elapsed:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Standalone contact email dispatcher
+
+Delivers queued contact form emails from the email_outbox table. Run it next
+to the web server when the app is started with EMAIL_DISPATCHER=worker:
+    EMAIL_DISPATCHER=worker python3 app.py
+    python3 email_worker.py
+"""
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s',
+    datefmt='%H:%M:%S'
+)
+
+from src.db import create_db_and_tables
+from src.services.email_outbox import get_outbox_dispatcher
+
+
+def main():
+    create_db_and_tables()
+    dispatcher = get_outbox_dispatcher()
+    try:
+        asyncio.run(dispatcher.run())
+    except KeyboardInterrupt:
+        print(f"\n📮 Stopped. {dispatcher.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from src.db import get_db_session, create_db_and_tables
 from src.models import Product, Category
+from src.services.product_search import get_product_search
 from sqlmodel import select
 
 
@@ -236,6 +237,10 @@ def main():
         # Show summary
         show_migration_summary(session)
         
+        # Index the imported products for search before the server starts
+        get_product_search().sync()
+        print("✅ Product search index updated")
+        
         print("\n✅ Migration completed successfully!")
         
     except Exception as e:
@@ -23,7 +23,9 @@ from .sections import (
 from .products import (
     create_shop_categories,
     create_featured_products,
-    create_products_page
+    create_products_page,
+    create_category_page,
+    create_product_detail
 )
 
 __all__ = [
@@ -39,5 +41,6 @@ __all__ = [
     'create_hero', 'create_services', 'create_our_history', 'create_expertise',
     'create_locations', 'create_cta', 'create_values', 'create_faq_section',
     # Products
-    'create_shop_categories', 'create_featured_products', 'create_products_page'
+    'create_shop_categories', 'create_featured_products', 'create_products_page',
+    'create_category_page', 'create_product_detail'
 ]
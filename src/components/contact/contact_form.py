@@ -1,14 +1,12 @@
 from fasthtml.common import *
+from src.services.icons import icon
 
 
 def create_icon_svg_form(icon_type):
-    """Create inline SVG icons for the contact form."""
-    icons = {
-        'message-circle': '''<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M7.9 20A9 9 0 1 0 4 16.1L2 22Z"/></svg>''',
-        'send': '''<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="m22 2-7 20-4-9-9-4Z"/><path d="M22 2 11 13"/></svg>''',
-        'check-circle': '''<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M22 11.08V12a10 10 0 1 1-5.93-9.14"/><polyline points="22 4 12 14.01 9 11.01"/></svg>''',
-    }
-    return NotStr(icons.get(icon_type, icons['message-circle']))
+    """Create sprite icon references for the contact form."""
+    if icon_type not in ('message-circle', 'send', 'check-circle'):
+        icon_type = 'message-circle'
+    return icon(icon_type, size=24)
 
 
 def create_contact_form(data=None):
@@ -1,12 +1,13 @@
 from fasthtml.common import *
 from src.config import get_data
 from src.utils.phone_formatter import format_phone_number
+from src.services.assets import asset_url
 from .contact_form import create_contact_form
 
 def create_service_card(item):
     """Create a service card component."""
     # Get image from YAML data or use default fallback
-    image_src = item.get('image', '/assets/images/icon.png')
+    image_src = asset_url(item.get('image', '/assets/images/icon.png'))
     
     # If the provided image is an SVG, render it as a mask so we can color it with CSS
     is_svg = str(image_src).lower().endswith('.svg')
@@ -1,20 +1,17 @@
 from fasthtml.common import *
+from src.services.icons import icon
 
 
 def create_icon_svg(icon_type):
-    """Create inline SVG icons similar to lucide-react."""
-    icons = {
-        'map-pin': '''<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M20 10c0 6-8 12-8 12s-8-6-8-12a8 8 0 0 1 16 0Z"/><circle cx="12" cy="10" r="3"/></svg>''',
-        'phone': '''<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M22 16.92v3a2 2 0 0 1-2.18 2 19.79 19.79 0 0 1-8.63-3.07 19.5 19.5 0 0 1-6-6 19.79 19.79 0 0 1-3.07-8.67A2 2 0 0 1 4.11 2h3a2 2 0 0 1 2 1.72 12.84 12.84 0 0 0 .7 2.81 2 2 0 0 1-.45 2.11L8.09 9.91a16 16 0 0 0 6 6l1.27-1.27a2 2 0 0 1 2.11-.45 12.84 12.84 0 0 0 2.81.7A2 2 0 0 1 22 16.92z"/></svg>''',
-        'clock': '''<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><circle cx="12" cy="12" r="10"/><polyline points="12 6 12 12 16 14"/></svg>''',
-        'mail': '''<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><rect width="20" height="16" x="2" y="4" rx="2"/><path d="m22 7-8.97 5.7a1.94 1.94 0 0 1-2.06 0L2 7"/></svg>''',
-    }
-    return NotStr(icons.get(icon_type, icons['map-pin']))
+    """Create sprite icon references similar to lucide-react."""
+    if icon_type not in ('map-pin', 'phone', 'clock', 'mail'):
+        icon_type = 'map-pin'
+    return icon(icon_type, size=24)
 
 
 def create_contact_card(item):
     """Create a single contact info card."""
-    icon = item.get('icon', 'map-pin')
+    icon_name = item.get('icon', 'map-pin')
     title = item.get('title', '')
     content = item.get('content', '')
     color = item.get('color', 'bg-indigo-100 text-indigo-600')
@@ -39,7 +36,7 @@ def create_contact_card(item):
         # Icon container
         Div(
             Div(
-                create_icon_svg(icon),
+                create_icon_svg(icon_name),
                 cls='w-6 h-6'
             ),
             cls=f'{color} w-12 h-12 rounded-xl flex items-center justify-center mb-4'
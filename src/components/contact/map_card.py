@@ -1,5 +1,6 @@
 from fasthtml.common import *
 from src.components.ui import create_dropdown
+from src.services.icons import icon
 import json
 
 
@@ -65,7 +66,7 @@ def create_map_card(locations=None):
         # Address display
         Div(
             Div(
-                NotStr('''<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M20 10c0 6-8 12-8 12s-8-6-8-12a8 8 0 0 1 16 0Z"/><circle cx="12" cy="10" r="3"/></svg>'''),
+                icon('map-pin', size=20),
                 cls='w-5 h-5 text-indigo-600 flex-shrink-0'
             ),
             P(
@@ -1,4 +1,5 @@
 from fasthtml.common import *
+from src.services.assets import asset_url
 
 def create_burger_menu(nav_items):
     """
@@ -22,8 +23,8 @@ def create_burger_menu(nav_items):
     """
     
     burger_button = Button(
-        Img(src='/assets/images/pen-burger.svg', alt='', cls='burger-bar-top'),
-        Img(src='/assets/images/pencil-burger.svg', alt='', cls='burger-bar-bottom'),
+        Img(src=asset_url('/assets/images/pen-burger.svg'), alt='', cls='burger-bar-top'),
+        Img(src=asset_url('/assets/images/pencil-burger.svg'), alt='', cls='burger-bar-bottom'),
         cls='burger-btn',
         id='burgerBtn',
         aria_label='Menu'
@@ -49,4 +50,4 @@ def burger_menu_script():
     - Auto-close on navigation link clicks
     - Dropdown positioning
     """
-    return Script(src='/assets/scripts/header-nav.js')
+    return Script(src=asset_url('/assets/scripts/header-nav.js'))
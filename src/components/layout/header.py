@@ -1,5 +1,6 @@
 from fasthtml.common import *
 from src.config import get_navigation_data
+from src.services.assets import asset_url
 from .burger_menu import create_burger_menu, burger_menu_script
 
 def create_header(data):
@@ -18,7 +19,7 @@ def create_header(data):
         Div(
             H1(
                 A(
-                    Img(src='/assets/images/logo.png', 
+                    Img(src=asset_url('/assets/images/logo.png'), 
                         alt=data['company_info']['name'], 
                         cls='logo-image', 
                         title=data['company_info']['name']),
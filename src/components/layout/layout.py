@@ -1,5 +1,6 @@
 from fasthtml.common import *
 from src.config import get_data, get_footer_data
+from src.services.assets import asset_url
 from .header import create_header
 from .footer import create_footer
 
@@ -74,9 +75,9 @@ def Layout(title, *content, header=None, footer=None, sidebar=None, head_meta=No
             Meta(property='og:url', content=og_url),
             Meta(property='og:type', content=og_type),
             Link(rel='canonical', href=canonical_url),
-            Link(rel='icon', type='image/png', href='/assets/images/icon.png'),
+            Link(rel='icon', type='image/png', href=asset_url('/assets/images/icon.png')),
             Title(title or 'Бюрократ'),
-            Link(rel='stylesheet', href='/assets/styles/main.css'),
+            Link(rel='stylesheet', href=asset_url('/assets/styles/main.css')),
             Script(src='https://unpkg.com/htmx.org@1.9.10'),
         ),
         Body(
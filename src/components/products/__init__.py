@@ -1,9 +1,12 @@
 from .products_page import create_products_page
 from .featured_products import create_featured_products
 from .shop_categories import create_shop_categories
+from .catalog_pages import create_category_page, create_product_detail
 
 __all__ = [
     'create_products_page',
     'create_featured_products',
-    'create_shop_categories'
+    'create_shop_categories',
+    'create_category_page',
+    'create_product_detail'
 ]
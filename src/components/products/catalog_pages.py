@@ -0,0 +1,164 @@
+from fasthtml.common import *
+from src.services.assets import asset_url
+from .products_page import (
+    BADGE_COLORS,
+    PRODUCTS_PAGE_URL,
+    category_urls,
+    create_product_card,
+    create_rating,
+    product_url,
+)
+
+
+def create_breadcrumbs(*items):
+    """Create a breadcrumb trail from (label, url) pairs; the last item is the current page."""
+    links = []
+    for i, (label, url) in enumerate(items):
+        if i:
+            links.append(Span('/', cls='breadcrumb-separator', aria_hidden='true'))
+        if i == len(items) - 1:
+            links.append(Span(label, aria_current='page'))
+        else:
+            links.append(A(label, href=url))
+    return Nav(*links, cls='breadcrumbs', aria_label='Навигация')
+
+
+def create_category_nav(categories, current_id=None):
+    """Create links to every category page, plus the full catalog.
+
+    Plain links: category pages work without JavaScript.
+    """
+    urls = category_urls(categories)
+    all_name = next((c['name'] for c in categories if c['id'] == 'all'), 'Все товары')
+    links = [A(all_name, href=PRODUCTS_PAGE_URL, cls='category-link')]
+    for category in categories:
+        if category['id'] not in urls:
+            continue
+        current = category['id'] == current_id
+        links.append(A(
+            category['name'],
+            href=urls[category['id']],
+            cls='category-link active' if current else 'category-link',
+            aria_current='page' if current else None
+        ))
+    return Nav(*links, cls='category-nav', aria_label='Категории')
+
+
+def create_category_page(data, category, products, categories):
+    """Create a category page: every active product of one category.
+
+    Unlike the products page there are no filters and no product-filters.js;
+    the page holds only this category's cards. Its products are also
+    published as JSON next to the page (<category URL>.json).
+
+    Args:
+        data: Products page labels (products_services.yaml)
+        category: The category
+        products: Its active products in display order
+        categories: Active categories, for the navigation
+    """
+    page_title = data.get('page_title', 'Наши товары')
+    products_text = data.get('products_text', 'товаров')
+    add_to_cart_text = data.get('add_to_cart_text', 'Добавить в корзину')
+    urls = category_urls(categories)
+
+    product_cards = [
+        create_product_card(product, add_to_cart_text, product_url(product, urls))
+        for product in products
+    ]
+    if not product_cards:
+        product_cards = [Div(
+            P(data.get('no_results_title', 'Товары не найдены'), cls='no-results-title'),
+            cls='no-results-message'
+        )]
+
+    return Section(
+        Div(
+            create_breadcrumbs(('Главная', '/'), (page_title, PRODUCTS_PAGE_URL), (category['name'], None)),
+            Div(
+                H1(category['name'], cls='products-page-title'),
+                P(category.get('description', ''), cls='products-page-subtitle'),
+                cls='products-page-header'
+            ),
+            create_category_nav(categories, category['id']),
+            Div(
+                Span(f'{len(products)} {products_text}', cls='results-count'),
+                cls='results-info'
+            ),
+            Div(*product_cards, cls='products-grid', id='products-grid'),
+            cls='products-page-container',
+            data_category=category['id'],
+            data_products_url=f"{category['url']}.json"
+        ),
+        cls='products-page-section section category-page'
+    )
+
+
+def create_product_detail(data, product, category, related=()):
+    """Create a product page: image, price, stock and description.
+
+    Args:
+        data: Products page labels (products_services.yaml)
+        product: The product
+        category: Its category
+        related: Other products of the category, shown as cards below
+    """
+    page_title = data.get('page_title', 'Наши товары')
+    add_to_cart_text = data.get('add_to_cart_text', 'Добавить в корзину')
+    in_stock_text = data.get('in_stock_text', 'В наличии')
+    out_of_stock_text = data.get('out_of_stock_text', 'Нет в наличии')
+    related_title = data.get('related_title', 'Ещё в этой категории')
+    urls = {category['id']: category['url']}
+
+    badge = product.get('badge', '')
+    in_stock = product.get('in_stock', True)
+
+    related_section = None
+    if related:
+        related_section = Div(
+            H2(related_title, cls='related-products-title'),
+            Div(
+                *[create_product_card(p, add_to_cart_text, product_url(p, urls)) for p in related],
+                cls='products-grid'
+            ),
+            cls='related-products'
+        )
+
+    return Section(
+        Div(
+            create_breadcrumbs(
+                ('Главная', '/'),
+                (page_title, PRODUCTS_PAGE_URL),
+                (category['name'], category['url']),
+                (product['name'], None),
+            ),
+            Article(
+                Div(
+                    Span(badge, cls=f"product-badge {BADGE_COLORS.get(badge, 'badge-default')}") if badge else None,
+                    Img(src=asset_url(product.get('image', '')), alt=product['name'], cls='product-detail-image'),
+                    cls='product-detail-media'
+                ),
+                Div(
+                    A(category['name'], href=category['url'], cls='product-category-label'),
+                    H1(product['name'], cls='product-detail-title'),
+                    create_rating(product.get('rating', 0), product.get('reviews', 0)),
+                    P(product.get('description', ''), cls='product-detail-description'),
+                    Div(
+                        Span(f"${product.get('price', 0):.2f}", cls='product-price'),
+                        Span(
+                            in_stock_text if in_stock else out_of_stock_text,
+                            cls='stock-status in-stock' if in_stock else 'stock-status out-of-stock'
+                        ),
+                        cls='product-detail-price'
+                    ),
+                    Button(add_to_cart_text, cls='btn-add-cart', disabled=not in_stock),
+                    cls='product-detail-info'
+                ),
+                cls='product-detail',
+                data_product_id=str(product['id'])
+            ),
+            related_section,
+            cls='products-page-container'
+        ),
+        cls='products-page-section section product-page'
+    )
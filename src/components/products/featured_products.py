@@ -1,4 +1,5 @@
 from fasthtml.common import *
+from src.services.icons import icon
 
 
 def create_featured_products(data):
@@ -34,10 +35,8 @@ def create_featured_products(data):
         badge_class = badge_colors.get(badge, 'badge-default')
         
         # Create star rating display
-        star_icon = '''<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" viewBox="0 0 24 24" fill="currentColor" stroke="none"><polygon points="12 2 15.09 8.26 22 9.27 17 14.14 18.18 21.02 12 17.77 5.82 21.02 7 14.14 2 9.27 8.91 8.26 12 2"></polygon></svg>'''
-        
         rating_display = Div(
-            NotStr(star_icon),
+            icon('star', size=16),
             Span(str(rating), cls='rating-value'),
             cls='product-rating'
         )
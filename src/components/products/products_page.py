@@ -1,9 +1,232 @@
+from urllib.parse import urlencode
+
 from fasthtml.common import *
 from src.components.ui import create_dropdown
+from src.services.assets import asset_url
+from src.services.catalog import CATEGORY_URL_PREFIX
+from src.services.icons import get_icon_sprite, icon
+
+
+# Full page and the endpoint returning only the results block for HTMX
+PRODUCTS_PAGE_URL = '/products-and-services'
+PRODUCTS_GRID_URL = '/products-and-services/grid'
+# Typeahead suggestions for the search box
+PRODUCTS_SUGGEST_URL = '/api/products/suggest'
+# Static catalog API product-filters.js falls back to without a server (src/pages/catalog/api.py)
+PRODUCTS_CATALOG_URL = '/catalog/index.json'
+
+# Badge color mapping
+BADGE_COLORS = {
+    'Bestseller': 'badge-bestseller',
+    'Бестселлер': 'badge-bestseller',
+    'New': 'badge-new',
+    'Новинка': 'badge-new',
+    'Premium': 'badge-premium',
+    'Премиум': 'badge-premium',
+    'Popular': 'badge-popular',
+    'Популярный': 'badge-popular',
+}
+
+
+def filters_query(filters, page=None):
+    """Build the query string for a set of product filters.
+    
+    Args:
+        filters: Dict with categories, price_min, price_max, in_stock, q, sort
+            and page, as parsed by the products route. Defaults are omitted.
+        page: Page number to use instead of filters['page']
+    """
+    params = [('category', c) for c in filters.get('categories', ()) if c != 'all']
+    if filters.get('price_min') is not None:
+        params.append(('price_min', f"{filters['price_min']:g}"))
+    if filters.get('price_max') is not None:
+        params.append(('price_max', f"{filters['price_max']:g}"))
+    if filters.get('in_stock'):
+        params.append(('in_stock', 'true'))
+    if filters.get('q'):
+        params.append(('q', filters['q']))
+    if filters.get('sort', 'featured') != 'featured':
+        params.append(('sort', filters['sort']))
+    page = filters.get('page', 1) if page is None else page
+    if page > 1:
+        params.append(('page', str(page)))
+    return urlencode(params)
+
+
+def category_urls(categories):
+    """Map category ID to the URL of its page, for categories that have one."""
+    return {
+        c['id']: c['url'] for c in categories
+        if (c.get('url') or '').startswith(CATEGORY_URL_PREFIX)
+    }
+
+
+def product_url(product, urls):
+    """URL of a product's page (<category URL>/<id>), or None without a category page."""
+    base = urls.get(product.get('category'))
+    return f"{base}/{product['id']}" if base else None
+
+
+def create_rating(rating, reviews):
+    """Create the star, rating and review count line of a product."""
+    return Div(
+        icon('star', size=16),
+        Span(str(rating), cls='rating-value'),
+        Span(f'({reviews} отзывов)', cls='review-count'),
+        cls='product-rating'
+    )
+
+
+def create_product_card(product, add_to_cart_text='Добавить в корзину', url=None):
+    """Create a single product card for the products grid.
+    
+    With url, the product name links to the product's page.
+    """
+    product_id = product.get('id', '')
+    name = product.get('name', '')
+    price = product.get('price', 0)
+    image = product.get('image', '')
+    rating = product.get('rating', 0)
+    reviews = product.get('reviews', 0)
+    badge = product.get('badge', '')
+    category = product.get('category', '')
+    in_stock = product.get('in_stock', True)
+    
+    badge_class = BADGE_COLORS.get(badge, 'badge-default')
+    
+    rating_display = create_rating(rating, reviews)
+    
+    # Create badge if exists
+    badge_element = Span(badge, cls=f'product-badge {badge_class}') if badge else None
+    
+    return Div(
+        Div(
+            badge_element if badge_element else None,
+            Img(
+                src=asset_url(image),
+                alt=name,
+                cls='product-image',
+                loading='lazy'
+            ),
+            cls='product-image-container'
+        ),
+        Div(
+            rating_display,
+            H3(A(name, href=url) if url else name, cls='product-name'),
+            Div(
+                Span(f'${price:.2f}', cls='product-price'),
+                Button(add_to_cart_text, cls='btn-add-cart'),
+                cls='product-footer'
+            ),
+            cls='product-content'
+        ),
+        cls='product-card',
+        data_product_id=str(product_id),
+        data_category=category,
+        data_in_stock='true' if in_stock else 'false'
+    )
+
+
+def _page_link(label, page, filters, current=False, disabled=False):
+    """Create a pagination link: a plain link to the full page, upgraded by HTMX."""
+    if disabled:
+        return Span(label, cls='pagination-link disabled')
+    query = filters_query(filters, page)
+    suffix = f'?{query}' if query else ''
+    return A(
+        label,
+        href=f'{PRODUCTS_PAGE_URL}{suffix}',
+        hx_get=f'{PRODUCTS_GRID_URL}{suffix}',
+        hx_target='#products-results',
+        hx_swap='outerHTML',
+        cls='pagination-link active' if current else 'pagination-link',
+        aria_current='page' if current else None
+    )
+
+
+def create_pagination(results, filters, data):
+    """Create pagination controls, or None when everything fits on one page."""
+    if results.pages <= 1:
+        return None
+    
+    previous_text = data.get('previous_text', 'Назад')
+    next_text = data.get('next_text', 'Далее')
+    page = results.page
+    
+    # First, last and up to two pages on each side of the current one
+    shown = sorted({1, results.pages, *range(max(1, page - 2), min(results.pages, page + 2) + 1)})
+    links = [_page_link(previous_text, page - 1, filters, disabled=page == 1)]
+    last = 0
+    for n in shown:
+        if n - last > 1:
+            links.append(Span('…', cls='pagination-gap'))
+        links.append(_page_link(str(n), n, filters, current=n == page))
+        last = n
+    links.append(_page_link(next_text, page + 1, filters, disabled=page == results.pages))
+    
+    return Nav(*links, cls='products-pagination', aria_label='Страницы')
 
 
-def create_products_page(data):
-    """Create full products page with filters, search, and product grid."""
+def create_products_results(data, results, filters):
+    """Create the results block: count, one page of product cards and pagination.
+    
+    The products page embeds it and /products-and-services/grid returns it
+    on its own for HTMX to swap in.
+    
+    Args:
+        data: Products page labels (products_services.yaml)
+        results: ProductPage returned by query_products()
+        filters: Filters the results were queried with
+    """
+    showing_text = data.get('showing_text', 'Показано')
+    of_text = data.get('of_text', 'из')
+    products_text = data.get('products_text', 'товаров')
+    add_to_cart_text = data.get('add_to_cart_text', 'Добавить в корзину')
+    
+    urls = category_urls(data.get('categories', []))
+    product_cards = [
+        create_product_card(product, add_to_cart_text, product_url(product, urls))
+        for product in results.items
+    ]
+    if not product_cards:
+        product_cards = [Div(
+            P(data.get('no_results_title', 'Товары не найдены'), cls='no-results-title'),
+            P(data.get('no_results_text', 'Попробуйте изменить фильтры или поисковый запрос'), cls='no-results-text'),
+            cls='no-results-message'
+        )]
+    
+    return Div(
+        # Results count
+        Div(
+            Span(f'{showing_text} {len(results.items)} {of_text} {results.total} {products_text}', cls='results-count'),
+            cls='results-info'
+        ),
+        
+        # Products grid
+        Div(
+            *product_cards,
+            cls='products-grid',
+            id='products-grid'
+        ),
+        
+        create_pagination(results, filters, data),
+        
+        cls='products-results',
+        id='products-results'
+    )
+
+
+def create_products_page(data, results, filters, price_range=(0, 100), static=False):
+    """Create full products page with filters, search, and one page of products.
+    
+    Args:
+        data: Products page labels and categories
+        results: ProductPage for the current filters
+        filters: Parsed filters (categories, price_min, price_max, in_stock, q, sort, page)
+        price_range: (min, max) price of all active products, for the slider
+        static: Rendered for a static host: product-filters.js filters the
+            static catalog API instead of requesting the grid
+    """
     
     # Extract data
     page_title = data.get('page_title', 'Наши товары')
@@ -15,32 +238,24 @@ def create_products_page(data):
     clear_filters = data.get('clear_filters', 'Очистить все фильтры')
     search_placeholder = data.get('search_placeholder', 'Поиск товаров...')
     sort_label = data.get('sort_label', 'Рекомендуемые')
-    showing_text = data.get('showing_text', 'Показано')
-    of_text = data.get('of_text', 'из')
-    products_text = data.get('products_text', 'товаров')
-    add_to_cart_text = data.get('add_to_cart_text', 'Добавить в корзину')
     
     categories = data.get('categories', [])
-    products = data.get('products', [])
+    selected_categories = set(filters.get('categories', ())) - {'all'}
     
-    # Badge color mapping
-    badge_colors = {
-        'Bestseller': 'badge-bestseller',
-        'Бестселлер': 'badge-bestseller',
-        'New': 'badge-new',
-        'Новинка': 'badge-new',
-        'Premium': 'badge-premium',
-        'Премиум': 'badge-premium',
-        'Popular': 'badge-popular',
-        'Популярный': 'badge-popular',
-    }
+    # Slider works in whole dollars around the catalog's price range
+    price_floor = int(price_range[0] // 1)
+    price_ceil = -int(-price_range[1] // 1)
+    price_min = filters.get('price_min')
+    price_max = filters.get('price_max')
+    price_min = price_floor if price_min is None else max(price_floor, int(price_min // 1))
+    price_max = price_ceil if price_max is None else min(price_ceil, -int(-price_max // 1))
     
     # Create category checkboxes
     category_items = []
     for cat in categories:
         cat_id = cat.get('id', '')
         cat_name = cat.get('name', '')
-        checked = cat.get('checked', False)
+        checked = cat_id in selected_categories if selected_categories else cat_id == 'all'
         
         checkbox = Label(
             Input(
@@ -78,25 +293,25 @@ def create_products_page(data):
                     Div(cls='slider-range', id='slider-range'),
                     Input(
                         type='range',
-                        min='0',
-                        max='100',
-                        value='0',
+                        min=str(price_floor),
+                        max=str(price_ceil),
+                        value=str(price_min),
                         cls='price-slider price-slider-min',
                         id='price-min'
                     ),
                     Input(
                         type='range',
-                        min='0',
-                        max='100',
-                        value='100',
+                        min=str(price_floor),
+                        max=str(price_ceil),
+                        value=str(price_max),
                         cls='price-slider price-slider-max',
                         id='price-max'
                     ),
                     cls='price-slider-container'
                 ),
                 Div(
-                    Span('$0', cls='price-value', id='price-min-value'),
-                    Span('$100', cls='price-value', id='price-max-value'),
+                    Span(f'${price_min}', cls='price-value', id='price-min-value'),
+                    Span(f'${price_max}', cls='price-value', id='price-max-value'),
                     cls='price-values'
                 ),
                 cls='price-range-controls'
@@ -110,6 +325,7 @@ def create_products_page(data):
                 Input(
                     type='checkbox',
                     name='in-stock',
+                    checked=bool(filters.get('in_stock')),
                     cls='stock-checkbox'
                 ),
                 Span(in_stock_only),
@@ -124,79 +340,26 @@ def create_products_page(data):
         cls='filters-sidebar'
     )
     
-    # Create search icon
-    search_icon = '''<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><circle cx="11" cy="11" r="8"></circle><path d="m21 21-4.35-4.35"></path></svg>'''
-    
-    # Create star icon for ratings
-    star_icon = '''<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" viewBox="0 0 24 24" fill="currentColor" stroke="none"><polygon points="12 2 15.09 8.26 22 9.27 17 14.14 18.18 21.02 12 17.77 5.82 21.02 7 14.14 2 9.27 8.91 8.26 12 2"></polygon></svg>'''
-    
-    # Create product cards
-    product_cards = []
-    for product in products:
-        product_id = product.get('id', '')
-        name = product.get('name', '')
-        price = product.get('price', 0)
-        image = product.get('image', '')
-        rating = product.get('rating', 0)
-        reviews = product.get('reviews', 0)
-        badge = product.get('badge', '')
-        category = product.get('category', '')
-        in_stock = product.get('in_stock', True)
-        
-        badge_class = badge_colors.get(badge, 'badge-default')
-        
-        # Create rating display
-        rating_display = Div(
-            NotStr(star_icon),
-            Span(str(rating), cls='rating-value'),
-            Span(f'({reviews} отзывов)', cls='review-count'),
-            cls='product-rating'
-        )
-        
-        # Create badge if exists
-        badge_element = Span(badge, cls=f'product-badge {badge_class}') if badge else None
-        
-        # Create product card
-        card = Div(
-            Div(
-                badge_element if badge_element else None,
-                Img(
-                    src=image,
-                    alt=name,
-                    cls='product-image',
-                    loading='lazy'
-                ),
-                cls='product-image-container'
-            ),
-            Div(
-                rating_display,
-                H3(name, cls='product-name'),
-                Div(
-                    Span(f'${price:.2f}', cls='product-price'),
-                    Button(add_to_cart_text, cls='btn-add-cart'),
-                    cls='product-footer'
-                ),
-                cls='product-content'
-            ),
-            cls='product-card',
-            data_product_id=str(product_id),
-            data_category=category,
-            data_in_stock='true' if in_stock else 'false'
-        )
-        product_cards.append(card)
-    
     # Create main content area
     main_content = Div(
         # Search and sort bar
         Div(
             Div(
-                Span(NotStr(search_icon), cls='search-icon'),
+                Span(icon('search', size=20), cls='search-icon'),
                 Input(
                     type='text',
                     placeholder=search_placeholder,
+                    value=filters.get('q', ''),
                     cls='search-input',
-                    id='product-search'
+                    id='product-search',
+                    autocomplete='off',
+                    role='combobox',
+                    aria_autocomplete='list',
+                    aria_controls='product-suggestions',
+                    aria_expanded='false',
+                    data_suggest_url=PRODUCTS_SUGGEST_URL
                 ),
+                Ul(cls='search-suggestions', id='product-suggestions', role='listbox', hidden=True),
                 cls='search-box'
             ),
             create_dropdown(
@@ -206,7 +369,7 @@ def create_products_page(data):
                     {'value': 'price-desc', 'label': 'Цена: по убыванию'},
                     {'value': 'rating', 'label': 'Рейтинг'}
                 ],
-                selected_value='featured',
+                selected_value=filters.get('sort', 'featured'),
                 dropdown_id='product-sort',
                 variant='default',
                 size='medium',
@@ -216,18 +379,8 @@ def create_products_page(data):
             cls='search-sort-bar'
         ),
         
-        # Results count
-        Div(
-            Span(f'{showing_text} {len(products)} {of_text} {len(products)} {products_text}', cls='results-count'),
-            cls='results-info'
-        ),
-        
-        # Products grid
-        Div(
-            *product_cards,
-            cls='products-grid',
-            id='products-grid'
-        ),
+        # Results count, one page of product cards and pagination
+        create_products_results(data, results, filters),
         
         cls='products-main-content'
     )
@@ -249,9 +402,26 @@ def create_products_page(data):
                 cls='products-layout'
             ),
             
-            cls='products-page-container'
+            cls='products-page-container',
+            data_grid_url=PRODUCTS_GRID_URL,
+            data_page_url=PRODUCTS_PAGE_URL,
+            data_static='true' if static else None,
+            # For rendering results from the static catalog API: the filters
+            # rendered here, the page size, the star icon and the labels
+            data_catalog_url=PRODUCTS_CATALOG_URL,
+            data_query=filters_query(filters, results.page),
+            data_page_size=str(results.page_size),
+            data_star_icon=get_icon_sprite().url('star'),
+            data_add_to_cart_text=data.get('add_to_cart_text', 'Добавить в корзину'),
+            data_showing_text=data.get('showing_text', 'Показано'),
+            data_of_text=data.get('of_text', 'из'),
+            data_products_text=data.get('products_text', 'товаров'),
+            data_no_results_title=data.get('no_results_title', 'Товары не найдены'),
+            data_no_results_text=data.get('no_results_text', 'Попробуйте изменить фильтры или поисковый запрос'),
+            data_previous_text=data.get('previous_text', 'Назад'),
+            data_next_text=data.get('next_text', 'Далее')
         ),
         # Include the product filters JavaScript
-        Script(src='/assets/scripts/product-filters.js'),
+        Script(src=asset_url('/assets/scripts/product-filters.js')),
         cls='products-page-section section'
     )
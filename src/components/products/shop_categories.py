@@ -1,4 +1,5 @@
 from fasthtml.common import *
+from src.services.icons import get_icon_sprite
 
 
 def create_shop_categories(data):
@@ -18,6 +19,7 @@ def create_shop_categories(data):
         'bg-teal-500': '#14b8a6',
     }
     
+    sprite = get_icon_sprite()
     category_cards = []
     for category in categories:
         icon_src = category.get('icon', '')
@@ -27,9 +29,12 @@ def create_shop_categories(data):
         color_value = color_map.get(color_class, '#3b82f6')
         url = category.get('url', '#')
         
-        # Create icon with colored background
-        icon_node = Div(
-            Span(
+        # Sprite icon in the category color; other images are drawn through a mask
+        sprite_id = sprite.image_icon(icon_src)
+        if sprite_id:
+            icon_inner = sprite.icon(sprite_id, cls='category-icon-inner', label=name, style=f"color: {color_value};")
+        else:
+            icon_inner = Span(
                 cls='category-icon-inner',
                 role='img',
                 aria_label=name,
@@ -38,9 +43,8 @@ def create_shop_categories(data):
                     f"-webkit-mask: url('{icon_src}') no-repeat center / contain; "
                     f"mask: url('{icon_src}') no-repeat center / contain;"
                 )
-            ),
-            cls='category-icon'
-        )
+            )
+        icon_node = Div(icon_inner, cls='category-icon')
         
         # Create category card
         card = A(
@@ -1,4 +1,5 @@
 from fasthtml.common import *
+from src.services.icons import icon
 
 
 def create_faq_item(faq, index):
@@ -12,7 +13,7 @@ def create_faq_item(faq, index):
         Button(
             Span(question, cls='pr-4'),
             Span(
-                NotStr('''<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="accordion-icon"><polyline points="6 9 12 15 18 9"/></svg>'''),
+                icon('chevron-down', size=20, cls='accordion-icon'),
                 cls='accordion-icon-wrapper'
             ),
             type='button',
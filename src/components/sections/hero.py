@@ -1,4 +1,5 @@
 from fasthtml.common import *
+from src.services.assets import asset_url
 
 
 def create_hero(data):
@@ -58,7 +59,7 @@ def create_hero(data):
                 Div(
                     Div(cls='image-glow'),
                     Img(
-                        src=data.get('image', '/assets/images/engraving.svg'),
+                        src=asset_url(data.get('image', '/assets/images/engraving.svg')),
                         alt='Печати и штампы',
                         cls='hero-image'
                     ),
@@ -1,4 +1,5 @@
 from fasthtml.common import *
+from src.services.icons import icon
 
 
 def create_dropdown(
@@ -122,7 +123,7 @@ def create_dropdown(
     
     # Create dropdown icon (chevron)
     dropdown_icon = Div(
-        NotStr('''<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><polyline points="6 9 12 15 18 9"/></svg>'''),
+        icon('chevron-down', size=20),
         cls='dropdown-icon'
     )
     
@@ -153,9 +154,7 @@ def create_dropdown(
 
 
 def create_icon_svg(icon_type):
-    """Create inline SVG icons for dropdown decorations."""
-    icons = {
-        'chevron-down': '''<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><polyline points="6 9 12 15 18 9"/></svg>''',
-        'check': '''<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><polyline points="20 6 9 17 4 12"/></svg>''',
-    }
-    return NotStr(icons.get(icon_type, icons['chevron-down']))
+    """Create sprite icon references for dropdown decorations."""
+    if icon_type == 'check':
+        return icon('check', size=16)
+    return icon('chevron-down', size=20)
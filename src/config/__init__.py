@@ -1,6 +1,14 @@
+from .data_store import DataStore, get_data_store
+from .snapshot import FrozenDict, FrozenList, freeze, overlay
+from .reads import record_read, recording_reads
+from .data_bundle import compile_bundle, load_yaml_path
 from .data_loader import (
+    load_yaml_file,
+    preload_data,
     load_page_data,
     get_data,
+    get_data_version,
+    get_content_version,
     get_about_data,
     load_about_data,
     get_privacy_data,
@@ -30,17 +38,38 @@ from .data_loader import (
     load_shop_categories_data,
     get_featured_products_data,
     load_featured_products_data,
+    get_faq_data,
+    load_faq_data,
+    get_search_data,
+    load_search_data,
     # Database functions
     get_products_from_db,
+    get_product_from_db,
     get_categories_from_db,
+    query_products,
+    get_product_price_range,
     get_db_products_services_data,
     get_db_shop_categories_data,
     get_db_featured_products_data,
 )
 
 __all__ = [
+    'DataStore',
+    'get_data_store',
+    'FrozenDict',
+    'FrozenList',
+    'freeze',
+    'overlay',
+    'record_read',
+    'recording_reads',
+    'compile_bundle',
+    'load_yaml_path',
+    'load_yaml_file',
+    'preload_data',
     'load_page_data',
     'get_data',
+    'get_data_version',
+    'get_content_version',
     'get_about_data',
     'load_about_data',
     'get_privacy_data',
@@ -70,9 +99,16 @@ __all__ = [
     'load_shop_categories_data',
     'get_featured_products_data',
     'load_featured_products_data',
+    'get_faq_data',
+    'load_faq_data',
+    'get_search_data',
+    'load_search_data',
     # Database functions
     'get_products_from_db',
+    'get_product_from_db',
     'get_categories_from_db',
+    'query_products',
+    'get_product_price_range',
     'get_db_products_services_data',
     'get_db_shop_categories_data',
     'get_db_featured_products_data',
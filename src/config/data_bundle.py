@@ -0,0 +1,126 @@
+"""
+Precompiled bundle of the YAML files in ``data/``.
+
+``compile_data.py`` parses every YAML file once at build/deploy time and
+stores the results in a single pickle together with the SHA-256 of each
+source file. At runtime ``load_yaml_path`` serves a file from the bundle when
+its hash still matches and falls back to parsing it (with the libyaml C
+loader when PyYAML was built with it).
+
+The bundle is a build artifact written by this project; it is not meant to be
+shared or loaded from untrusted locations.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+
+BUNDLE_FORMAT = 1
+BUNDLE_FILENAME = '.data_bundle.pickle'
+
+# libyaml-backed loader is several times faster than the pure-Python one
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def parse_yaml(text: str):
+    """Parse YAML text with the fastest available safe loader."""
+    return yaml.load(text, Loader=YamlLoader)
+
+
+def _sha256(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def compile_bundle(data_dir: Path, bundle_path: Optional[Path] = None) -> Path:
+    """Parse every YAML file in ``data_dir`` into a single bundle file.
+
+    Returns:
+        Path of the written bundle.
+    """
+    data_dir = Path(data_dir)
+    bundle_path = Path(bundle_path) if bundle_path else data_dir / BUNDLE_FILENAME
+
+    files = {}
+    for path in sorted(data_dir.glob('*.yaml')):
+        raw = path.read_bytes()
+        data = parse_yaml(raw.decode('utf-8'))
+        files[path.name] = (_sha256(raw), pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+
+    bundle = {'format': BUNDLE_FORMAT, 'files': files}
+
+    # Write atomically so running workers never see a partial bundle
+    tmp_path = bundle_path.with_suffix(bundle_path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, bundle_path)
+    return bundle_path
+
+
+class DataBundle:
+    """Read side of a compiled bundle, loaded lazily on first use."""
+
+    def __init__(self, bundle_path: Path):
+        self.bundle_path = Path(bundle_path)
+        self._files = None
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> dict:
+        if self._files is None:
+            self._files = {}
+            try:
+                with open(self.bundle_path, 'rb') as f:
+                    bundle = pickle.load(f)
+                if bundle.get('format') == BUNDLE_FORMAT:
+                    self._files = bundle['files']
+                    logging.info(f"📦 Loaded data bundle with {len(self._files)} files")
+                else:
+                    logging.warning(f"⚠️  Ignoring data bundle {self.bundle_path.name}: unknown format")
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.warning(f"⚠️  Ignoring unreadable data bundle {self.bundle_path.name}: {e}")
+        return self._files
+
+    def lookup(self, filename: str, raw: bytes):
+        """Get pre-parsed data for a file if the bundle has it at this content.
+
+        Returns:
+            Tuple of (found: bool, data).
+        """
+        entry = self._load().get(filename)
+        if entry is None or entry[0] != _sha256(raw):
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        # Unpickle per call so every caller gets its own objects
+        return True, pickle.loads(entry[1])
+
+
+# Singleton instance
+_bundle = None
+
+def get_data_bundle() -> DataBundle:
+    """Get the bundle for the project's data directory."""
+    global _bundle
+    if _bundle is None:
+        data_dir = Path(__file__).parent.parent.parent / 'data'
+        _bundle = DataBundle(os.environ.get('DATA_BUNDLE_PATH', data_dir / BUNDLE_FILENAME))
+    return _bundle
+
+
+def load_yaml_path(path: Path):
+    """Load a YAML file, from the compiled bundle when it is up to date."""
+    path = Path(path)
+    raw = path.read_bytes()
+    if os.environ.get('DATA_BUNDLE', 'true').lower() == 'true':
+        found, data = get_data_bundle().lookup(path.name, raw)
+        if found:
+            return data
+    return parse_yaml(raw.decode('utf-8'))
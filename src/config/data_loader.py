@@ -1,147 +1,132 @@
-import yaml
 from pathlib import Path
 from typing import Optional
-from sqlmodel import select
 
-_data = {}
+from .data_bundle import load_yaml_path
+from .data_store import get_data_store
+from .snapshot import overlay
+
+DATA_DIR = Path(__file__).parent.parent.parent / 'data'
+
+# YAML data is held by a versioned DataStore that reloads files when they
+# change on disk; the getters below always return the current snapshot.
+# Snapshot data is read-only: derived data is layered on with overlay().
+_store = get_data_store()
 
 def load_yaml_file(filename):
-    """Load a YAML file from the data directory."""
-    data_dir = Path(__file__).parent.parent.parent / 'data'
-    file_path = data_dir / filename
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    """Load a YAML file from the data directory.
+
+    Uses the compiled data bundle when it matches the file's content hash,
+    otherwise parses the file (with the C loader if available).
+    """
+    return load_yaml_path(DATA_DIR / filename)
+
+def preload_data():
+    """Eagerly load every YAML data file so no request pays parse latency."""
+    return _store.load_all()
+
+def get_data_version():
+    """Get the data store version.
+
+    Increases every time a changed YAML file is reloaded.
+    """
+    return _store.version
+
+def get_content_version():
+    """Get the combined version of YAML data, the products catalog and assets.
+
+    Used by caches to detect when rendered pages may have changed. Asset
+    changes count because pages embed fingerprinted asset URLs.
+    """
+    from src.services.assets import get_asset_manifest
+    from src.services.catalog import get_catalog
+    manifest = get_asset_manifest()
+    manifest.refresh()
+    return (get_data_version(), get_catalog().version, manifest.version)
 
 def load_page_data():
     """Load main page data from YAML file."""
-    global _data
-    _data['main'] = load_yaml_file('main_page.yaml')
-    return _data
+    _store.get('main')
+    return _store.snapshot.data
 
 def load_about_data():
     """Load about page data from YAML file."""
-    global _data
-    if 'about' not in _data:
-        _data['about'] = load_yaml_file('about.yaml')
-    return _data['about']
+    return _store.get('about')
 
 def get_data():
     """Get main page data with FAQ."""
-    main_data = _data.get('main', {})
+    main_data = _store.get('main') or {}
     # Add FAQ data if available
     if 'faq' not in main_data:
-        main_data['faq'] = get_faq_data()
+        return overlay(main_data, faq=get_faq_data())
     return main_data
 
 def get_about_data():
     """Get about page data."""
-    if 'about' not in _data:
-        load_about_data()
-    return _data['about']
+    return _store.get('about')
 
 def load_privacy_data():
     """Load privacy page data from YAML file."""
-    global _data
-    if 'privacy' not in _data:
-        _data['privacy'] = load_yaml_file('privacy.yaml')
-    return _data['privacy']
+    return _store.get('privacy')
 
 def get_privacy_data():
     """Get privacy page data."""
-    if 'privacy' not in _data:
-        load_privacy_data()
-    return _data['privacy']
+    return _store.get('privacy')
 
 def load_contact_data():
     """Load contact page data from YAML file."""
-    global _data
-    if 'contact' not in _data:
-        _data['contact'] = load_yaml_file('contact.yaml')
-    return _data['contact']
+    return _store.get('contact')
 
 def get_contact_data():
     """Get contact page data."""
-    if 'contact' not in _data:
-        load_contact_data()
-    return _data['contact']
+    return _store.get('contact')
 
 def load_seals_stamps_data():
     """Load seals and stamps page data from YAML file."""
-    global _data
-    if 'seals_stamps' not in _data:
-        _data['seals_stamps'] = load_yaml_file('seals_stamps.yaml')
-    return _data['seals_stamps']
+    return _store.get('seals_stamps')
 
 def get_seals_stamps_data():
     """Get seals and stamps page data."""
-    if 'seals_stamps' not in _data:
-        load_seals_stamps_data()
-    return _data['seals_stamps']
+    return _store.get('seals_stamps')
 
 def load_self_inking_stamps_data():
     """Load self-inking stamps page data from YAML file."""
-    global _data
-    if 'self_inking_stamps' not in _data:
-        _data['self_inking_stamps'] = load_yaml_file('self_inking_stamps.yaml')
-    return _data['self_inking_stamps']
+    return _store.get('self_inking_stamps')
 
 def get_self_inking_stamps_data():
     """Get self-inking stamps page data."""
-    if 'self_inking_stamps' not in _data:
-        load_self_inking_stamps_data()
-    return _data['self_inking_stamps']
+    return _store.get('self_inking_stamps')
 
 def load_stationery_data():
     """Load stationery page data from YAML file."""
-    global _data
-    if 'stationery' not in _data:
-        _data['stationery'] = load_yaml_file('stationery.yaml')
-    return _data['stationery']
+    return _store.get('stationery')
 
 def get_stationery_data():
     """Get stationery page data."""
-    if 'stationery' not in _data:
-        load_stationery_data()
-    return _data['stationery']
+    return _store.get('stationery')
 
 def load_clients_data():
     """Load clients page data from YAML file."""
-    global _data
-    if 'clients' not in _data:
-        _data['clients'] = load_yaml_file('clients.yaml')
-    return _data['clients']
+    return _store.get('clients')
 
 def get_clients_data():
     """Get clients page data."""
-    if 'clients' not in _data:
-        load_clients_data()
-    return _data['clients']
+    return _store.get('clients')
 
 def load_agreement_data():
     """Load agreement page data from YAML file."""
-    global _data
-    if 'agreement' not in _data:
-        _data['agreement'] = load_yaml_file('agreement.yaml')
-    return _data['agreement']
+    return _store.get('agreement')
 
 def get_agreement_data():
     """Get agreement page data."""
-    if 'agreement' not in _data:
-        load_agreement_data()
-    return _data['agreement']
+    return _store.get('agreement')
 
 def load_hero_data():
     """Load hero section data from YAML file."""
-    global _data
-    if 'hero' not in _data:
-        _data['hero'] = load_yaml_file('hero.yaml')
-    return _data['hero']
+    return _store.get('hero')
 
 def get_hero_data():
     """Get hero section data."""
-    if 'hero' not in _data:
-        load_hero_data()
-    return _data['hero']
+    return _store.get('hero')
 
 def get_header_data():
     """Get header data (from main page data)."""
@@ -152,9 +137,7 @@ def get_footer_data():
     main_data = get_data()
     about_data = get_about_data()
     # Merge locations from about data into main data
-    footer_data = main_data.copy()
-    footer_data['locations'] = about_data.get('locations', {})
-    return footer_data
+    return overlay(main_data, locations=about_data.get('locations', {}))
 
 def get_services_data():
     """Get services data (from navigation data)."""
@@ -162,68 +145,51 @@ def get_services_data():
 
 def load_navigation_data():
     """Load navigation data from YAML file."""
-    global _data
-    if 'navigation' not in _data:
-        _data['navigation'] = load_yaml_file('navigation.yaml')
-    return _data['navigation']
+    return _store.get('navigation')
 
 def get_navigation_data():
     """Get navigation data."""
-    if 'navigation' not in _data:
-        load_navigation_data()
-    return _data['navigation']
+    return _store.get('navigation')
 
 def load_products_services_data():
     """Load products and services page data from YAML file."""
-    global _data
-    if 'products_services' not in _data:
-        _data['products_services'] = load_yaml_file('products_services.yaml')
-    return _data['products_services']
+    return _store.get('products_services')
 
 def get_products_services_data():
     """Get products and services page data."""
-    if 'products_services' not in _data:
-        load_products_services_data()
-    return _data['products_services']
+    return _store.get('products_services')
 
 def load_shop_categories_data():
     """Load shop categories data from YAML file."""
-    global _data
-    if 'shop_categories' not in _data:
-        _data['shop_categories'] = load_yaml_file('shop_categories.yaml')
-    return _data['shop_categories']
+    return _store.get('shop_categories')
 
 def get_shop_categories_data():
     """Get shop categories data."""
-    if 'shop_categories' not in _data:
-        load_shop_categories_data()
-    return _data['shop_categories']
+    return _store.get('shop_categories')
 
 def load_featured_products_data():
     """Load featured products data from YAML file."""
-    global _data
-    if 'featured_products' not in _data:
-        _data['featured_products'] = load_yaml_file('featured_products.yaml')
-    return _data['featured_products']
+    return _store.get('featured_products')
 
 def get_featured_products_data():
     """Get featured products data."""
-    if 'featured_products' not in _data:
-        load_featured_products_data()
-    return _data['featured_products']
+    return _store.get('featured_products')
 
 def load_faq_data():
     """Load FAQ data from YAML file."""
-    global _data
-    if 'faq' not in _data:
-        _data['faq'] = load_yaml_file('faq.yaml')
-    return _data['faq']
+    return _store.get('faq')
 
 def get_faq_data():
     """Get FAQ data."""
-    if 'faq' not in _data:
-        load_faq_data()
-    return _data['faq']
+    return _store.get('faq')
+
+def load_search_data():
+    """Load search page data from YAML file."""
+    return _store.get('search')
+
+def get_search_data():
+    """Get search page data."""
+    return _store.get('search')
 
 
 # ============================================================================
@@ -238,6 +204,9 @@ def get_products_from_db(
 ):
     """Get products from database
     
+    Served from the in-memory catalog index (src/services/catalog.py), which
+    is reloaded when the products/categories tables change.
+    
     Args:
         category_id: Filter by category ID (e.g., 'writing-instruments')
         featured_only: Only return featured products
@@ -245,89 +214,63 @@ def get_products_from_db(
         limit: Maximum number of products to return
         
     Returns:
-        List of product dictionaries
+        List of read-only product dictionaries
     """
-    from src.db import get_db_session
-    from src.models import Product
+    from src.services.catalog import get_catalog
+    return get_catalog().index.products(
+        category_id=category_id,
+        featured_only=featured_only,
+        active_only=active_only,
+        limit=limit,
+    )
+
+
+def get_product_from_db(product_id: int):
+    """Get one active product by ID
     
-    session = get_db_session()
-    try:
-        statement = select(Product)
-        
-        if active_only:
-            statement = statement.where(Product.active == True)
-        
-        if category_id and category_id != 'all':
-            statement = statement.where(Product.category_id == category_id)
-        
-        if featured_only:
-            statement = statement.where(Product.featured == True)
-        
-        statement = statement.order_by(Product.sort_order, Product.id)
-        
-        if limit:
-            statement = statement.limit(limit)
-        
-        products = session.exec(statement).all()
-        
-        # Convert to dictionaries
-        return [
-            {
-                'id': p.id,
-                'name': p.name,
-                'category': p.category_id,
-                'price': p.price,
-                'image': p.image,
-                'rating': p.rating,
-                'reviews': p.reviews,
-                'badge': p.badge,
-                'in_stock': p.in_stock,
-                'description': p.description
-            }
-            for p in products
-        ]
-    finally:
-        session.close()
+    Served from the in-memory catalog index.
+    
+    Returns:
+        Read-only product dictionary, or None if missing or inactive
+    """
+    from src.services.catalog import get_catalog
+    index = get_catalog().index
+    return index.products_by_id.get(product_id) if product_id in index.active_ids else None
 
 
 def get_categories_from_db(active_only: bool = True):
     """Get categories from database
     
+    Served from the in-memory catalog index.
+    
     Args:
         active_only: Only return active categories
         
     Returns:
-        List of category dictionaries
+        List of read-only category dictionaries
     """
-    from src.db import get_db_session
-    from src.models import Category
+    from src.services.catalog import get_catalog
+    return get_catalog().index.categories(active_only=active_only)
+
+
+def query_products(**filters):
+    """Filter, sort and paginate active products
     
-    session = get_db_session()
-    try:
-        statement = select(Category)
-        
-        if active_only:
-            statement = statement.where(Category.active == True)
-        
-        statement = statement.order_by(Category.sort_order, Category.id)
-        
-        categories = session.exec(statement).all()
-        
-        # Convert to dictionaries
-        return [
-            {
-                'id': c.id,
-                'name': c.name,
-                'description': c.description,
-                'icon': c.icon,
-                'color': c.color,
-                'url': c.url,
-                'checked': c.id == 'all'  # For compatibility with existing templates
-            }
-            for c in categories
-        ]
-    finally:
-        session.close()
+    Served from the in-memory catalog index; see CatalogIndex.query for the
+    accepted filters (categories, price_min, price_max, in_stock, q, sort,
+    page, page_size).
+    
+    Returns:
+        ProductPage with the page's product dictionaries and the match count
+    """
+    from src.services.catalog import get_catalog
+    return get_catalog().index.query(**filters)
+
+
+def get_product_price_range():
+    """Get (min, max) price of the active products."""
+    from src.services.catalog import get_catalog
+    return get_catalog().index.price_range
 
 
 def get_db_products_services_data():
@@ -336,10 +279,11 @@ def get_db_products_services_data():
     yaml_data = get_products_services_data()
     
     # Override products and categories with database data
-    yaml_data['products'] = get_products_from_db()
-    yaml_data['categories'] = get_categories_from_db()
-    
-    return yaml_data
+    return overlay(
+        yaml_data,
+        products=get_products_from_db(),
+        categories=get_categories_from_db(),
+    )
 
 
 def get_db_shop_categories_data():
@@ -349,9 +293,7 @@ def get_db_shop_categories_data():
     
     # Override categories with database data (exclude 'all' category)
     db_categories = [c for c in get_categories_from_db() if c['id'] != 'all']
-    yaml_data['categories'] = db_categories
-    
-    return yaml_data
+    return overlay(yaml_data, categories=db_categories)
 
 
 def get_db_featured_products_data():
@@ -360,6 +302,4 @@ def get_db_featured_products_data():
     yaml_data = get_featured_products_data()
     
     # Override products with database data (featured only)
-    yaml_data['products'] = get_products_from_db(featured_only=True)
-    
-    return yaml_data
+    return overlay(yaml_data, products=get_products_from_db(featured_only=True))
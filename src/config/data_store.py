@@ -0,0 +1,198 @@
+"""
+Versioned, hot-reloading store for the YAML files in ``data/``.
+
+Each loaded file is tracked by mtime and size. When any of them changes on
+disk, the changed files are re-parsed and swapped in as a new snapshot with
+a higher version number. Readers always see a complete snapshot: a file that
+fails to parse (e.g. half-saved during an edit) keeps its previous contents.
+Loaded data is frozen (see ``snapshot.py``) so it can be shared across threads.
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from .data_bundle import load_yaml_path
+from .reads import record_read
+from .snapshot import FrozenDict, freeze
+
+
+# Data keys used by the getters in data_loader, mapped to their YAML files
+DATA_FILES = {
+    'main': 'main_page.yaml',
+    'about': 'about.yaml',
+    'privacy': 'privacy.yaml',
+    'contact': 'contact.yaml',
+    'seals_stamps': 'seals_stamps.yaml',
+    'self_inking_stamps': 'self_inking_stamps.yaml',
+    'stationery': 'stationery.yaml',
+    'clients': 'clients.yaml',
+    'agreement': 'agreement.yaml',
+    'hero': 'hero.yaml',
+    'navigation': 'navigation.yaml',
+    'products_services': 'products_services.yaml',
+    'shop_categories': 'shop_categories.yaml',
+    'featured_products': 'featured_products.yaml',
+    'faq': 'faq.yaml',
+    'search': 'search.yaml',
+}
+
+
+def _file_signature(path: Path) -> Optional[tuple]:
+    """Get (mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class DataSnapshot:
+    """Immutable view of all loaded data at one version."""
+
+    __slots__ = ('version', 'data', 'signatures')
+
+    def __init__(self, version: int, data: dict, signatures: dict):
+        self.version = version
+        self.data = data
+        self.signatures = signatures
+
+
+class DataStore:
+    """Loads YAML data files on demand and reloads them when they change."""
+
+    def __init__(
+        self,
+        data_dir: Path,
+        files: dict = DATA_FILES,
+        check_interval: float = 1.0,
+        hot_reload: bool = True,
+        loader: Optional[Callable[[Path], object]] = None,
+    ):
+        """
+        Args:
+            data_dir: Directory containing the YAML files.
+            files: Mapping of data key to file name.
+            check_interval: Seconds between checks of file mtimes/sizes.
+            hot_reload: Whether to check for changed files at all.
+            loader: Callable parsing one file; defaults to load_yaml_path
+                (compiled bundle, then the C YAML loader).
+                Its result is frozen before being published.
+        """
+        self.data_dir = Path(data_dir)
+        self.files = dict(files)
+        self.check_interval = check_interval
+        self.hot_reload = hot_reload
+        self.loader = loader or load_yaml_path
+
+        self._lock = threading.Lock()
+        self._snapshot = DataSnapshot(0, FrozenDict(), {})
+        self._checked_at = time.monotonic()
+        self.reloads = 0
+
+    @property
+    def snapshot(self) -> DataSnapshot:
+        """Get the current snapshot, reloading changed files if due."""
+        self._maybe_refresh()
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """Get the current data version (cheap; increases on every reload)."""
+        # '*': the version covers every file
+        record_read('*')
+        return self.snapshot.version
+
+    def get(self, key: str):
+        """Get the parsed contents of a data file by key (e.g. 'about')."""
+        record_read(key)
+        snapshot = self.snapshot
+        if key in snapshot.data:
+            return snapshot.data[key]
+        return self._load(key)
+
+    def _load(self, key: str):
+        """Load a file for the first time and add it to the current snapshot."""
+        path = self.data_dir / self.files[key]
+        with self._lock:
+            snapshot = self._snapshot
+            if key in snapshot.data:
+                return snapshot.data[key]
+            signature = _file_signature(path)
+            value = freeze(self.loader(path))
+            # Adding a not-yet-loaded file is not a content change; keep the version
+            self._snapshot = DataSnapshot(
+                snapshot.version,
+                FrozenDict({**snapshot.data, key: value}),
+                {**snapshot.signatures, key: signature},
+            )
+            return value
+
+    def load_all(self):
+        """Eagerly load every known data file."""
+        for key in self.files:
+            self.get(key)
+        return self._snapshot.data
+
+    def _maybe_refresh(self):
+        if not self.hot_reload:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Reload every loaded file whose mtime or size changed.
+
+        Returns True if a new snapshot was published.
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            changed = {}
+            for key, old_signature in snapshot.signatures.items():
+                path = self.data_dir / self.files[key]
+                signature = _file_signature(path)
+                if signature == old_signature:
+                    continue
+                if signature is None:
+                    logging.warning(f"⚠️  Data file {path.name} disappeared, keeping last loaded version")
+                    continue
+                try:
+                    changed[key] = (freeze(self.loader(path)), signature)
+                except Exception as e:
+                    logging.error(f"❌ Failed to reload {path.name}, keeping last loaded version: {e}")
+
+            if not changed:
+                return False
+
+            data = dict(snapshot.data)
+            signatures = dict(snapshot.signatures)
+            for key, (value, signature) in changed.items():
+                data[key] = value
+                signatures[key] = signature
+            self._snapshot = DataSnapshot(snapshot.version + 1, FrozenDict(data), signatures)
+            self.reloads += 1
+
+        names = ', '.join(self.files[key] for key in changed)
+        logging.info(f"🔄 Reloaded data files: {names} (version {self._snapshot.version})")
+        return True
+
+
+# Singleton instance
+_data_store = None
+
+def get_data_store() -> DataStore:
+    """Get or create the data store singleton (configured from environment)."""
+    global _data_store
+    if _data_store is None:
+        _data_store = DataStore(
+            data_dir=Path(__file__).parent.parent.parent / 'data',
+            check_interval=float(os.environ.get('DATA_RELOAD_INTERVAL', '1.0')),
+            hot_reload=os.environ.get('DATA_HOT_RELOAD', 'true').lower() == 'true',
+        )
+    return _data_store
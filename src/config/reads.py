@@ -0,0 +1,33 @@
+"""
+Recording which inputs a piece of work reads.
+
+The static build re-renders a page only when an input it read changed.
+Data sources call ``record_read(key)``, which costs one ``ContextVar``
+lookup and records nothing unless the current context is inside a
+``recording_reads()`` block. Request handling never enters one, so serving
+pages keeps no counters at all.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+_reads: ContextVar[Optional[set]] = ContextVar('reads', default=None)
+
+
+def record_read(key: str):
+    """Note that the current context read an input, if reads are being recorded."""
+    reads = _reads.get()
+    if reads is not None:
+        reads.add(key)
+
+
+@contextmanager
+def recording_reads():
+    """Collect the keys read inside the block (and tasks/threads it starts) into the yielded set."""
+    reads = set()
+    token = _reads.set(reads)
+    try:
+        yield reads
+    finally:
+        _reads.reset(token)
@@ -0,0 +1,87 @@
+"""
+Read-only containers for loaded configuration data.
+
+YAML data is shared by every request thread, so it is frozen once when it is
+loaded. ``FrozenDict``/``FrozenList`` subclass ``dict``/``list`` so existing
+``isinstance`` checks and ``json.dumps`` keep working, but any mutation raises
+``TypeError``. Per-request additions (DB products, FAQ, footer locations) are
+layered on top with ``overlay()`` instead of writing into the shared data.
+"""
+
+from collections import ChainMap
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only; use overlay() to add per-request data")
+
+
+class FrozenDict(dict):
+    """A dict that cannot be modified after creation."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    __ior__ = _read_only
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def copy(self):
+        """Get a mutable shallow copy."""
+        return dict(self)
+
+
+class FrozenList(list):
+    """A list that cannot be modified after creation."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+    __iadd__ = __imul__ = _read_only
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+    def copy(self):
+        """Get a mutable shallow copy."""
+        return list(self)
+
+
+def freeze(value):
+    """Recursively convert dicts and lists into their read-only variants."""
+    if isinstance(value, FrozenDict) or isinstance(value, FrozenList):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+class Overlay(ChainMap):
+    """Read-only merged view of per-request fields over shared base data.
+
+    Lookups check the overlay fields first, then the base mapping. Nothing is
+    copied, and neither the base nor the fields can be modified through it.
+    """
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    __ior__ = _read_only
+
+    def copy(self):
+        """Get a mutable shallow copy of the merged view."""
+        return dict(self)
+
+    __copy__ = copy
+
+
+def overlay(base, **fields):
+    """Build a read-only view of ``base`` with ``fields`` added or replaced.
+
+    Example:
+        data = overlay(get_products_services_data(), products=get_products_from_db())
+    """
+    return Overlay(fields, base if base is not None else {})
@@ -1,25 +1,122 @@
 """Database configuration and utilities"""
+import hashlib
 import logging
+import os
 from pathlib import Path
 from typing import Generator
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
 from sqlmodel import SQLModel, Session, create_engine
 
 # Database configuration
 DATABASE_DIR = Path(__file__).parent.parent / "data"
 DATABASE_DIR.mkdir(exist_ok=True)
-DATABASE_URL = f"sqlite:///{DATABASE_DIR}/burokrat.db"
+DATABASE_PATH = DATABASE_DIR / "burokrat.db"
+DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+# Opened with SQLite's URI syntax so the connection itself is read-only
+READ_ONLY_DATABASE_URL = f"sqlite:///file:{DATABASE_PATH}?mode=ro&uri=true"
 
-# Create engine
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,  # Set to True to see SQL queries in logs
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+# Engine profiles (DB_PROFILE):
+#   production - WAL journal, synchronous=NORMAL, busy timeout, mmap and a
+#                larger page cache, so form writes don't block page reads
+#   default    - SQLite defaults (rollback journal, no busy timeout)
+DB_PROFILE = os.environ.get('DB_PROFILE', 'production')
+
+SQLITE_PRAGMAS = {
+    'production': {
+        'journal_mode': os.environ.get('DB_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.environ.get('DB_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': int(os.environ.get('DB_BUSY_TIMEOUT_MS', '5000')),
+        'mmap_size': int(os.environ.get('DB_MMAP_SIZE', str(256 * 1024 * 1024))),
+        # Negative values are KiB rather than pages
+        'cache_size': -int(os.environ.get('DB_CACHE_SIZE_KB', str(64 * 1024))),
+    },
+    'default': {},
+}
+
+# journal_mode is persistent in the database file and can only be set by a writer
+_WRITER_ONLY_PRAGMAS = ('journal_mode',)
+
+
+def _apply_pragmas(engine, pragmas: dict, read_only: bool = False):
+    """Run the profile's PRAGMA statements on every new connection."""
+    if not pragmas and not read_only:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                if read_only and name in _WRITER_ONLY_PRAGMAS:
+                    continue
+                cursor.execute(f"PRAGMA {name}={value}")
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+
+def make_engine(url: str = DATABASE_URL, profile: str = DB_PROFILE, read_only: bool = False):
+    """Create a SQLite engine configured for the given profile
+
+    Args:
+        url: SQLAlchemy database URL
+        profile: Key of SQLITE_PRAGMAS ('production' or 'default')
+        read_only: Refuse writes on every connection (PRAGMA query_only)
+    """
+    if profile not in SQLITE_PRAGMAS:
+        raise ValueError(f"Unknown DB_PROFILE '{profile}', expected one of {list(SQLITE_PRAGMAS)}")
+
+    engine = create_engine(
+        url,
+        echo=False,  # Set to True to see SQL queries in logs
+        connect_args={"check_same_thread": False},  # Needed for SQLite
+        poolclass=QueuePool,
+        pool_size=int(os.environ.get('DB_POOL_SIZE', '5')),
+        max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', '10')),
+        pool_timeout=float(os.environ.get('DB_POOL_TIMEOUT', '30')),
+    )
+    _apply_pragmas(engine, SQLITE_PRAGMAS[profile], read_only=read_only)
+    return engine
+
+
+# Create engines. Public pages read through read_engine; set
+# DB_READ_ONLY_ENGINE=false to share the read-write engine instead.
+engine = make_engine(DATABASE_URL)
+if os.environ.get('DB_READ_ONLY_ENGINE', 'true').lower() == 'true':
+    read_engine = make_engine(READ_ONLY_DATABASE_URL, read_only=True)
+else:
+    read_engine = engine
+
+# Writes that bypass the ORM (raw SQL, the sqlite3 shell) don't run
+# Product.updated_at's onupdate, so a trigger bumps it for them. Same
+# format as SQLAlchemy's DateTime (microseconds; SQLite only has milliseconds)
+CATALOG_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS products_touch_updated_at
+    AFTER UPDATE ON products
+    WHEN NEW.updated_at IS OLD.updated_at
+    BEGIN
+        UPDATE products SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') || '000' WHERE id = NEW.id;
+    END
+    """,
 )
 
+def install_catalog_triggers(bind=None):
+    """Create the catalog triggers if they are missing (existing databases included)"""
+    with (bind or engine).begin() as conn:
+        for statement in CATALOG_TRIGGERS:
+            conn.execute(text(statement))
+
 def create_db_and_tables():
     """Create all database tables"""
+    from src.services.product_search import create_search_tables
     logging.info(f"📊 Creating database tables at {DATABASE_DIR}/burokrat.db")
     SQLModel.metadata.create_all(engine)
+    install_catalog_triggers()
+    create_search_tables(engine)
     logging.info("✅ Database tables created successfully")
 
 def get_session() -> Generator[Session, None, None]:
@@ -42,3 +139,39 @@ def get_db_session() -> Session:
         session.close()
     """
     return Session(engine)
+
+def get_read_session() -> Session:
+    """Get a session on the read-only engine (for public page reads)
+    
+    Usage:
+        session = get_read_session()
+        try:
+            # select queries only
+        finally:
+            session.close()
+    """
+    return Session(read_engine)
+
+def get_catalog_version(bind=None):
+    """Get a cheap version stamp for the products and categories tables
+
+    Changes when products are added or removed, when any product row is
+    updated (updated_at is bumped on every update, see CATALOG_TRIGGERS),
+    or when any category column changes: the few category rows are
+    checksummed as a whole. Returns None if the tables do not exist yet.
+
+    Args:
+        bind: Engine to query; defaults to the read engine
+    """
+    try:
+        with (bind or read_engine).connect() as conn:
+            products = conn.execute(
+                text("SELECT COUNT(*), MAX(updated_at) FROM products")
+            ).one()
+            categories = conn.execute(
+                text("SELECT id, name, description, icon, color, url, sort_order, active FROM categories ORDER BY id")
+            ).all()
+    except OperationalError:
+        return None
+    checksum = hashlib.sha256(repr([tuple(row) for row in categories]).encode('utf-8')).hexdigest()[:16]
+    return (tuple(products), checksum)
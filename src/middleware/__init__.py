@@ -0,0 +1,25 @@
+from .compression import (
+    CompressionCache,
+    CompressionMiddleware,
+    compression_enabled,
+    get_compression_cache,
+)
+from .critical_css import CriticalCssMiddleware
+from .page_cache import (
+    PageCache,
+    PageCacheMiddleware,
+    get_page_cache,
+    page_cache_enabled,
+)
+
+__all__ = [
+    'CompressionCache',
+    'CompressionMiddleware',
+    'compression_enabled',
+    'get_compression_cache',
+    'CriticalCssMiddleware',
+    'PageCache',
+    'PageCacheMiddleware',
+    'get_page_cache',
+    'page_cache_enabled',
+]
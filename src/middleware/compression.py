@@ -0,0 +1,342 @@
+"""
+Response compression with a cache of compressed bodies.
+
+Wraps the whole application (FastAPI routes and the mounted FastHTML app) and
+gzip- or brotli-encodes text responses according to ``Accept-Encoding``.
+Rendered pages repeat a lot: the same HTML comes out of the page cache or is
+re-rendered to the same bytes many times. Compressed bodies are therefore
+cached by the SHA-256 of the uncompressed body, so each distinct body is
+compressed once per encoding. Missed bodies of ``thread_min_size`` bytes or
+more are compressed in a worker thread, so a large page does not hold up
+the event loop.
+
+Responses that already carry a ``Content-Encoding`` (pre-compressed assets
+from ``/assets/``) are passed through untouched. Compressed responses get
+``Vary: Accept-Encoding`` and an ETag with the coding appended
+(``"<etag>-gzip"``); the plain ETag is added to ``If-None-Match`` before the
+request reaches the app, so the page cache's 304 handling keeps working.
+HEAD requests are negotiated like GET: same ``Content-Encoding``, ``Vary``,
+ETag and ``Content-Length``, without the body.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import anyio
+
+from src.services.compression import MIN_COMPRESS_SIZE, available_encodings, compress, negotiate
+
+
+# Levels for request-time compression: most of the gain at a fraction of the
+# CPU of the maximum levels used for pre-compressed assets
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 5
+# Bodies at least this large are compressed off the event loop on a miss
+DEFAULT_THREAD_MIN_SIZE = 32 * 1024
+
+# Content types worth compressing (besides text/*)
+COMPRESSIBLE_TYPES = (
+    b'application/json',
+    b'application/javascript',
+    b'application/xml',
+    b'application/manifest+json',
+    b'image/svg+xml',
+)
+
+# Responses that must not be buffered or altered
+_SKIP_STATUSES = (204, 206, 304)
+
+
+def is_compressible_type(content_type: bytes) -> bool:
+    """Check whether a Content-Type header value is a compressible text format."""
+    media_type = content_type.split(b';', 1)[0].strip().lower()
+    if media_type == b'text/event-stream':
+        return False
+    return media_type.startswith(b'text/') or media_type in COMPRESSIBLE_TYPES
+
+
+class CompressionCache:
+    """Bounded LRU of compressed bodies keyed by body hash, with metrics."""
+
+    def __init__(
+        self,
+        min_size: int = MIN_COMPRESS_SIZE,
+        gzip_level: int = DEFAULT_GZIP_LEVEL,
+        brotli_quality: int = DEFAULT_BROTLI_QUALITY,
+        max_bytes: int = 16 * 1024 * 1024,
+        thread_min_size: int = DEFAULT_THREAD_MIN_SIZE,
+    ):
+        """
+        Args:
+            min_size: Bodies smaller than this are sent uncompressed.
+            gzip_level: gzip compression level (1-9).
+            brotli_quality: brotli quality (0-11).
+            max_bytes: Maximum total size of cached compressed bodies.
+            thread_min_size: get_async() compresses bodies this large in a worker thread.
+        """
+        self.min_size = min_size
+        self.thread_min_size = thread_min_size
+        self.levels = {'gzip': gzip_level, 'br': brotli_quality}
+        self.max_bytes = max_bytes
+
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.compressed = 0
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+        self.threaded = 0
+        self.per_encoding = {encoding: 0 for encoding in available_encodings()}
+
+    def get(self, body: bytes, encoding: str) -> bytes:
+        """Get the compressed form of a body, compressing it on a miss."""
+        key = (hashlib.sha256(body).digest(), encoding)
+        cached = self._lookup(key)
+        if cached is None:
+            cached = self._compress(key, body, encoding)
+        return self._count(body, encoding, cached)
+
+    async def get_async(self, body: bytes, encoding: str) -> bytes:
+        """Like get(), but compress a missed body of thread_min_size bytes or more in a worker thread."""
+        key = (hashlib.sha256(body).digest(), encoding)
+        cached = self._lookup(key)
+        if cached is None:
+            if len(body) >= self.thread_min_size:
+                cached = await anyio.to_thread.run_sync(self._compress, key, body, encoding)
+                with self._lock:
+                    self.threaded += 1
+            else:
+                cached = self._compress(key, body, encoding)
+        return self._count(body, encoding, cached)
+
+    def _lookup(self, key) -> Optional[bytes]:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        return cached
+
+    def _compress(self, key, body: bytes, encoding: str) -> bytes:
+        started = time.thread_time()
+        compressed = compress(body, encoding, self.levels[encoding])
+        elapsed = time.thread_time() - started
+        with self._lock:
+            self.misses += 1
+            self.cpu_seconds += elapsed
+            self._put(key, compressed)
+        return compressed
+
+    def _count(self, body: bytes, encoding: str, cached: bytes) -> bytes:
+        with self._lock:
+            self.compressed += 1
+            self.per_encoding[encoding] = self.per_encoding.get(encoding, 0) + 1
+            self.bytes_in += len(body)
+            self.bytes_out += len(cached)
+        return cached
+
+    def _put(self, key, body: bytes):
+        if len(body) > self.max_bytes or key in self._entries:
+            return
+        self._entries[key] = body
+        self._bytes += len(body)
+        while self._bytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= len(old)
+
+    def clear(self):
+        """Drop every cached body."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Get compression counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'compressed': self.compressed,
+            'per_encoding': dict(self.per_encoding),
+            'skipped': self.skipped,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'ratio': round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else 0.0,
+            'cpu_seconds': round(self.cpu_seconds, 4),
+            'threaded': self.threaded,
+            'levels': dict(self.levels),
+            'min_size': self.min_size,
+            'thread_min_size': self.thread_min_size,
+        }
+
+
+def _encoded_etag(etag: bytes, encoding: str) -> bytes:
+    if etag.endswith(b'"'):
+        return etag[:-1] + b'-' + encoding.encode('latin-1') + b'"'
+    return etag
+
+
+def _with_plain_etags(if_none_match: bytes, encoding: str) -> bytes:
+    """Add the app's own "<etag>" for every "<etag>-<encoding>" validator.
+
+    The originals stay: routes that encode their own responses (the assets
+    route) issue suffixed ETags themselves.
+    """
+    suffix = b'-' + encoding.encode('latin-1') + b'"'
+    tags = [tag.strip() for tag in if_none_match.split(b',')]
+    plain = [tag[:-len(suffix)] + b'"' for tag in tags if tag.endswith(suffix)]
+    return b', '.join(tags + plain)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing text responses per Accept-Encoding."""
+
+    def __init__(self, app, cache: Optional[CompressionCache] = None):
+        self.app = app
+        self.cache = cache if cache is not None else get_compression_cache()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope['headers'])
+        accept = headers.get(b'accept-encoding')
+        encoding = negotiate(accept.decode('latin-1') if accept else None, available_encodings())
+        if_none_match = headers.get(b'if-none-match', b'') if encoding is not None else b''
+        if if_none_match:
+            scope = dict(scope)
+            scope['headers'] = [
+                (name, _with_plain_etags(value, encoding) if name == b'if-none-match' else value)
+                for name, value in scope['headers']
+            ]
+
+        state = {'start': None, 'body': [], 'passthrough': False}
+
+        async def compressing_send(message):
+            if state['passthrough']:
+                await send(message)
+                return
+
+            if message['type'] == 'http.response.start':
+                response_headers = list(message.get('headers', []))
+                names = {name.lower(): value for name, value in response_headers}
+                compressible = is_compressible_type(names.get(b'content-type', b''))
+                if compressible and b'content-encoding' not in names:
+                    response_headers = _add_vary(response_headers)
+                if (
+                    encoding is None
+                    or not compressible
+                    or b'content-encoding' in names
+                    or message['status'] in _SKIP_STATUSES
+                ):
+                    if message['status'] == 304 and b'content-encoding' not in names:
+                        response_headers = _not_modified_headers(response_headers, if_none_match, encoding)
+                    state['passthrough'] = True
+                    await send({**message, 'headers': response_headers})
+                    return
+                state['start'] = {**message, 'headers': response_headers}
+                return
+
+            if message['type'] == 'http.response.body':
+                state['body'].append(message.get('body', b''))
+                if message.get('more_body', False):
+                    return
+                await self._send_buffered(
+                    state['start'], b''.join(state['body']), encoding, send, head=scope['method'] == 'HEAD',
+                )
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, compressing_send)
+
+    async def _send_buffered(self, start: dict, body: bytes, encoding: str, send, head: bool = False):
+        headers = start['headers']
+        if head and not body:
+            # Headers only (file responses): the length of the body is all there is to go on
+            await send(start)
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+        if len(body) < self.cache.min_size:
+            self.cache.skipped += 1
+        else:
+            compressed = await self.cache.get_async(body, encoding)
+            if len(compressed) < len(body):
+                body = compressed
+                headers = [
+                    (name, value) for name, value in _replace_etag(headers, encoding)
+                    if name.lower() not in (b'content-length', b'accept-ranges')
+                ]
+                headers.append((b'content-encoding', encoding.encode('latin-1')))
+            else:
+                self.cache.skipped += 1
+        headers = [(name, value) for name, value in headers if name.lower() != b'content-length']
+        headers.append((b'content-length', str(len(body)).encode('latin-1')))
+        await send({**start, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b'' if head else body})
+
+
+def _add_vary(headers: list) -> list:
+    for i, (name, value) in enumerate(headers):
+        if name.lower() == b'vary':
+            if b'accept-encoding' in value.lower() or value.strip() == b'*':
+                return headers
+            headers = list(headers)
+            headers[i] = (name, value + b', Accept-Encoding')
+            return headers
+    return headers + [(b'vary', b'Accept-Encoding')]
+
+
+def _not_modified_headers(headers: list, if_none_match: bytes, encoding: Optional[str]) -> list:
+    """Give a 304 the ETag of the encoded variant the client revalidated."""
+    if not if_none_match:
+        return headers
+    tags = {tag.strip().removeprefix(b'W/') for tag in if_none_match.split(b',')}
+    for name, value in headers:
+        if name.lower() == b'etag' and _encoded_etag(value, encoding) in tags:
+            return _add_vary(_replace_etag(headers, encoding))
+    return headers
+
+
+def _replace_etag(headers: list, encoding: str) -> list:
+    return [
+        (name, _encoded_etag(value, encoding) if name.lower() == b'etag' else value)
+        for name, value in headers
+    ]
+
+
+# Singleton instance
+_compression_cache = None
+
+def get_compression_cache() -> CompressionCache:
+    """Get or create the compression cache singleton (configured from environment)."""
+    global _compression_cache
+    if _compression_cache is None:
+        _compression_cache = CompressionCache(
+            min_size=int(os.environ.get('COMPRESSION_MIN_SIZE', str(MIN_COMPRESS_SIZE))),
+            gzip_level=int(os.environ.get('COMPRESSION_GZIP_LEVEL', str(DEFAULT_GZIP_LEVEL))),
+            brotli_quality=int(os.environ.get('COMPRESSION_BROTLI_QUALITY', str(DEFAULT_BROTLI_QUALITY))),
+            max_bytes=int(os.environ.get('COMPRESSION_CACHE_BYTES', str(16 * 1024 * 1024))),
+            thread_min_size=int(os.environ.get('COMPRESSION_THREAD_MIN_SIZE', str(DEFAULT_THREAD_MIN_SIZE))),
+        )
+        logging.info(f"🗜️  Response compression enabled ({', '.join(available_encodings())})")
+    return _compression_cache
+
+
+def compression_enabled() -> bool:
+    """Check whether response compression is switched on (COMPRESSION_ENABLED)."""
+    return os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
@@ -0,0 +1,69 @@
+"""
+Critical CSS for pages rendered by the server.
+
+``build_static.py`` inlines each exported page's critical CSS once at build
+time. When the app itself serves pages (development, or running without the
+static export), this middleware does the same to rendered HTML responses.
+Extractions are remembered per page (path and query string), so a page is
+only extracted again when the markup above its fold or ``main.css`` changes.
+
+Mounted inside the page cache: cached pages already carry their inline CSS.
+"""
+
+from src.services.critical_css import CriticalCss, get_critical_css
+
+
+class CriticalCssMiddleware:
+    """ASGI middleware inlining critical CSS into HTML page responses."""
+
+    def __init__(self, app, critical_css: CriticalCss = None):
+        self.app = app
+        self.critical_css = critical_css if critical_css is not None else get_critical_css()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] not in ('GET', 'HEAD'):
+            await self.app(scope, receive, send)
+            return
+
+        page = (scope['path'], scope.get('query_string', b''))
+        state = {'start': None, 'body': [], 'passthrough': False}
+
+        async def inlining_send(message):
+            if state['passthrough']:
+                await send(message)
+                return
+
+            if message['type'] == 'http.response.start':
+                names = {name.lower(): value for name, value in message.get('headers', [])}
+                if (
+                    message['status'] != 200
+                    or not names.get(b'content-type', b'').startswith(b'text/html')
+                    or b'content-encoding' in names
+                ):
+                    state['passthrough'] = True
+                    await send(message)
+                    return
+                state['start'] = message
+                return
+
+            if message['type'] == 'http.response.body':
+                state['body'].append(message.get('body', b''))
+                if message.get('more_body', False):
+                    return
+                await self._send_inlined(state['start'], b''.join(state['body']), page, send)
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, inlining_send)
+
+    async def _send_inlined(self, start: dict, body: bytes, page, send):
+        if body:
+            html = body.decode('utf-8')
+            inlined = self.critical_css.inline(html, page)
+            if inlined is not html:
+                body = inlined.encode('utf-8')
+        headers = [(name, value) for name, value in start.get('headers', []) if name.lower() != b'content-length']
+        headers.append((b'content-length', str(len(body)).encode('latin-1')))
+        await send({**start, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
@@ -0,0 +1,357 @@
+"""
+In-process full-page response cache.
+
+Sits in front of the FastHTML app and stores rendered HTML responses keyed by
+request path, query string and HTMX mode. Every entry remembers the content
+version it was rendered against; once the YAML files in ``data/`` or the
+products/categories tables change, the version moves on and stale entries are
+treated as misses.
+
+Cached pages carry a strong ETag (hash of the rendered bytes) and a
+Last-Modified date. Conditional requests whose validators still match the
+current content version get a 304 without the page being rendered.
+"""
+
+import fnmatch
+import hashlib
+import logging
+import os
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+
+# Routes that must always reach their handler
+DEFAULT_EXCLUDE = (
+    '/contact/submit',
+    '/admin/*',
+    '/api/*',
+    '/assets/*',
+)
+
+
+# Sent with every cached page so browsers and CDNs always revalidate
+DEFAULT_CACHE_CONTROL = 'public, max-age=0, must-revalidate'
+
+# Headers repeated on 304 responses (RFC 9110, section 15.4.5)
+_NOT_MODIFIED_HEADERS = (b'etag', b'last-modified', b'cache-control', b'vary', b'content-location', b'expires')
+
+
+def make_etag(body: bytes) -> str:
+    """Build a strong ETag from rendered response bytes."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+class Validators:
+    """ETag and Last-Modified of a page for a given content version."""
+
+    __slots__ = ('version', 'etag', 'last_modified', 'headers')
+
+    def __init__(self, version, etag: str, last_modified: float, headers: list):
+        self.version = version
+        self.etag = etag
+        self.last_modified = last_modified
+        self.headers = headers
+
+    def matches(self, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+        """Check request validators; If-None-Match takes precedence over If-Modified-Since."""
+        if if_none_match is not None:
+            if if_none_match.strip() == '*':
+                return True
+            tags = [t.strip() for t in if_none_match.split(',')]
+            # Weak comparison is the rule for If-None-Match
+            return any(t.removeprefix('W/') == self.etag for t in tags)
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(self.last_modified) <= since
+        return False
+
+
+class CachedPage:
+    """A single rendered response stored in the page cache."""
+
+    __slots__ = ('version', 'status', 'headers', 'body')
+
+    def __init__(self, version, status: int, headers: list, body: bytes):
+        self.version = version
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class PageCache:
+    """Bounded LRU store of rendered pages with hit/miss counters."""
+
+    def __init__(
+        self,
+        version_func: Callable[[], object],
+        max_entries: int = 128,
+        max_bytes: int = 32 * 1024 * 1024,
+        max_validators: int = 4096,
+        version_ttl: float = 1.0,
+        exclude: Iterable[str] = DEFAULT_EXCLUDE,
+    ):
+        """
+        Args:
+            version_func: Callable returning the current content version.
+                Any hashable value works; entries rendered against another
+                version are discarded on lookup.
+            max_entries: Maximum number of cached pages.
+            max_bytes: Maximum total size of cached bodies.
+            max_validators: Maximum number of remembered ETags. Validators are
+                much smaller than bodies, so 304s keep working for pages whose
+                bodies were evicted.
+            version_ttl: Seconds to reuse the last computed version before
+                calling ``version_func`` again.
+            exclude: Glob patterns of paths that are never cached.
+        """
+        self.version_func = version_func
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_validators = max_validators
+        self.version_ttl = version_ttl
+        self.exclude_patterns = list(exclude)
+
+        self._entries: OrderedDict = OrderedDict()
+        self._validators: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._version = None
+        self._version_checked_at = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypasses = 0
+        self.not_modified = 0
+
+    def exclude(self, *patterns: str):
+        """Opt one or more path patterns (e.g. '/admin/*') out of caching."""
+        self.exclude_patterns.extend(patterns)
+
+    def is_cacheable_path(self, path: str) -> bool:
+        """Check whether a request path may be served from the cache."""
+        return not any(fnmatch.fnmatchcase(path, p) for p in self.exclude_patterns)
+
+    def current_version(self):
+        """Get the content version, recomputed at most once per ``version_ttl``."""
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked_at >= self.version_ttl:
+            self._version = self.version_func()
+            self._version_checked_at = now
+        return self._version
+
+    def get(self, key) -> Optional[CachedPage]:
+        """Look up a page; returns None on miss or if the entry is stale."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.version != self.current_version():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry: CachedPage):
+        """Store a rendered page, evicting least recently used entries."""
+        if len(entry.body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._bytes += len(entry.body)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def get_validators(self, key) -> Optional[Validators]:
+        """Get the validators of a page if they belong to the current version."""
+        validators = self._validators.get(key)
+        if validators is None or validators.version != self.current_version():
+            return None
+        self._validators.move_to_end(key)
+        return validators
+
+    def put_validators(self, key, validators: Validators) -> Validators:
+        """Remember a page's validators.
+
+        If the page re-rendered to the same bytes under a new version, the
+        original Last-Modified date is kept so If-Modified-Since still matches.
+        """
+        previous = self._validators.pop(key, None)
+        if previous is not None and previous.etag == validators.etag:
+            validators.last_modified = previous.last_modified
+        self._validators[key] = validators
+        while len(self._validators) > self.max_validators:
+            self._validators.popitem(last=False)
+        return validators
+
+    def clear(self):
+        """Drop every cached page."""
+        self._entries.clear()
+        self._validators.clear()
+        self._bytes = 0
+        self._version = None
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.body)
+
+    def stats(self) -> dict:
+        """Get cache counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'bypasses': self.bypasses,
+            'not_modified': self.not_modified,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class PageCacheMiddleware:
+    """ASGI middleware serving GET/HEAD HTML pages from a PageCache.
+
+    Also answers conditional requests (If-None-Match / If-Modified-Since)
+    with 304 Not Modified.
+    """
+
+    def __init__(self, app, cache: PageCache, cache_control: str = DEFAULT_CACHE_CONTROL):
+        self.app = app
+        self.cache = cache
+        self.cache_control = cache_control.encode('latin-1')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] not in ('GET', 'HEAD'):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope['path']
+        if not self.cache.is_cacheable_path(path):
+            self.cache.bypasses += 1
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope['headers'])
+        key = (
+            path,
+            scope.get('query_string', b''),
+            b'hx-request' in headers and b'hx-history-restore-request' not in headers,
+        )
+        if_none_match = headers.get(b'if-none-match')
+        if_modified_since = headers.get(b'if-modified-since')
+        if_none_match = if_none_match.decode('latin-1') if if_none_match is not None else None
+        if_modified_since = if_modified_since.decode('latin-1') if if_modified_since is not None else None
+        version = self.cache.current_version()
+
+        # Revalidation for a page we know is unchanged: answer without rendering
+        validators = self.cache.get_validators(key)
+        if validators is not None and validators.matches(if_none_match, if_modified_since):
+            await self._send_not_modified(validators.headers, send)
+            return
+
+        entry = self.cache.get(key)
+        if entry is not None:
+            await self._send_response(entry.status, entry.headers, entry.body, send)
+            return
+
+        # Render through the app and buffer the response
+        status, response_headers, body = await self._render(scope, receive)
+
+        if scope['method'] == 'GET' and self._is_storable(status, response_headers):
+            validators = self.cache.put_validators(
+                key, Validators(version, make_etag(body), time.time(), [])
+            )
+            response_headers = self._with_validators(response_headers, validators)
+            validators.headers = [
+                (name, value) for name, value in response_headers
+                if name.lower() in _NOT_MODIFIED_HEADERS
+            ]
+            self.cache.put(key, CachedPage(version, status, response_headers, body))
+            if validators.matches(if_none_match, if_modified_since):
+                await self._send_not_modified(validators.headers, send)
+                return
+
+        await self._send_response(status, response_headers, body, send)
+
+    async def _render(self, scope, receive):
+        captured = {'status': None, 'headers': [], 'body': []}
+
+        async def capture_send(message):
+            if message['type'] == 'http.response.start':
+                captured['status'] = message['status']
+                captured['headers'] = list(message.get('headers', []))
+            elif message['type'] == 'http.response.body':
+                captured['body'].append(message.get('body', b''))
+
+        await self.app(scope, receive, capture_send)
+        return captured['status'], captured['headers'], b''.join(captured['body'])
+
+    def _with_validators(self, headers: list, validators: Validators) -> list:
+        names = {name.lower() for name, _ in headers}
+        headers = [(name, value) for name, value in headers if name.lower() not in (b'etag', b'last-modified')]
+        headers.append((b'etag', validators.etag.encode('latin-1')))
+        headers.append((b'last-modified', formatdate(validators.last_modified, usegmt=True).encode('latin-1')))
+        if b'cache-control' not in names:
+            headers.append((b'cache-control', self.cache_control))
+        return headers
+
+    @staticmethod
+    def _is_storable(status, headers) -> bool:
+        if status != 200:
+            return False
+        content_type = b''
+        for name, value in headers:
+            name = name.lower()
+            if name == b'set-cookie':
+                return False
+            if name == b'cache-control' and (b'no-store' in value or b'private' in value):
+                return False
+            if name == b'content-type':
+                content_type = value
+        return content_type.startswith(b'text/html')
+
+    async def _send_not_modified(self, headers: list, send):
+        self.cache.not_modified += 1
+        await send({'type': 'http.response.start', 'status': 304, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    @staticmethod
+    async def _send_response(status: int, headers: list, body: bytes, send):
+        # The body goes out for HEAD too, as Starlette responses do: the server
+        # drops it, and the compression middleware needs it to size the variant
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+
+# Singleton instance
+_page_cache = None
+
+def get_page_cache() -> PageCache:
+    """Get or create the page cache singleton (configured from environment)."""
+    global _page_cache
+    if _page_cache is None:
+        from src.config import get_content_version
+        _page_cache = PageCache(
+            version_func=get_content_version,
+            max_entries=int(os.environ.get('PAGE_CACHE_MAX_ENTRIES', '128')),
+            max_bytes=int(os.environ.get('PAGE_CACHE_MAX_BYTES', str(32 * 1024 * 1024))),
+            version_ttl=float(os.environ.get('PAGE_CACHE_VERSION_TTL', '1.0')),
+        )
+        logging.info(f"🗄️  Page cache enabled (max {_page_cache.max_entries} pages)")
+    return _page_cache
+
+
+def page_cache_enabled() -> bool:
+    """Check whether the page cache is switched on (PAGE_CACHE_ENABLED)."""
+    return os.environ.get('PAGE_CACHE_ENABLED', 'true').lower() == 'true'
@@ -1,5 +1,5 @@
 """Database models for burokrat.site"""
-from .contact import ContactSubmission
+from .contact import ContactSubmission, EmailOutbox
 from .product import Product, Category
 
-__all__ = ['ContactSubmission', 'Product', 'Category']
+__all__ = ['ContactSubmission', 'EmailOutbox', 'Product', 'Category']
@@ -34,3 +34,25 @@ class ContactSubmission(SQLModel, table=True):
                 "company": "ООО Ромашка"
             }
         }
+
+
+class EmailOutbox(SQLModel, table=True):
+    """Pending notification email for a contact submission
+    
+    Written in the same transaction as the submission and delivered by the
+    background dispatcher in src/services/email_outbox.py.
+    """
+    
+    __tablename__ = "email_outbox"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    submission_id: int = Field(foreign_key="contact_submissions.id", index=True)
+    
+    # pending -> sent, or pending -> failed after max attempts
+    status: str = Field(default="pending", max_length=20, index=True)
+    attempts: int = Field(default=0)
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    last_error: Optional[str] = Field(default=None, max_length=500)
+    
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: Optional[datetime] = Field(default=None)
@@ -55,7 +55,9 @@ class Product(SQLModel, table=True):
     active: bool = Field(default=True)
     sort_order: int = Field(default=0)
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Bumped on every ORM update (and by a trigger for raw SQL, see src/db.py);
+    # the catalog version and the search index sync key off it
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
     
     # Relationship
     # category_rel: Optional[Category] = Relationship(back_populates="products")
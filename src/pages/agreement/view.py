@@ -95,9 +95,10 @@ def render():
                     Div(
                         H2(section.get('heading', '')),
                         *[_render_clause(cl) for cl in section.get('clauses', [])],
-                        cls='agreement-section'
+                        cls='agreement-section',
+                        id=f'agreement-section-{i}'
                     )
-                    for section in data.get('sections', [])
+                    for i, section in enumerate(data.get('sections', []), 1)
                 ],
             ),
             cls='agreement-content'
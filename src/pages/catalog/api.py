@@ -0,0 +1,112 @@
+"""
+Static JSON catalog API.
+
+The products page filters on the server (/products-and-services/grid). A
+static deployment has no server, so the active catalog is also published
+as JSON files under ``/catalog/`` that product-filters.js reads instead:
+
+* ``index.json``: price range, and per category the ids of its products
+  and the URL of its shard. Revalidated like any plain URL.
+* ``products-<category>.<hash>.json``: card data of one category's
+  products in display order (``rank`` is the position in the full catalog).
+* ``search.<hash>.json``: search stems -> ids of the products whose name
+  or description contain them.
+
+Shards are named after their content, so they can be cached for good and
+a client fetches only the categories it shows. The app serves the same
+files (see products_services.py), and build_static.py exports them.
+"""
+
+import hashlib
+import json
+
+from src.components.products.products_page import BADGE_COLORS, PRODUCTS_CATALOG_URL, category_urls
+from src.config import get_categories_from_db, get_products_from_db
+from src.services.assets import get_asset_manifest, hashed_name
+from src.services.catalog import get_catalog
+from src.services.text import terms
+from .view import product_data
+
+# Files are served at /catalog/<name>.json; the products page links the index
+CATALOG_URL = '/catalog/'
+INDEX_NAME = 'index'
+INDEX_URL = PRODUCTS_CATALOG_URL
+
+
+def _dump(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _fingerprinted(name, data):
+    body = _dump(data)
+    return hashed_name(name, hashlib.sha256(body).hexdigest()), body
+
+
+def catalog_files() -> dict:
+    """Build every file of the catalog API.
+
+    Returns:
+        {file name without .json: content}, index first
+    """
+    urls = category_urls(get_categories_from_db())
+    shards, postings = {}, {}
+    for rank, product in enumerate(get_products_from_db()):
+        entry = product_data(product, urls)
+        del entry['description']
+        entry['rank'] = rank
+        if product['badge']:
+            entry['badge_class'] = BADGE_COLORS.get(product['badge'], 'badge-default')
+        shards.setdefault(product['category'], []).append(entry)
+        for term in dict.fromkeys(terms(product['name']) + terms(product['description'] or '')):
+            postings.setdefault(term, []).append(product['id'])
+
+    files, categories = {}, []
+    for category, products in shards.items():
+        name, files[name] = _fingerprinted(f'products-{category}', products)
+        categories.append({
+            'id': category,
+            'ids': [p['id'] for p in products],
+            'shard': f'{CATALOG_URL}{name}.json',
+        })
+    search_name, files[search_name] = _fingerprinted('search', dict(sorted(postings.items())))
+
+    index = {
+        'total': sum(len(products) for products in shards.values()),
+        'price_range': list(get_catalog().index.price_range),
+        'categories': categories,
+        'search': f'{CATALOG_URL}{search_name}.json',
+    }
+    return {INDEX_NAME: _dump(index), **files}
+
+
+class CatalogApi:
+    """Keeps the catalog API files of the current catalog and asset versions."""
+
+    def __init__(self):
+        self._key = None
+        self._files = {}
+
+    def files(self) -> dict:
+        """Get {file name without .json: content}, rebuilt when the catalog or assets change."""
+        manifest = get_asset_manifest()
+        manifest.refresh()
+        key = (get_catalog().index.version, manifest.version)
+        if key != self._key:
+            self._files = catalog_files()
+            self._key = key
+        return self._files
+
+    def get(self, name: str):
+        """Get the content of one file, or None if there is no such file."""
+        return self.files().get(name)
+
+
+# Singleton instance
+_catalog_api = None
+
+def get_catalog_api() -> CatalogApi:
+    """Get or create the catalog API singleton."""
+    global _catalog_api
+    if _catalog_api is None:
+        _catalog_api = CatalogApi()
+    return _catalog_api
@@ -0,0 +1,45 @@
+"""Category and product page views"""
+from fasthtml.common import *
+from src.config import get_categories_from_db, get_products_from_db, get_products_services_data
+from src.components import create_category_page, create_product_detail
+from src.components.products.products_page import category_urls, product_url
+from src.services.assets import asset_url
+
+# Other products of the category shown on a product page
+RELATED_LIMIT = 4
+
+
+def render_category(category):
+    """Render main content for a category page."""
+    return create_category_page(
+        get_products_services_data(),
+        category,
+        get_products_from_db(category_id=category['id']),
+        get_categories_from_db(),
+    )
+
+
+def render_product(category, product):
+    """Render main content for a product page."""
+    related = [
+        p for p in get_products_from_db(category_id=category['id'])
+        if p['id'] != product['id']
+    ][:RELATED_LIMIT]
+    return create_product_detail(get_products_services_data(), product, category, related)
+
+
+def product_data(product, urls):
+    """A product as JSON-ready data, with its page URL and fingerprinted image URL."""
+    return {**product, 'image': asset_url(product['image']), 'url': product_url(product, urls)}
+
+
+def category_slice(category):
+    """A category's products as JSON-ready data (served at <category URL>.json).
+
+    Products carry their page URL and fingerprinted image URL, in display order.
+    """
+    urls = category_urls([category])
+    return {
+        'category': {key: category[key] for key in ('id', 'name', 'description', 'url')},
+        'products': [product_data(product, urls) for product in get_products_from_db(category_id=category['id'])],
+    }
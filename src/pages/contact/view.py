@@ -1,5 +1,6 @@
 from fasthtml.common import *
 from src.config import get_contact_data, get_data
+from src.services.assets import asset_url
 from src.components import (
     create_contact_header, 
     create_contact_info_grid, 
@@ -36,7 +37,7 @@ def create_store_info_sidebar():
                     src='https://images.unsplash.com/photo-1543269865-cbf427effbad?crop=entropy&cs=tinysrgb&fit=max&fm=jpg&ixid=M3wzNzg4Nzd8MHwxfHNlYXJjaHwxfHxzdGF0aW9uZXJ5JTIwc3RvcmV8ZW58MXx8fHwxNzA5ODExODU5fDA&ixlib=rb-4.0.3&q=80&w=1080',
                     alt='Stationery store interior',
                     cls='w-full h-64 object-cover store-image',
-                    onerror="this.src='/assets/images/logo.png'; this.classList.add('object-contain', 'p-8');"
+                    onerror=f"this.src='{asset_url('/assets/images/logo.png')}'; this.classList.add('object-contain', 'p-8');"
                 ),
                 cls='overflow-hidden store-image-container'
             ),
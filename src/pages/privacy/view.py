@@ -107,8 +107,9 @@ def render():
                 *[Div(
                     H2(section.get('heading', '')),
                     *(_render_privacy_paragraphs(section.get('paragraphs', []))),
-                    cls='privacy-section'
-                ) for section in data.get('sections', [])],
+                    cls='privacy-section',
+                    id=f'privacy-section-{i}'
+                ) for i, section in enumerate(data.get('sections', []), 1)],
             ),
             cls='privacy-content'
         ),
@@ -1,9 +1,66 @@
 """Products and Services page view"""
+import logging
+
+from sqlalchemy.exc import OperationalError
 from fasthtml.common import *
-from src.config import get_db_products_services_data  # Changed to database version
+from src.config import (
+    get_products_services_data,
+    get_categories_from_db,
+    get_product_price_range,
+    overlay,
+    query_products,
+)
 from src.components import create_products_page
+from src.components.products.products_page import create_products_results
+from src.services.fuzzy_search import get_fuzzy_search
+from src.services.product_search import get_product_search, search_enabled
+
+# Products per page when products_services.yaml does not set page_size
+DEFAULT_PAGE_SIZE = 24
+
+
+def _page_data():
+    """Page labels from YAML with categories from the database.
+    
+    Products are not included; only the requested page is queried.
+    """
+    return overlay(get_products_services_data(), categories=get_categories_from_db())
+
+
+def _query(data, filters):
+    """Run the product query for parsed filters.
+    
+    A search query is answered by the full-text index (ranked, stemmed);
+    when it finds nothing, the query is probably misspelled and the trigram
+    index is asked instead. The catalog's substring match is the fallback
+    when FTS is unavailable.
+    """
+    filters = dict(filters)
+    if filters.get('q') and search_enabled():
+        try:
+            ids = get_product_search().search_ids(filters['q'])
+            if not ids:
+                ids = [r['id'] for r in get_fuzzy_search().search(filters['q'], limit=100, types={'product'})]
+            filters['ids'] = ids
+            filters['q'] = ''
+        except OperationalError as e:
+            logging.warning(f"⚠️  Full-text search unavailable, using substring match: {e}")
+    return query_products(page_size=int(data.get('page_size', DEFAULT_PAGE_SIZE)), **filters)
+
+
+def render(filters=None, static=False):
+    """Render main content for the Products and Services page.
+    
+    Only the first page of matching products is rendered; further pages and
+    filter changes are loaded from /products-and-services/grid, or from the
+    static catalog API when static (exported without a server).
+    """
+    filters = filters or {}
+    data = _page_data()
+    return create_products_page(data, _query(data, filters), filters, get_product_price_range(), static=static)
+
 
-def render():
-    """Render main content for the Products and Services page."""
-    data = get_db_products_services_data()  # Changed to database version
-    return create_products_page(data)
+def render_results(filters):
+    """Render only the results block (count, cards, pagination) for HTMX."""
+    data = _page_data()
+    return create_products_results(data, _query(data, filters), filters)
@@ -0,0 +1,90 @@
+"""Site search page view"""
+from fasthtml.common import *
+from src.config import get_search_data
+from src.services.assets import asset_url
+from src.services.site_search import get_site_search
+
+# Results shown for one query
+RESULTS_LIMIT = 30
+
+# Where build_static.py writes the serialized index for static hosting
+STATIC_INDEX_URL = '/search/index.json'
+
+
+def _results(data, query, results):
+    """Render the result list (or the empty state) for a query."""
+    if not query:
+        return []
+    if not results:
+        return [Div(
+            P(data.get('no_results_title', 'Ничего не найдено'), cls='no-results-title'),
+            P(data.get('no_results_text', ''), cls='no-results-text'),
+            cls='no-results-message'
+        )]
+    return [
+        P(f"{data.get('results_text', 'Найдено результатов')}: {len(results)}", cls='site-search-count'),
+        Ol(
+            *[
+                Li(
+                    A(result['title'], href=result['url'], cls='site-search-title'),
+                    Div(result['page_title'], cls='site-search-page') if result['page_title'] != result['title'] else None,
+                    P(NotStr(result['snippet']), cls='site-search-snippet') if result['snippet'] else None,
+                    cls='site-search-result'
+                )
+                for result in results
+            ],
+            cls='site-search-list'
+        ),
+    ]
+
+
+def render(query=''):
+    """Render main content for the Search page.
+    
+    Results are rendered on the server. The static build has no server, so
+    site-search.js answers the query from the JSON index shards instead when
+    the rendered query differs from the one in the URL.
+    """
+    data = get_search_data()
+    results = get_site_search().search(query, limit=RESULTS_LIMIT) if query else []
+
+    return (
+        Section(
+            Div(
+                H1(data.get('heading', 'Поиск по сайту')),
+                P(data.get('intro', '')),
+                cls='page-intro'
+            )
+        ),
+        Section(
+            Form(
+                Input(
+                    type='search',
+                    name='q',
+                    value=query,
+                    placeholder=data.get('placeholder', ''),
+                    cls='site-search-input',
+                    id='site-search-input',
+                    aria_label=data.get('heading', 'Поиск по сайту')
+                ),
+                Button(data.get('button_text', 'Найти'), type='submit', cls='btn btn-primary'),
+                action='/search',
+                method='get',
+                role='search',
+                cls='site-search-form'
+            ),
+            P(data.get('hint_text', ''), cls='site-search-hint'),
+            Div(
+                *_results(data, query, results),
+                id='site-search-results',
+                data_query=query,
+                data_index_url=STATIC_INDEX_URL,
+                data_results_text=data.get('results_text', 'Найдено результатов'),
+                data_no_results_title=data.get('no_results_title', 'Ничего не найдено'),
+                data_no_results_text=data.get('no_results_text', ''),
+                aria_live='polite'
+            ),
+            Script(src=asset_url('/assets/scripts/site-search.js')),
+            cls='site-search'
+        ),
+    )
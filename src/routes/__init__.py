@@ -12,6 +12,7 @@ from .clients import register_clients_route
 from .agreement import register_agreement_route
 from .products_services import register_products_services_route
 from .featured_products import register_featured_products_route
+from .search import register_search_route
 from .error_404 import register_404_handler
 
 def register_all_routes(rt):
@@ -30,4 +31,5 @@ def register_all_routes(rt):
     register_agreement_route(rt)
     register_products_services_route(rt)
     register_featured_products_route(rt)
+    register_search_route(rt)
     register_404_handler(rt)
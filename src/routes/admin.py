@@ -28,11 +28,13 @@ def register_admin_routes(rt):
                     # Format the date
                     date_str = sub.created_at.strftime("%Y-%m-%d %H:%M")
                     
-                    # Status badge
+                    # Status badge (no error yet means the email is still queued)
                     if sub.email_sent:
                         status_badge = Span("✅ Отправлено", cls="text-green-600 font-semibold")
-                    else:
+                    elif sub.email_error:
                         status_badge = Span("❌ Ошибка", cls="text-red-600 font-semibold")
+                    else:
+                        status_badge = Span("⏳ В очереди", cls="text-yellow-600 font-semibold")
                     
                     table_rows.append(
                         Tr(
@@ -123,6 +125,11 @@ def register_admin_routes(rt):
                     Span("✅ Email отправлен успешно", cls="text-green-600 font-semibold"),
                     cls="mb-4"
                 )
+            elif not submission.email_error:
+                status = Div(
+                    Span("⏳ Email в очереди на отправку", cls="text-yellow-600 font-semibold"),
+                    cls="mb-4"
+                )
             else:
                 status = Div(
                     Span("❌ Ошибка отправки email", cls="text-red-600 font-semibold"),
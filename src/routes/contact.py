@@ -3,6 +3,8 @@ from src.config import get_contact_data
 from src.components import Layout
 from src.pages.contact.view import render as render_contact
 from src.services.email_service import get_email_service
+from src.services.email_outbox import get_outbox_dispatcher
+from src.services.icons import icon
 from src.db import get_db_session
 from src.models import ContactSubmission
 import logging
@@ -36,11 +38,8 @@ def register_contact_routes(rt):
             'company': company
         }
         
-        # Send email via SendGrid
-        email_service = get_email_service()
-        success, error_message = email_service.send_contact_form_email(form_data)
-        
-        # Save to database
+        # Save the submission and queue its email in one transaction; the
+        # outbox dispatcher sends it in the background
         session = get_db_session()
         try:
             submission = ContactSubmission(
@@ -50,15 +49,23 @@ def register_contact_routes(rt):
                 subject=subject,
                 message=actual_message,
                 company=company,
-                email_sent=success,
-                email_error=error_message if not success else None
+                email_sent=False,
+                email_error=None
             )
             session.add(submission)
+            session.flush()
+            dispatcher = get_outbox_dispatcher()
+            dispatcher.enqueue(session, submission)
             session.commit()
-            logging.info(f"💾 Contact submission saved to database (ID: {submission.id})")
+            logging.info(f"💾 Contact submission saved to database (ID: {submission.id}), email queued")
+            dispatcher.notify()
+            success = True
         except Exception as e:
             logging.error(f"❌ Failed to save submission to database: {e}")
             session.rollback()
+            # Without the outbox the message would be lost, so send it inline
+            email_service = get_email_service()
+            success, error_message = email_service.send_contact_form_email(form_data)
         finally:
             session.close()
         
@@ -73,7 +80,7 @@ def register_contact_routes(rt):
             return Div(
                 Div(
                     Div(
-                        NotStr('''<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M22 11.08V12a10 10 0 1 1-5.93-9.14"/><polyline points="22 4 12 14.01 9 11.01"/></svg>'''),
+                        icon('check-circle', size=24),
                         cls='w-6 h-6 text-green-600'
                     ),
                     cls='bg-green-100 p-3 rounded-full mb-4 inline-flex'
@@ -90,7 +97,7 @@ def register_contact_routes(rt):
             return Div(
                 Div(
                     Div(
-                        NotStr('''<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><circle cx="12" cy="12" r="10"/><line x1="12" y1="8" x2="12" y2="12"/><line x1="12" y1="16" x2="12.01" y2="16"/></svg>'''),
+                        icon('alert-circle', size=24),
                         cls='w-6 h-6 text-red-600'
                     ),
                     cls='bg-red-100 p-3 rounded-full mb-4 inline-flex'
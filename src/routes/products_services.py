@@ -1,20 +1,133 @@
 """Products and Services page route"""
 from fasthtml.common import *
 from src.components import Layout
-from src.config import get_db_products_services_data  # Changed to database version
-from src.pages.products_services.view import render as render_products_services
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from src.config import get_categories_from_db, get_product_from_db, get_products_from_db, get_products_services_data
+from src.pages.catalog.api import INDEX_NAME, get_catalog_api
+from src.pages.catalog.view import category_slice, render_category, render_product
+from src.pages.products_services.view import render as render_products_services, render_results
+from src.routes.static_export import is_exporting, static_params
+from src.services.assets import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL
+from src.services.catalog import CATEGORY_URL_PREFIX, PRODUCT_SORTS
 import logging
 
 
+def _parse_float(value):
+    """Parse an optional number from the query string (None if missing or invalid)."""
+    try:
+        return float(value) if value not in (None, '') else None
+    except ValueError:
+        return None
+
+
+def parse_product_filters(params):
+    """Parse product filters from query parameters.
+    
+    Accepts repeated `category`, `price_min`, `price_max`, `in_stock`, `q`,
+    `sort` and `page`; invalid values fall back to their defaults.
+    """
+    sort = params.get('sort', 'featured')
+    try:
+        page = max(1, int(params.get('page', '1')))
+    except ValueError:
+        page = 1
+    return {
+        'categories': [c for c in params.getlist('category') if c],
+        'price_min': _parse_float(params.get('price_min')),
+        'price_max': _parse_float(params.get('price_max')),
+        'in_stock': params.get('in_stock', '').lower() in ('true', '1', 'on'),
+        'q': params.get('q', '').strip()[:100],
+        'sort': sort if sort in PRODUCT_SORTS else 'featured',
+        'page': page,
+    }
+
+
+def categories_by_slug():
+    """Active categories with a page of their own, by URL slug."""
+    return {
+        c['url'][len(CATEGORY_URL_PREFIX):]: c
+        for c in get_categories_from_db()
+        if (c['url'] or '').startswith(CATEGORY_URL_PREFIX)
+    }
+
+
+@static_params('/products/{slug}')
+@static_params('/products/{slug}.json')
+def category_params():
+    """One static category page (and JSON slice) per category URL."""
+    for slug in categories_by_slug():
+        yield {'slug': slug}
+
+
+@static_params('/products/{slug}/{product_id}')
+def product_params():
+    """One static page per active product of a category with a page."""
+    for slug, category in categories_by_slug().items():
+        for product in get_products_from_db(category_id=category['id']):
+            yield {'slug': slug, 'product_id': product['id']}
+
+
+@static_params('/catalog/{name}.json')
+def catalog_api_params():
+    """Every file of the static catalog API."""
+    for name in get_catalog_api().files():
+        yield {'name': name}
+
+
+def _category(slug):
+    category = categories_by_slug().get(slug)
+    if category is None:
+        raise HTTPException(404)
+    return category
+
+
 def register_products_services_route(rt):
-    """Register products and services page route."""
+    """Register products and services page and product grid routes."""
     
     @rt('/products-and-services')
-    def get():
+    def get(req):
         logging.info("📦 Serving products & services page (/products-and-services) [FROM DATABASE]")
-        data = get_db_products_services_data()  # Changed to database version
+        # Only the page title is needed here; render() loads the products
+        data = get_products_services_data()
         return Layout(
             data['title'],
-            render_products_services()
+            render_products_services(parse_product_filters(req.query_params), static=is_exporting())
         )
-
+    
+    @rt('/products-and-services/grid')
+    def get(req):
+        """Filtered, sorted page of product cards for HTMX to swap in."""
+        return render_results(parse_product_filters(req.query_params))
+    
+    @rt('/catalog/{name}.json')
+    def get(name: str):
+        """A file of the static catalog API (src/pages/catalog/api.py)."""
+        body = get_catalog_api().get(name)
+        if body is None:
+            raise HTTPException(404)
+        cache_control = REVALIDATE_CACHE_CONTROL if name == INDEX_NAME else IMMUTABLE_CACHE_CONTROL
+        return Response(body, media_type='application/json', headers={'Cache-Control': cache_control})
+    
+    # Before /products/{slug}, which would match "<slug>.json" as well
+    @rt('/products/{slug}.json')
+    def get(slug: str):
+        """A category's products as JSON."""
+        return category_slice(_category(slug))
+    
+    @rt('/products/{slug}')
+    def get(slug: str):
+        """Every product of one category, without filters."""
+        category = _category(slug)
+        logging.info(f"📦 Serving category page (/products/{slug}) [FROM DATABASE]")
+        return Layout(f"{category['name']} | Бюрократ", render_category(category))
+    
+    @rt('/products/{slug}/{product_id}')
+    def get(slug: str, product_id: int):
+        """One product, under the URL of its category."""
+        category = _category(slug)
+        product = get_product_from_db(product_id)
+        if product is None or product['category'] != category['id']:
+            raise HTTPException(404)
+        logging.info(f"📦 Serving product page (/products/{slug}/{product_id}) [FROM DATABASE]")
+        return Layout(f"{product['name']} | Бюрократ", render_product(category, product))
@@ -1,6 +1,7 @@
 from fasthtml.common import *
 from src.components import Layout
 from src.config import get_seals_stamps_data
+from src.services.assets import asset_url
 import logging
 
 def register_seals_stamps_route(rt):
@@ -25,7 +26,7 @@ def register_seals_stamps_route(rt):
                     *[
                         Div(
                             Div(
-                                Img(src=product.get('image', '/assets/images/icon.png'), alt=product.get('title', '')),
+                                Img(src=asset_url(product.get('image', '/assets/images/icon.png')), alt=product.get('title', '')),
                                 cls='service-card-image'
                             ),
                             Div(
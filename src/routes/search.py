@@ -0,0 +1,19 @@
+from fasthtml.common import *
+from src.components import Layout
+from src.config import get_search_data
+from src.pages.search.view import render as render_search
+import logging
+
+
+def register_search_route(rt):
+    """Register site search page route (/search)."""
+
+    @rt('/search')
+    def get(q: str = ''):
+        q = q.strip()[:200]
+        logging.info(f"🔎 Serving search page (/search) q={q!r}")
+        data = get_search_data()
+        return Layout(
+            data['title'],
+            *render_search(q)
+        )
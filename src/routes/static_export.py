@@ -0,0 +1,72 @@
+"""
+Which routes ``build_static.py`` exports, and with which parameters.
+
+The static build pre-renders every GET route that ``register_all_routes``
+registers, except the ones matching ``NOT_EXPORTED`` (private pages, HTMX
+fragments, form endpoints, file serving). A route with path parameters is
+exported once per parameter set yielded by its generator, registered next
+to the route::
+
+    @static_params('/products/{slug}')
+    def category_slugs():
+        for category in get_categories_from_db():
+            yield {'slug': ...}
+
+Parameterized routes without a generator are not exported.
+
+Pages rendered inside ``exporting()`` can check ``is_exporting()`` to mark
+what will have no server behind it (the products page's filters).
+"""
+
+import fnmatch
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Optional
+
+
+# Route paths (glob patterns) that are not static pages
+NOT_EXPORTED = (
+    '/admin/*',
+    '/assets/*',
+    '/contact/submit',
+    '/products-and-services/grid',
+    '/{fname:path}.{ext:static}',
+)
+
+# Route path -> callable yielding {parameter: value} dicts
+_param_generators: Dict[str, Callable[[], Iterable[dict]]] = {}
+
+_exporting: ContextVar[bool] = ContextVar('static_export', default=False)
+
+
+def static_params(path: str):
+    """Register the parameter generator of a parameterized route."""
+    def decorator(func):
+        _param_generators[path] = func
+        return func
+    return decorator
+
+
+def param_generator(path: str) -> Optional[Callable[[], Iterable[dict]]]:
+    """Get the parameter generator registered for a route path."""
+    return _param_generators.get(path)
+
+
+def is_exported(path: str) -> bool:
+    """Check whether a route path may be exported as static pages."""
+    return not any(fnmatch.fnmatchcase(path, pattern) for pattern in NOT_EXPORTED)
+
+
+@contextmanager
+def exporting():
+    """Mark the pages rendered inside the block as rendered for the static export."""
+    token = _exporting.set(True)
+    try:
+        yield
+    finally:
+        _exporting.reset(token)
+
+
+def is_exporting() -> bool:
+    """Check whether the current page is rendered for the static export."""
+    return _exporting.get()
@@ -1,8 +1,54 @@
+import mimetypes
 from fasthtml.common import *
+from starlette.responses import Response
+from email.utils import formatdate
+from src.middleware.page_cache import Validators
+from src.services.assets import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, get_asset_manifest
+from src.services.compression import negotiate
 
 def register_static_route(rt):
-    """Register static file serving route."""
+    """Register static file serving route.
+    
+    Fingerprinted URLs (see src/services/assets.py) are cached for good;
+    plain URLs are revalidated and answered with 304 when unchanged. Text
+    files are sent gzip or brotli encoded per Accept-Encoding, from memory.
+    """
     
     @rt('/assets/{filepath:path}')
-    def get(filepath: str):
-        return FileResponse(f'assets/{filepath}')
+    def get(req, filepath: str):
+        manifest = get_asset_manifest()
+        asset, immutable = manifest.resolve(filepath)
+        if asset is None:
+            return Response('Not Found', status_code=404)
+        
+        encodings = manifest.encodings(asset)
+        encoding = negotiate(req.headers.get('accept-encoding'), encodings)
+        body = manifest.body(asset, encoding) if encoding else None
+        if body is None:
+            encoding = None
+        
+        headers = {
+            'Cache-Control': IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+            'ETag': asset.etag_for(encoding),
+            'Last-Modified': formatdate(asset.mtime, usegmt=True),
+        }
+        if encodings:
+            headers['Vary'] = 'Accept-Encoding'
+        if encoding:
+            headers['Content-Encoding'] = encoding
+        
+        validators = Validators(None, headers['ETag'], asset.mtime, [])
+        if validators.matches(req.headers.get('if-none-match'), req.headers.get('if-modified-since')):
+            return Response(status_code=304, headers=headers)
+        
+        if body is None:
+            body = manifest.body(asset)
+        if body is None:
+            return FileResponse(manifest.root / asset.path, headers=headers)
+        media_type = mimetypes.guess_type(asset.path)[0] or 'application/octet-stream'
+        return Response(body, media_type=media_type, headers=headers)
+    
+    # fast_app() registers a catch-all route serving static file extensions
+    # from the working directory; move this one ahead of it
+    routes = rt.__self__.router.routes
+    routes.insert(0, routes.pop())
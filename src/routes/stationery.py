@@ -1,6 +1,7 @@
 from fasthtml.common import *
 from src.components import Layout
 from src.config import get_stationery_data
+from src.services.assets import asset_url
 import logging
 
 def register_stationery_route(rt):
@@ -25,7 +26,7 @@ def register_stationery_route(rt):
                     *[
                         Div(
                             Div(
-                                Img(src=category.get('image', '/assets/images/icon.png'), alt=category.get('title', '')),
+                                Img(src=asset_url(category.get('image', '/assets/images/icon.png')), alt=category.get('title', '')),
                                 cls='service-card-image'
                             ),
                             Div(
@@ -0,0 +1,284 @@
+"""
+Content-fingerprinted URLs for the files in ``assets/``.
+
+``asset_url('/assets/styles/main.css')`` returns
+``/assets/styles/main.<hash>.css``, where ``<hash>`` is the start of the
+file's SHA-256. A changed file gets a new URL, so responses for hashed URLs
+can be cached forever (``immutable``). Unhashed URLs keep working and are
+revalidated with ETag / Last-Modified.
+
+The manifest maps every asset path to its fingerprinted name. The server
+keeps it in memory and rescans ``assets/`` at most every ``check_interval``
+seconds, re-hashing only the files whose mtime or size changed. Each change
+bumps ``version``, which is part of the page cache's content version, so
+cached pages never point at outdated hashes for long. ``build_static.py``
+exports the hashed copies and ``manifest.json`` from ``manifest()``.
+
+Bodies of small files are held in memory per content coding (``body()``),
+least recently used first out. Compressed bodies come from the ``.gz``/``.br``
+siblings written by ``compress_assets.py`` when they are fresh, and are
+compressed once on first use otherwise.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from .compression import MIN_COMPRESS_SIZE, SUFFIXES, available_encodings, compress, fresh_sibling, is_compressible
+
+
+URL_PREFIX = '/assets/'
+
+# Hex digits of the SHA-256 kept in fingerprinted file names
+HASH_LENGTH = 10
+
+# Sent with fingerprinted URLs; the content behind them never changes
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Sent with plain URLs (and outdated hashes), which must be revalidated
+REVALIDATE_CACHE_CONTROL = 'public, max-age=0, must-revalidate'
+
+# Larger files are streamed from disk instead of being held in memory
+MEMORY_MAX_FILE = 512 * 1024
+
+# name.<hash>.ext
+_HASHED_RE = re.compile(rf'^(?P<stem>.+)\.(?P<hash>[0-9a-f]{{{HASH_LENGTH}}})(?P<ext>\.[^./]+)$')
+
+
+class Asset(NamedTuple):
+    """One file under assets/ at a given content."""
+    path: str             # relative to the assets root, e.g. 'styles/main.css'
+    hashed_path: str      # e.g. 'styles/main.3f2a9c01de.css'
+    digest: str           # full SHA-256 hex digest
+    signature: tuple      # (mtime_ns, size) when hashed
+    mtime: float
+
+    @property
+    def size(self) -> int:
+        return self.signature[1]
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest[:32]}"'
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """Strong ETag of one content coding of the file."""
+        return self.etag if encoding is None else f'"{self.digest[:32]}-{encoding}"'
+
+
+def hashed_name(path: str, digest: str) -> str:
+    """Insert a content hash before the extension: 'a/b.css' -> 'a/b.<hash>.css'."""
+    head, _, name = path.rpartition('/')
+    stem, dot, ext = name.rpartition('.')
+    if not dot or not stem:
+        stem, ext = name, ''
+    hashed = f'{stem}.{digest[:HASH_LENGTH]}' + (f'.{ext}' if ext else '')
+    return f'{head}/{hashed}' if head else hashed
+
+
+def split_hashed(path: str) -> tuple:
+    """Split a fingerprinted path into (original path, hash), or (path, None)."""
+    head, _, name = path.rpartition('/')
+    match = _HASHED_RE.match(name)
+    if not match:
+        return path, None
+    original = match.group('stem') + match.group('ext')
+    return (f'{head}/{original}' if head else original), match.group('hash')
+
+
+def _digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class AssetManifest:
+    """Tracks content hashes of the files under an assets directory."""
+
+    def __init__(
+        self,
+        root: Path,
+        check_interval: float = 1.0,
+        enabled: bool = True,
+        memory_bytes: int = 16 * 1024 * 1024,
+    ):
+        """
+        Args:
+            root: The assets directory.
+            check_interval: Minimum seconds between rescans of the directory.
+            enabled: When False, asset_url() returns plain URLs.
+            memory_bytes: Budget for file bodies held in memory.
+        """
+        self.root = Path(root)
+        self.check_interval = check_interval
+        self.enabled = enabled
+        self.memory_bytes = memory_bytes
+        self.version = 0
+        self._assets: Dict[str, Asset] = {}
+        self._lock = threading.Lock()
+        self._checked_at = None
+
+        self._bodies = OrderedDict()   # (path, digest, encoding) -> bytes, or None if not worth it
+        self._body_bytes = 0
+        self._body_lock = threading.Lock()
+        self.body_hits = 0
+        self.body_misses = 0
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rescan the directory if due, re-hashing changed files.
+
+        Returns True if any file was added, changed or removed.
+        """
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return False
+        with self._lock:
+            if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return False
+            self._checked_at = now
+
+            assets = {}
+            for file in self.root.rglob('*'):
+                if not file.is_file() or file.name.startswith('.') or file.suffix in SUFFIXES.values():
+                    continue
+                path = file.relative_to(self.root).as_posix()
+                st = file.stat()
+                signature = (st.st_mtime_ns, st.st_size)
+                known = self._assets.get(path)
+                if known is not None and known.signature == signature:
+                    assets[path] = known
+                    continue
+                digest = _digest(file)
+                assets[path] = Asset(path, hashed_name(path, digest), digest, signature, st.st_mtime)
+
+            changed = assets.keys() != self._assets.keys() or any(
+                asset.digest != self._assets[path].digest for path, asset in assets.items()
+            )
+            self._assets = assets
+            if changed:
+                self.version += 1
+                if self.version > 1:
+                    logging.info(f"🎨 Assets changed, manifest version {self.version}")
+            return changed
+
+    def get(self, path: str) -> Optional[Asset]:
+        """Get an asset by its path relative to the assets root."""
+        self.refresh()
+        return self._assets.get(path)
+
+    def url(self, url: str) -> str:
+        """Get the fingerprinted URL of an /assets/ URL (unchanged if unknown)."""
+        if not self.enabled or not url.startswith(URL_PREFIX):
+            return url
+        path, sep, query = url[len(URL_PREFIX):].partition('?')
+        asset = self.get(path)
+        if asset is None:
+            return url
+        return URL_PREFIX + asset.hashed_path + sep + query
+
+    def resolve(self, path: str) -> tuple:
+        """Map a requested path under the assets root to the file to serve.
+
+        Returns:
+            (asset, immutable). ``asset`` is None if nothing matches;
+            ``immutable`` is True only if the URL carries the current hash.
+        """
+        asset = self.get(path)
+        if asset is not None:
+            return asset, False
+        original, digest = split_hashed(path)
+        if digest is None:
+            return None, False
+        asset = self.get(original)
+        if asset is None:
+            return None, False
+        # An outdated hash still gets the current file, just not cached for good
+        return asset, asset.digest.startswith(digest)
+
+    def encodings(self, asset: Asset) -> tuple:
+        """Content codings an asset can be served in, preferred first."""
+        if not is_compressible(asset.path) or asset.size < MIN_COMPRESS_SIZE:
+            return ()
+        return available_encodings()
+
+    def body(self, asset: Asset, encoding: Optional[str] = None) -> Optional[bytes]:
+        """Get the bytes of an asset in a content coding (None for identity).
+
+        Returns None when the body should not come from memory: the file is
+        too large, or compression would not make it smaller.
+        """
+        key = (asset.path, asset.digest, encoding)
+        with self._body_lock:
+            if key in self._bodies:
+                self._bodies.move_to_end(key)
+                self.body_hits += 1
+                return self._bodies[key]
+        self.body_misses += 1
+
+        path = self.root / asset.path
+        if encoding is None:
+            if asset.size > MEMORY_MAX_FILE:
+                return None
+            body = path.read_bytes()
+        else:
+            precompressed = fresh_sibling(path, encoding)
+            body = precompressed.read_bytes() if precompressed else compress(path.read_bytes(), encoding)
+            if len(body) >= asset.size:
+                body = None
+            elif len(body) > MEMORY_MAX_FILE:
+                return body
+
+        with self._body_lock:
+            if key not in self._bodies:
+                self._bodies[key] = body
+                self._body_bytes += len(body or b'')
+                # Bodies of outdated versions age out like any other
+                while self._body_bytes > self.memory_bytes and len(self._bodies) > 1:
+                    _, old = self._bodies.popitem(last=False)
+                    self._body_bytes -= len(old or b'')
+        return body
+
+    def stats(self) -> dict:
+        """Asset count and in-memory body cache counters."""
+        return {
+            'assets': len(self._assets),
+            'version': self.version,
+            'bodies': len(self._bodies),
+            'body_bytes': self._body_bytes,
+            'body_hits': self.body_hits,
+            'body_misses': self.body_misses,
+        }
+
+    def manifest(self) -> dict:
+        """Get {path: hashed path} for every asset."""
+        self.refresh()
+        return {path: asset.hashed_path for path, asset in sorted(self._assets.items())}
+
+
+# Singleton instance
+_asset_manifest = None
+
+def get_asset_manifest() -> AssetManifest:
+    """Get or create the asset manifest singleton (configured from environment)."""
+    global _asset_manifest
+    if _asset_manifest is None:
+        _asset_manifest = AssetManifest(
+            root=Path(__file__).parent.parent.parent / 'assets',
+            check_interval=float(os.environ.get('ASSET_CHECK_INTERVAL', '1.0')),
+            enabled=os.environ.get('ASSET_FINGERPRINT', 'true').lower() == 'true',
+            memory_bytes=int(os.environ.get('ASSET_MEMORY_BYTES', str(16 * 1024 * 1024))),
+        )
+    return _asset_manifest
+
+
+def asset_url(url: str) -> str:
+    """Get the fingerprinted URL of an asset, e.g. '/assets/styles/main.css'."""
+    return get_asset_manifest().url(url)
@@ -0,0 +1,203 @@
+"""
+Incremental static builds.
+
+``build_static.py`` used to delete ``dist/`` and write every file again. With
+a ``BuildCache`` it updates ``dist/`` in place instead:
+
+* Files are written through ``write()`` / ``copy()``, which leave a file
+  untouched when its content is already there. Untouched files keep their
+  mtime, so their ``.gz``/``.br`` siblings stay fresh as well.
+* Rendered pages are stored in the cache directory together with a hash of
+  their inputs (the data files and catalog they read, the code, the asset
+  hashes). A page whose inputs hash is unchanged is not rendered again.
+* ``finish()`` deletes files the build no longer produces and writes a
+  manifest of the files changed and deleted since the previous build, so a
+  deploy can upload just the delta.
+
+State lives in ``.build-cache/`` next to ``dist/``; deleting either just
+makes the next build a full one.
+"""
+
+import hashlib
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .compression import SUFFIXES
+
+
+STATE_FILE = 'state.json'
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 hex digest of a file."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def inputs_digest(*parts) -> str:
+    """Hash of a build step's inputs (any JSON-serializable values)."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _signature(path: Path) -> list:
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _page_blob(name: str) -> str:
+    return hashlib.sha256(name.encode('utf-8')).hexdigest()[:16] + '.html'
+
+
+class BuildCache:
+    """Tracks the files of an output directory and the inputs of cached pages."""
+
+    def __init__(self, out_dir: Path, cache_dir: Path):
+        """
+        Args:
+            out_dir: The build output directory (dist/).
+            cache_dir: Directory for the state file and cached pages.
+        """
+        self.out_dir = Path(out_dir)
+        self.cache_dir = Path(cache_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        (self.cache_dir / 'pages').mkdir(parents=True, exist_ok=True)
+
+        state = {}
+        state_path = self.cache_dir / STATE_FILE
+        if state_path.exists():
+            try:
+                state = json.loads(state_path.read_text(encoding='utf-8'))
+            except (OSError, ValueError) as e:
+                logging.warning(f"⚠️  Ignoring unreadable build cache {state_path}: {e}")
+        # path -> {'sha': digest, 'signature': [mtime_ns, size]} as of the last build
+        self.files = state.get('files', {})
+        # page name -> {'inputs': digest, 'reads': [...]}
+        self.pages = state.get('pages', {})
+
+        self._produced = set()
+        self._pages = {}
+        self.written = 0
+        self.skipped = 0
+
+    def _up_to_date(self, path: str, digest: str) -> bool:
+        known = self.files.get(path)
+        target = self.out_dir / path
+        return (
+            known is not None
+            and known['sha'] == digest
+            and target.is_file()
+            and _signature(target) == known['signature']
+        )
+
+    def write(self, path: str, data) -> bool:
+        """Write a file under the output directory unless it already has this content.
+
+        Returns:
+            True if the file was written.
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self._produced.add(path)
+        if self._up_to_date(path, hashlib.sha256(data).hexdigest()):
+            self.skipped += 1
+            return False
+        target = self.out_dir / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        self.written += 1
+        return True
+
+    def copy(self, path: str, source: Path, digest: Optional[str] = None) -> bool:
+        """Copy a file to the output directory unless it is already there.
+
+        Args:
+            path: Target path relative to the output directory.
+            source: File to copy.
+            digest: SHA-256 of the source if already known.
+
+        Returns:
+            True if the file was copied.
+        """
+        self._produced.add(path)
+        if self._up_to_date(path, digest or file_digest(source)):
+            self.skipped += 1
+            return False
+        target = self.out_dir / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source, target)
+        self.written += 1
+        return True
+
+    def cached_page(self, name: str, inputs: str) -> Optional[str]:
+        """Get a page rendered by an earlier build from the same inputs."""
+        known = self.pages.get(name)
+        if known is None or known['inputs'] != inputs:
+            return None
+        blob = self.cache_dir / 'pages' / _page_blob(name)
+        if not blob.is_file():
+            return None
+        self._pages[name] = known
+        return blob.read_text(encoding='utf-8')
+
+    def page_reads(self, name: str) -> list:
+        """The inputs a page read when it was last rendered ([] if never)."""
+        return self.pages.get(name, {}).get('reads', [])
+
+    def store_page(self, name: str, inputs: str, html: str, reads: Iterable[str]):
+        """Remember a freshly rendered page and what it read."""
+        (self.cache_dir / 'pages' / _page_blob(name)).write_text(html, encoding='utf-8')
+        self._pages[name] = {'inputs': inputs, 'reads': sorted(reads)}
+
+    def _kept(self, path: str) -> bool:
+        if path in self._produced:
+            return True
+        # .gz/.br siblings come and go with their file (see compress_assets.py)
+        for suffix in SUFFIXES.values():
+            if path.endswith(suffix) and path[:-len(suffix)] in self._produced:
+                return True
+        return False
+
+    def finish(self, changes_path: Optional[Path] = None) -> dict:
+        """Delete stale outputs, save the state and write the changes manifest.
+
+        Returns:
+            {'changed': [...], 'deleted': [...], 'unchanged': count}
+        """
+        files, changed = {}, []
+        for file in sorted(self.out_dir.rglob('*')):
+            if not file.is_file():
+                continue
+            path = file.relative_to(self.out_dir).as_posix()
+            if not self._kept(path):
+                file.unlink()
+                continue
+            signature = _signature(file)
+            known = self.files.get(path)
+            if known is not None and known['signature'] == signature:
+                files[path] = known
+                continue
+            files[path] = {'sha': file_digest(file), 'signature': signature}
+            if known is None or known['sha'] != files[path]['sha']:
+                changed.append(path)
+        for directory in sorted(self.out_dir.rglob('*'), reverse=True):
+            if directory.is_dir() and not any(directory.iterdir()):
+                directory.rmdir()
+        deleted = sorted(path for path in self.files if path not in files)
+
+        # Pages not built this time are forgotten, and so are their blobs
+        for name in self.pages.keys() - self._pages.keys():
+            (self.cache_dir / 'pages' / _page_blob(name)).unlink(missing_ok=True)
+        self.files, self.pages = files, self._pages
+        state = {'files': files, 'pages': self._pages}
+        (self.cache_dir / STATE_FILE).write_text(json.dumps(state, indent=1, sort_keys=True), encoding='utf-8')
+
+        changes = {'changed': changed, 'deleted': deleted, 'unchanged': len(files) - len(changed)}
+        if changes_path is not None:
+            Path(changes_path).write_text(json.dumps(changes, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        return changes
@@ -0,0 +1,310 @@
+"""
+In-memory index of the products and categories tables.
+
+Public pages read the catalog on every render, so it is loaded once into
+pre-sorted, read-only structures and reloaded only when the catalog version
+(product count, latest ``Product.updated_at`` and a checksum of the category
+rows, see ``get_catalog_version``) changes. The version is checked at most once per ``check_interval`` seconds.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from typing import Callable, Iterable, Optional, Sequence
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import select
+
+from src.config.reads import record_read
+from src.config.snapshot import FrozenDict
+
+
+def product_to_dict(p) -> FrozenDict:
+    """Convert a Product row to the dict shape used by templates."""
+    return FrozenDict({
+        'id': p.id,
+        'name': p.name,
+        'category': p.category_id,
+        'price': p.price,
+        'image': p.image,
+        'rating': p.rating,
+        'reviews': p.reviews,
+        'badge': p.badge,
+        'in_stock': p.in_stock,
+        'description': p.description,
+    })
+
+
+def category_to_dict(c) -> FrozenDict:
+    """Convert a Category row to the dict shape used by templates."""
+    return FrozenDict({
+        'id': c.id,
+        'name': c.name,
+        'description': c.description,
+        'icon': c.icon,
+        'color': c.color,
+        'url': c.url,
+        'checked': c.id == 'all',  # For compatibility with existing templates
+    })
+
+
+# Name of the product catalog among recorded reads (data file keys otherwise)
+CATALOG_INPUT = 'catalog'
+
+# Category pages live at their Category.url, /products/<slug>; product pages below them
+CATEGORY_URL_PREFIX = '/products/'
+
+# Sort orders offered on the products page; 'featured' is the display order
+PRODUCT_SORTS = {
+    'featured': None,
+    'price-asc': lambda d: d['price'],
+    'price-desc': lambda d: -d['price'],
+    'rating': lambda d: (-d['rating'], -d['reviews']),
+}
+
+
+class ProductPage:
+    """One page of a filtered, sorted product query."""
+
+    __slots__ = ('items', 'total', 'page', 'page_size')
+
+    def __init__(self, items: list, total: int, page: int, page_size: int):
+        self.items = items
+        self.total = total
+        self.page = page
+        self.page_size = page_size
+
+    @property
+    def pages(self) -> int:
+        """Number of pages (at least 1, so an empty result still has page 1)."""
+        return max(1, math.ceil(self.total / self.page_size))
+
+
+class CatalogIndex:
+    """Immutable lookup tables for one version of the catalog.
+
+    Every sequence is sorted by (sort_order, id), the order pages display.
+    """
+
+    def __init__(self, version, products: list, categories: list):
+        """
+        Args:
+            version: Catalog version the rows were loaded at.
+            products: Product rows, any order.
+            categories: Category rows, any order.
+        """
+        self.version = version
+
+        products = sorted(products, key=lambda p: (p.sort_order, p.id))
+        categories = sorted(categories, key=lambda c: (c.sort_order, c.id))
+
+        self.all_products = tuple(product_to_dict(p) for p in products)
+        self.active_products = tuple(d for p, d in zip(products, self.all_products) if p.active)
+        self.products_by_id = {d['id']: d for d in self.all_products}
+        self.active_ids = frozenset(d['id'] for d in self.active_products)
+
+        by_category = {}
+        for d in self.active_products:
+            by_category.setdefault(d['category'], []).append(d)
+        self.products_by_category = {k: tuple(v) for k, v in by_category.items()}
+
+        featured_ids = {p.id for p in products if p.featured}
+        self.featured_products = tuple(d for d in self.active_products if d['id'] in featured_ids)
+        self.all_featured_products = tuple(d for d in self.all_products if d['id'] in featured_ids)
+
+        # Active products pre-sorted for every sort order, so queries only filter
+        self.sorted_products = {
+            sort: tuple(sorted(self.active_products, key=key)) if key else self.active_products
+            for sort, key in PRODUCT_SORTS.items()
+        }
+        prices = [d['price'] for d in self.active_products]
+        self.price_range = (min(prices), max(prices)) if prices else (0.0, 0.0)
+
+        self.all_categories = tuple(category_to_dict(c) for c in categories)
+        self.active_categories = tuple(d for c, d in zip(categories, self.all_categories) if c.active)
+        self.categories_by_id = {d['id']: d for d in self.all_categories}
+        # Active categories with a page of their own -> its URL
+        self.category_urls = {
+            d['id']: d['url'] for d in self.active_categories
+            if (d['url'] or '').startswith(CATEGORY_URL_PREFIX)
+        }
+
+    def product_url(self, product) -> Optional[str]:
+        """URL of a product's page (<category URL>/<id>), or None without a category page."""
+        base = self.category_urls.get(product['category'])
+        return f"{base}/{product['id']}" if base else None
+
+    def products(
+        self,
+        category_id: Optional[str] = None,
+        featured_only: bool = False,
+        active_only: bool = True,
+        limit: Optional[int] = None,
+    ) -> list:
+        """Select products; same semantics as get_products_from_db."""
+        if category_id and category_id != 'all':
+            if active_only and not featured_only:
+                result = self.products_by_category.get(category_id, ())
+            else:
+                source = self.all_featured_products if featured_only else self.all_products
+                if active_only:
+                    source = [d for d in source if d['id'] in self.active_ids]
+                result = [d for d in source if d['category'] == category_id]
+        elif featured_only:
+            result = self.featured_products if active_only else self.all_featured_products
+        else:
+            result = self.active_products if active_only else self.all_products
+
+        if limit:
+            result = result[:limit]
+        return list(result)
+
+    def query(
+        self,
+        categories: Iterable[str] = (),
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+        in_stock: bool = False,
+        q: str = '',
+        sort: str = 'featured',
+        page: int = 1,
+        page_size: int = 24,
+        ids: Optional[Sequence[int]] = None,
+    ) -> ProductPage:
+        """Filter, sort and paginate the active products.
+
+        Args:
+            categories: Category ids to include; empty or containing 'all'
+                means every category.
+            price_min: Lowest price to include.
+            price_max: Highest price to include.
+            in_stock: Only include products in stock.
+            q: Case-insensitive substring of the product name.
+            sort: One of PRODUCT_SORTS; unknown values fall back to 'featured'.
+            page: 1-based page number, clamped to the available pages.
+            page_size: Products per page.
+            ids: Only include these product ids (e.g. full-text search
+                results). With the 'featured' sort they keep their order.
+        """
+        categories = set(categories or ())
+        if 'all' in categories:
+            categories = set()
+        q = q.strip().casefold()
+
+        if sort not in PRODUCT_SORTS:
+            sort = 'featured'
+        if ids is None:
+            source = self.sorted_products[sort]
+        elif sort == 'featured':
+            source = [self.products_by_id[i] for i in ids if i in self.active_ids]
+        else:
+            wanted = set(ids)
+            source = [d for d in self.sorted_products[sort] if d['id'] in wanted]
+
+        matched = []
+        for d in source:
+            if categories and d['category'] not in categories:
+                continue
+            if price_min is not None and d['price'] < price_min:
+                continue
+            if price_max is not None and d['price'] > price_max:
+                continue
+            if in_stock and not d['in_stock']:
+                continue
+            if q and q not in d['name'].casefold():
+                continue
+            matched.append(d)
+
+        pages = max(1, math.ceil(len(matched) / page_size))
+        page = min(max(page, 1), pages)
+        start = (page - 1) * page_size
+        return ProductPage(matched[start:start + page_size], len(matched), page, page_size)
+
+    def categories(self, active_only: bool = True) -> list:
+        """Select categories; same semantics as get_categories_from_db."""
+        return list(self.active_categories if active_only else self.all_categories)
+
+
+class ProductCatalog:
+    """Keeps a CatalogIndex in sync with the database."""
+
+    def __init__(self, version_func: Optional[Callable[[], object]] = None, check_interval: float = 1.0):
+        """
+        Args:
+            version_func: Callable returning the catalog version; defaults to
+                src.db.get_catalog_version.
+            check_interval: Seconds between version checks.
+        """
+        if version_func is None:
+            from src.db import get_catalog_version
+            version_func = get_catalog_version
+        self.version_func = version_func
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._index: Optional[CatalogIndex] = None
+        self._checked_at = 0.0
+        self.reloads = 0
+
+    @property
+    def index(self) -> CatalogIndex:
+        """Get the current index, reloading it if the catalog changed."""
+        record_read(CATALOG_INPUT)
+        index = self._index
+        now = time.monotonic()
+        if index is not None and now - self._checked_at < self.check_interval:
+            return index
+
+        with self._lock:
+            if self._index is not None and now - self._checked_at < self.check_interval:
+                return self._index
+            version = self.version_func()
+            self._checked_at = time.monotonic()
+            if self._index is None or self._index.version != version:
+                self._index = self._load(version)
+            return self._index
+
+    @property
+    def version(self):
+        """Get the version of the current index."""
+        return self.index.version
+
+    def invalidate(self):
+        """Force a version check on next access (e.g. after writing products)."""
+        self._checked_at = 0.0
+
+    def _load(self, version) -> CatalogIndex:
+        from src.db import get_read_session
+        from src.models import Product, Category
+
+        session = get_read_session()
+        try:
+            products = session.exec(select(Product)).all()
+            categories = session.exec(select(Category)).all()
+        except OperationalError as e:
+            logging.warning(f"⚠️  Catalog tables not available, serving an empty catalog: {e}")
+            products, categories = [], []
+        finally:
+            session.close()
+        index = CatalogIndex(version, products, categories)
+        self.reloads += 1
+        logging.info(
+            f"🗂️  Loaded catalog index: {len(index.all_products)} products, "
+            f"{len(index.all_categories)} categories"
+        )
+        return index
+
+
+# Singleton instance
+_catalog = None
+
+def get_catalog() -> ProductCatalog:
+    """Get or create the product catalog singleton."""
+    global _catalog
+    if _catalog is None:
+        _catalog = ProductCatalog(
+            check_interval=float(os.environ.get('CATALOG_REFRESH_INTERVAL', '1.0')),
+        )
+    return _catalog
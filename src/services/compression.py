@@ -0,0 +1,174 @@
+"""
+Response compression helpers: codecs, Accept-Encoding negotiation and
+pre-compressed ``.gz``/``.br`` siblings of text files.
+
+Brotli is optional; without the ``brotli`` package only gzip is offered.
+Pre-compressed siblings (``main.css.gz`` next to ``main.css``) are written
+once per deploy by ``compress_assets.py`` and ``build_static.py``, so the
+server does not have to compress static files at request time.
+"""
+
+import gzip
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+# Preferred first when the client accepts several equally
+PREFERRED_ENCODINGS = ('br', 'gzip')
+
+# File name suffix of a pre-compressed sibling, per encoding
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+# Text formats worth compressing; images other than SVG are already compressed
+COMPRESSIBLE_EXTENSIONS = frozenset({
+    '.css', '.js', '.mjs', '.json', '.map', '.svg', '.html', '.htm',
+    '.txt', '.xml', '.webmanifest', '.ico',
+})
+
+# Smaller bodies gain nothing from compression once headers are counted
+MIN_COMPRESS_SIZE = 256
+
+# Levels used for pre-compression: slow, but paid once per deploy
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+def available_encodings() -> tuple:
+    """Encodings this process can produce, preferred first."""
+    return tuple(e for e in PREFERRED_ENCODINGS if e != 'br' or brotli is not None)
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress bytes with 'gzip' or 'br'.
+
+    gzip output has a zero mtime, so equal input gives equal bytes.
+    """
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=GZIP_LEVEL if level is None else level, mtime=0)
+    if encoding == 'br':
+        if brotli is None:
+            raise ValueError("brotli is not installed")
+        return brotli.compress(data, quality=BROTLI_QUALITY if level is None else level)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def is_compressible(path) -> bool:
+    """Check whether a file's extension is a compressible text format."""
+    return Path(str(path)).suffix.lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    accepted = {}
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate(header: Optional[str], available: Iterable[str]) -> Optional[str]:
+    """Pick the content coding for a response.
+
+    Args:
+        header: The request's Accept-Encoding value.
+        available: Codings the response can be sent in, preferred first.
+
+    Returns:
+        The chosen coding, or None for the identity (uncompressed) body.
+    """
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    best, best_q = None, 0.0
+    for coding in available:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    # Identity is acceptable unless refused explicitly (or via *;q=0)
+    identity_q = accepted.get('identity', wildcard if '*' in accepted else 1.0)
+    if best is not None and best_q >= identity_q:
+        return best
+    return None
+
+
+def sibling(path: Path, encoding: str) -> Path:
+    """Path of the pre-compressed sibling of a file."""
+    return path.with_name(path.name + SUFFIXES[encoding])
+
+
+def fresh_sibling(path: Path, encoding: str) -> Optional[Path]:
+    """Get the pre-compressed sibling if it exists and is not older than the file."""
+    candidate = sibling(path, encoding)
+    try:
+        if candidate.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+            return candidate
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def precompress(path: Path, encodings: Optional[Iterable[str]] = None) -> list:
+    """Write compressed siblings of one file where they are missing or stale.
+
+    A sibling is only kept if it is smaller than the file.
+
+    Returns:
+        Paths of the siblings written.
+    """
+    path = Path(path)
+    data = None
+    written = []
+    for encoding in encodings or available_encodings():
+        target = sibling(path, encoding)
+        if fresh_sibling(path, encoding) is not None:
+            continue
+        if data is None:
+            data = path.read_bytes()
+            if len(data) < MIN_COMPRESS_SIZE:
+                return written
+        body = compress(data, encoding)
+        if len(body) >= len(data):
+            target.unlink(missing_ok=True)
+            continue
+        target.write_bytes(body)
+        written.append(target)
+    return written
+
+
+def precompress_tree(root: Path, encodings: Optional[Iterable[str]] = None) -> dict:
+    """Pre-compress every compressible file under a directory.
+
+    Returns:
+        {'files': compressible files seen, 'written': siblings written,
+        'bytes': total original size, 'saved': bytes saved per encoding}.
+    """
+    encodings = tuple(encodings or available_encodings())
+    stats = {'files': 0, 'written': 0, 'bytes': 0, 'saved': {e: 0 for e in encodings}}
+    for path in sorted(Path(root).rglob('*')):
+        if not path.is_file() or path.suffix in SUFFIXES.values() or not is_compressible(path):
+            continue
+        stats['written'] += len(precompress(path, encodings))
+        size = path.stat().st_size
+        stats['files'] += 1
+        stats['bytes'] += size
+        for encoding in encodings:
+            candidate = fresh_sibling(path, encoding)
+            if candidate is not None:
+                stats['saved'][encoding] += size - candidate.stat().st_size
+    return stats
+
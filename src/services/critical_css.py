@@ -0,0 +1,203 @@
+"""
+Per-page critical CSS.
+
+``main.css`` is one large stylesheet, most of which styles a single page.
+Linking it in ``<head>`` blocks the first paint until all of it has been
+downloaded. Instead, rendered pages get the rules that can match their first
+``fold`` elements (header, hero, the top of the grid) inlined in a
+``<style>``, and ``main.css`` itself is loaded without blocking rendering
+(``rel=preload`` switched to ``stylesheet`` on load, with a ``<noscript>``
+fallback).
+
+``Layout`` links the stylesheet as usual; ``inline`` rewrites the rendered
+HTML. ``build_static.py`` runs it once per exported page, and the dev server
+runs it from ``CriticalCssMiddleware`` with the result cached per page.
+
+The full stylesheet is still loaded on every page rather than a per-page
+remainder, so browsers keep a single cached copy across pages.
+
+The parsed stylesheet is kept per asset digest and the extracted CSS per set
+of names used above the fold, so pages that share markup (every product
+page) reuse one extraction.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from fasthtml.common import Link, Noscript, Style, to_xml
+
+from .assets import AssetManifest, get_asset_manifest
+from .css import PageTokens, filter_rules, html_tokens, parse_stylesheet, serialize
+
+
+STYLESHEET_URL = '/assets/styles/main.css'
+
+# Elements in document order (header included) treated as above the fold
+DEFAULT_FOLD = 150
+
+# Always present around the body that pages pass in
+_DOCUMENT_TOKENS = PageTokens.of(tags=('html', 'head', 'body'))
+
+
+_BODY_RE = re.compile(r'<body\b', re.I)
+_START_TAG_RE = re.compile(r'<[a-zA-Z]')
+
+
+def fold_html(html: str, fold: Optional[int] = DEFAULT_FOLD) -> str:
+    """Cut a rendered page down to its first ``fold`` elements from ``<body>`` on."""
+    body = _BODY_RE.search(html)
+    start = body.start() if body else 0
+    if fold is None:
+        return html[start:]
+    for count, tag in enumerate(_START_TAG_RE.finditer(html, start)):
+        if count == fold:
+            return html[start:tag.start()]
+    return html[start:]
+
+
+class CriticalCss:
+    """Extracts and caches the critical subset of the site stylesheet."""
+
+    def __init__(
+        self,
+        manifest: AssetManifest,
+        path: str = STYLESHEET_URL,
+        fold: int = DEFAULT_FOLD,
+        enabled: bool = True,
+        max_entries: int = 256,
+    ):
+        """
+        Args:
+            manifest: Asset manifest the stylesheet is read through.
+            path: URL of the stylesheet under /assets/.
+            fold: Number of elements counted as above the fold.
+            enabled: When False, pages are left linking the stylesheet.
+            max_entries: Maximum number of cached extractions and of
+                cached pages.
+        """
+        self.manifest = manifest
+        self.path = path
+        self.fold = fold
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self._rules = None
+        self._digest = None
+        self._cache = OrderedDict()
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.page_hits = 0
+
+    def stylesheet(self) -> list:
+        """Get the parsed stylesheet, re-parsed when the file changes."""
+        asset = self.manifest.get(self.path[len('/assets/'):])
+        if asset is None:
+            return []
+        if asset.digest != self._digest:
+            text = (self.manifest.root / asset.path).read_text(encoding='utf-8')
+            with self._lock:
+                self._rules = parse_stylesheet(text)
+                self._digest = asset.digest
+                self._cache.clear()
+                self._pages.clear()
+        return self._rules
+
+    def for_tokens(self, tokens: PageTokens) -> str:
+        """Get the CSS of the rules that can match a page using these names."""
+        rules = self.stylesheet()
+        with self._lock:
+            css = self._cache.get(tokens)
+            if css is not None:
+                self._cache.move_to_end(tokens)
+                self.hits += 1
+                return css
+        css = serialize(filter_rules(rules, tokens)) if rules else ''
+        with self._lock:
+            self.misses += 1
+            self._cache[tokens] = css
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return css
+
+    def for_html(self, html: str, page=None) -> str:
+        """Get the critical CSS of a rendered page.
+
+        With ``page`` (any hashable key, e.g. the request path), the result
+        is also remembered for that page and reused while the markup above
+        the fold stays the same.
+        """
+        fold = fold_html(html, self.fold)
+        if page is None:
+            return self.for_tokens(html_tokens(fold) | _DOCUMENT_TOKENS)
+        self.stylesheet()
+        digest = hashlib.sha256(fold.encode('utf-8')).digest()
+        with self._lock:
+            entry = self._pages.get(page)
+            if entry is not None and entry[0] == digest:
+                self._pages.move_to_end(page)
+                self.page_hits += 1
+                return entry[1]
+        css = self.for_tokens(html_tokens(fold) | _DOCUMENT_TOKENS)
+        with self._lock:
+            self._pages[page] = (digest, css)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+        return css
+
+    def inline(self, html: str, page=None) -> str:
+        """Inline a rendered page's critical CSS and load the stylesheet without blocking render.
+
+        Pages link the stylesheet with a plain ``<link rel="stylesheet">``;
+        documents without that link (HTMX fragments, other stylesheets) are
+        returned unchanged.
+        """
+        if not self.enabled:
+            return html
+        href = self.manifest.url(self.path)
+        link = to_xml(Link(rel='stylesheet', href=href)).strip()
+        if link not in html:
+            return html
+        try:
+            css = self.for_html(html, page)
+        except Exception as e:
+            logging.error(f"❌ Critical CSS extraction failed: {e}")
+            return html
+        nodes = (
+            Style(css),
+            Link(rel='preload', href=href, onload="this.onload=null;this.rel='stylesheet'", **{'as': 'style'}),
+            Noscript(Link(rel='stylesheet', href=href)),
+        )
+        return html.replace(link, ''.join(to_xml(node).strip() for node in nodes), 1)
+
+    def stats(self) -> dict:
+        """Extraction cache counters."""
+        return {
+            'enabled': self.enabled,
+            'fold': self.fold,
+            'entries': len(self._cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'pages': len(self._pages),
+            'page_hits': self.page_hits,
+        }
+
+
+# Singleton instance
+_critical_css = None
+
+def get_critical_css() -> CriticalCss:
+    """Get or create the critical CSS singleton (configured from environment)."""
+    global _critical_css
+    if _critical_css is None:
+        _critical_css = CriticalCss(
+            get_asset_manifest(),
+            fold=int(os.environ.get('CRITICAL_CSS_FOLD', str(DEFAULT_FOLD))),
+            enabled=os.environ.get('CRITICAL_CSS', 'true').lower() == 'true',
+        )
+    return _critical_css
@@ -0,0 +1,320 @@
+"""
+Minimal CSS stylesheet parser and selector matcher.
+
+Enough of CSS to decide which rules of ``assets/styles/main.css`` can apply to
+a rendered page: the stylesheet is split into rules and at-rules (``@media``
+and ``@supports`` blocks are parsed recursively, others such as
+``@keyframes`` are kept as opaque blocks), and a selector is said to match a
+page when every class, id, tag and attribute name it requires occurs in the
+page's markup. Combinators, pseudo-classes and attribute values are ignored,
+so matching over-approximates: a kept rule may still not apply, but a dropped
+rule never could.
+"""
+
+import fnmatch
+import re
+from html.parser import HTMLParser
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+
+# At-rules whose block holds nested rules
+GROUPING_AT_RULES = frozenset({'media', 'supports', 'container', 'layer', 'document'})
+
+_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# One simple selector of a compound: tag, .class, #id, [attr...] or :pseudo
+_SIMPLE_RE = re.compile(
+    r'(?P<tag>\*|[a-zA-Z][\w-]*)'
+    r'|\.(?P<cls>-?[_a-zA-Z][\w-]*|(?:\\.|[\w-])+)'
+    r'|#(?P<id>(?:\\.|[\w-])+)'
+    r'|\[\s*(?P<attr>[\w-]+)[^\]]*\]'
+    r'|::?(?P<pseudo>[\w-]+)'
+)
+
+_ANIMATION_RE = re.compile(r'animation(?:-name)?\s*:\s*([^;}]+)')
+
+
+class Rule(NamedTuple):
+    """A style rule (``selectors`` set) or an at-rule (``at`` set)."""
+    selectors: Tuple[str, ...]    # empty for at-rules
+    body: str                     # declarations, or the raw block of an opaque at-rule
+    at: str = ''                  # e.g. '@media (min-width: 640px)'
+    children: Tuple['Rule', ...] = ()
+    line: int = 0                 # 1-based line of the rule in the source
+
+    @property
+    def at_name(self) -> str:
+        return self.at[1:].split(None, 1)[0].split('(')[0].lower() if self.at else ''
+
+    @property
+    def is_grouping(self) -> bool:
+        return self.at_name in GROUPING_AT_RULES
+
+    def css(self) -> str:
+        """Serialize with collapsed whitespace."""
+        if self.is_grouping:
+            return f"{self.at}{{{''.join(child.css() for child in self.children)}}}"
+        if self.at:
+            return f"{self.at}{{{self.body}}}" if self.body is not None else f"{self.at};"
+        return f"{','.join(self.selectors)}{{{self.body}}}"
+
+
+def _squash(text: str) -> str:
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def _split_top_level(text: str, sep: str = ',') -> list:
+    """Split on a separator outside parentheses, brackets and strings."""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch in '([':
+            depth += 1
+        elif ch in ')]':
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _find_block_end(text: str, start: int) -> int:
+    """Index of the '}' closing the block whose '{' is at ``start``."""
+    depth, quote = 0, None
+    for i in range(start, len(text)):
+        ch = text[i]
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(text)
+
+
+def _parse_rules(text: str, line: int = 1) -> list:
+    rules, pos = [], 0
+    while pos < len(text):
+        brace = text.find('{', pos)
+        semicolon = text.find(';', pos)
+        if brace == -1 and semicolon == -1:
+            break
+        start = pos + len(text[pos:]) - len(text[pos:].lstrip())
+        line += text.count('\n', pos, start)
+        # Statement at-rule such as @import or @charset
+        if semicolon != -1 and (brace == -1 or semicolon < brace) and text[start:semicolon].startswith('@'):
+            rules.append(Rule((), None, _squash(text[start:semicolon]), line=line))
+            line += text.count('\n', start, semicolon + 1)
+            pos = semicolon + 1
+            continue
+        if brace == -1:
+            break
+        end = _find_block_end(text, brace)
+        prelude = _squash(text[start:brace])
+        inner = text[brace + 1:end]
+        if prelude.startswith('@'):
+            rule = Rule((), _squash(inner), prelude, line=line)
+            if rule.is_grouping:
+                inner_line = line + text.count('\n', start, brace + 1)
+                rule = rule._replace(body='', children=tuple(_parse_rules(inner, inner_line)))
+            rules.append(rule)
+        elif prelude:
+            rules.append(Rule(tuple(_split_top_level(prelude)), _squash(inner), line=line))
+        line += text.count('\n', start, end + 1)
+        pos = end + 1
+    return rules
+
+
+def parse_stylesheet(text: str) -> list:
+    """Parse CSS text into a list of top-level Rules (comments dropped)."""
+    # Comments become their newlines so rules keep their line numbers
+    return _parse_rules(_COMMENT_RE.sub(lambda m: '\n' * m.group().count('\n'), text))
+
+
+def serialize(rules: Iterable[Rule]) -> str:
+    """Serialize rules, one top-level rule per line."""
+    return '\n'.join(rule.css() for rule in rules) + '\n'
+
+
+class PageTokens(NamedTuple):
+    """Names a page's markup can be matched against."""
+    tags: frozenset
+    classes: frozenset
+    ids: frozenset
+    attributes: frozenset
+
+    @classmethod
+    def of(cls, tags=(), classes=(), ids=(), attributes=()) -> 'PageTokens':
+        return cls(frozenset(t.lower() for t in tags), frozenset(classes), frozenset(ids),
+                   frozenset(a.lower() for a in attributes))
+
+    def __or__(self, other: 'PageTokens') -> 'PageTokens':
+        return PageTokens(*(a | b for a, b in zip(self, other)))
+
+
+class _TokenCollector(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tags, self.classes, self.ids, self.attributes = set(), set(), set(), set()
+        self.scripts = []
+        self._in_script = False
+
+    def handle_starttag(self, tag, attrs):
+        self.tags.add(tag)
+        self._in_script = tag == 'script'
+        for name, value in attrs:
+            self.attributes.add(name)
+            if name == 'class' and value:
+                self.classes.update(value.split())
+            elif name == 'id' and value:
+                self.ids.add(value)
+            elif name.startswith(('on', 'hx-on')) and value:
+                self.scripts.append(value)
+
+    def handle_endtag(self, tag):
+        self._in_script = False
+
+    def handle_data(self, data):
+        if self._in_script:
+            self.scripts.append(data)
+
+
+def html_tokens(html: str, scripts: bool = False) -> PageTokens:
+    """Collect tags, classes, ids and attribute names used in HTML markup.
+
+    With ``scripts``, names used by inline scripts and event handler
+    attributes are included as well (see ``script_tokens``).
+    """
+    collector = _TokenCollector()
+    collector.feed(html)
+    collector.close()
+    tokens = PageTokens.of(collector.tags, collector.classes, collector.ids, collector.attributes)
+    if scripts:
+        tokens = tokens | script_tokens('\n'.join(collector.scripts))
+    return tokens
+
+
+def _unescape(name: str) -> str:
+    return re.sub(r'\\(.)', r'\1', name)
+
+
+def selector_matches(selector: str, tokens: PageTokens) -> bool:
+    """Check whether every name a selector requires occurs in the page."""
+    # Arguments of :not()/:is()/:has() etc. are skipped: they never make a
+    # selector require more than its other parts
+    depth, plain = 0, []
+    for ch in selector:
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif depth == 0:
+            plain.append(ch)
+    for match in _SIMPLE_RE.finditer(''.join(plain)):
+        tag, cls, id_, attr = match.group('tag', 'cls', 'id', 'attr')
+        if tag and tag != '*' and tag.lower() not in tokens.tags:
+            return False
+        if cls and _unescape(cls) not in tokens.classes:
+            return False
+        if id_ and _unescape(id_) not in tokens.ids:
+            return False
+        if attr and attr.lower() not in tokens.attributes:
+            return False
+    return True
+
+
+def animation_names(rules: Iterable[Rule]) -> set:
+    """Names used in animation/animation-name declarations of rules."""
+    names = set()
+    for rule in rules:
+        if rule.is_grouping:
+            names |= animation_names(rule.children)
+        elif not rule.at:
+            for value in _ANIMATION_RE.findall(rule.body):
+                names.update(re.findall(r'[a-zA-Z_][\w-]*', value))
+    return names
+
+
+def filter_rules(rules: Iterable[Rule], tokens: PageTokens, removed: Optional[list] = None) -> list:
+    """Keep the rules with at least one selector matching the page.
+
+    Selector lists are trimmed to their matching selectors. ``@keyframes``
+    survive if a kept rule uses them; other at-rules (``@font-face``,
+    ``@import``) always do. Dropped rules and dropped selectors of kept rules
+    are appended to ``removed`` as ``(enclosing at-rule, rule)``.
+    """
+    kept = _filter(rules, tokens, removed, '')
+    used = animation_names(kept)
+    result = []
+    for rule in kept:
+        if rule.at_name.endswith('keyframes') and rule.at.split()[-1] not in used:
+            if removed is not None:
+                removed.append(('', rule))
+            continue
+        result.append(rule)
+    return result
+
+
+def _filter(rules, tokens, removed, context):
+    kept = []
+    for rule in rules:
+        if rule.is_grouping:
+            children = _filter(rule.children, tokens, removed, rule.at)
+            if children:
+                kept.append(rule._replace(children=tuple(children)))
+        elif rule.at:
+            kept.append(rule)
+        else:
+            selectors = tuple(s for s in rule.selectors if selector_matches(s, tokens))
+            if selectors:
+                kept.append(rule._replace(selectors=selectors))
+            if removed is not None and len(selectors) < len(rule.selectors):
+                dead = tuple(s for s in rule.selectors if s not in selectors)
+                removed.append((context, rule._replace(selectors=dead)))
+    return kept
+
+
+def script_tokens(text: str) -> PageTokens:
+    """Names a script could add to the page: every word in it.
+
+    Class names toggled with ``classList``, ids looked up with
+    ``getElementById`` and markup built from strings all appear as words.
+    """
+    words = set(re.findall(r'-?[_a-zA-Z][\w-]*', text))
+    return PageTokens.of(words, words, words, words)
+
+
+def stylesheet_names(rules: Iterable[Rule]) -> tuple:
+    """(classes, ids) referenced by the selectors of rules."""
+    classes, ids = set(), set()
+    for rule in rules:
+        if rule.is_grouping:
+            nested = stylesheet_names(rule.children)
+            classes |= nested[0]
+            ids |= nested[1]
+        for selector in rule.selectors:
+            for match in _SIMPLE_RE.finditer(selector):
+                if match.group('cls'):
+                    classes.add(_unescape(match.group('cls')))
+                elif match.group('id'):
+                    ids.add(_unescape(match.group('id')))
+    return classes, ids
+
+
+def allowlisted_tokens(rules: Iterable[Rule], patterns: Iterable[str]) -> PageTokens:
+    """Classes and ids of a stylesheet matching glob patterns such as 'htmx-*'."""
+    patterns = list(patterns)
+    classes, ids = stylesheet_names(rules)
+    match = lambda name: any(fnmatch.fnmatchcase(name, p) for p in patterns)
+    return PageTokens.of(classes=filter(match, classes), ids=filter(match, ids))
@@ -0,0 +1,254 @@
+"""
+Outbox for contact form notification emails.
+
+The contact route stores the submission and an ``EmailOutbox`` row in one
+transaction and answers immediately. ``OutboxDispatcher`` delivers pending
+rows in the background, retrying failures with exponential backoff, and
+records the outcome on the submission (``email_sent`` / ``email_error``).
+
+The dispatcher runs either inside the web app (``EMAIL_DISPATCHER=inprocess``)
+or as a separate process via ``email_worker.py`` (``EMAIL_DISPATCHER=worker``).
+Rows are claimed with a conditional UPDATE, so several dispatchers can share
+one database without sending an email twice.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from src.models import ContactSubmission, EmailOutbox
+
+
+def submission_form_data(submission: ContactSubmission) -> dict:
+    """Build the EmailService form data from a stored submission."""
+    return {
+        'name': submission.name,
+        'email': submission.email,
+        'phone': submission.phone,
+        'subject': submission.subject,
+        'message': submission.message,
+        'company': submission.company,
+    }
+
+
+class OutboxDispatcher:
+    """Delivers pending outbox emails with retries and backoff."""
+
+    def __init__(
+        self,
+        engine=None,
+        email_service=None,
+        max_attempts: int = 5,
+        backoff_base: float = 30.0,
+        backoff_max: float = 3600.0,
+        lease_seconds: float = 120.0,
+        batch_size: int = 20,
+    ):
+        """
+        Args:
+            engine: SQLAlchemy engine; defaults to src.db.engine.
+            email_service: Object with send_contact_form_email(form_data);
+                defaults to the EmailService singleton.
+            max_attempts: Attempts before a message is marked as failed.
+            backoff_base: Delay in seconds after the first failure; doubles
+                with every further failure.
+            backoff_max: Upper bound for the retry delay in seconds.
+            lease_seconds: How long a claimed message is reserved for the
+                dispatcher that claimed it (covers crashes mid-send).
+            batch_size: Maximum messages handled per dispatch pass.
+        """
+        if engine is None:
+            from src.db import engine
+        self.engine = engine
+        self._email_service = email_service
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+        self.batch_size = batch_size
+
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+
+    @property
+    def email_service(self):
+        if self._email_service is None:
+            from src.services.email_service import get_email_service
+            self._email_service = get_email_service()
+        return self._email_service
+
+    @staticmethod
+    def enqueue(session: Session, submission: ContactSubmission) -> EmailOutbox:
+        """Add an outbox row for a submission to the caller's transaction.
+
+        The submission must already have an id (call session.flush() first).
+        """
+        item = EmailOutbox(submission_id=submission.id)
+        session.add(item)
+        return item
+
+    def backoff(self, attempts: int) -> float:
+        """Get the retry delay in seconds after ``attempts`` failed attempts."""
+        return min(self.backoff_max, self.backoff_base * 2 ** max(attempts - 1, 0))
+
+    def dispatch_due(self, now: Optional[datetime] = None) -> int:
+        """Send every pending message whose next attempt is due.
+
+        Returns:
+            Number of messages attempted.
+        """
+        now = now or datetime.utcnow()
+        with Session(self.engine) as session:
+            due = session.exec(
+                select(EmailOutbox)
+                .where(EmailOutbox.status == 'pending')
+                .where(EmailOutbox.next_attempt_at <= now)
+                .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+                .limit(self.batch_size)
+            ).all()
+
+            attempted = 0
+            for item in due:
+                if not self._claim(session, item, now):
+                    continue
+                attempted += 1
+                self._deliver(session, item)
+            return attempted
+
+    def _claim(self, session: Session, item: EmailOutbox, now: datetime) -> bool:
+        """Reserve a message for this dispatcher; False if another one got it."""
+        lease_until = now + timedelta(seconds=self.lease_seconds)
+        result = session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == item.id)
+            .where(EmailOutbox.status == 'pending')
+            .where(EmailOutbox.next_attempt_at == item.next_attempt_at)
+            .values(next_attempt_at=lease_until, attempts=EmailOutbox.attempts + 1)
+        )
+        session.commit()
+        if result.rowcount != 1:
+            return False
+        session.refresh(item)
+        return True
+
+    def _deliver(self, session: Session, item: EmailOutbox):
+        submission = session.get(ContactSubmission, item.submission_id)
+        if submission is None:
+            item.status = 'failed'
+            item.last_error = 'Submission not found'
+            session.add(item)
+            session.commit()
+            return
+
+        try:
+            success, message = self.email_service.send_contact_form_email(submission_form_data(submission))
+        except Exception as e:
+            success, message = False, f"Failed to send email: {e}"
+
+        if success:
+            item.status = 'sent'
+            item.sent_at = datetime.utcnow()
+            item.last_error = None
+            submission.email_sent = True
+            submission.email_error = None
+            self.sent += 1
+            logging.info(f"📨 Outbox email for submission {submission.id} sent (attempt {item.attempts})")
+        elif item.attempts >= self.max_attempts:
+            item.status = 'failed'
+            item.last_error = message[:500]
+            submission.email_error = message[:500]
+            self.failed += 1
+            logging.error(f"❌ Outbox email for submission {submission.id} failed after {item.attempts} attempts: {message}")
+        else:
+            delay = self.backoff(item.attempts)
+            item.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+            item.last_error = message[:500]
+            self.retried += 1
+            logging.warning(f"⚠️  Outbox email for submission {submission.id} failed, retrying in {delay:.0f}s: {message}")
+
+        session.add(item)
+        session.add(submission)
+        session.commit()
+
+    def _close_idle_connections(self, max_age: Optional[float] = None):
+        """Close pooled SMTP connections past their idle timeout (all on stop)."""
+        pool = getattr(self.email_service, 'pool', None)
+        if pool is None:
+            return
+        try:
+            pool.close_idle(pool.idle_timeout if max_age is None else max_age)
+        except Exception as e:
+            logging.warning(f"⚠️  Failed to close idle SMTP connections: {e}")
+
+    def notify(self):
+        """Wake the dispatcher loop now (safe to call from request threads)."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def run(self, poll_interval: float = 5.0):
+        """Dispatch pending messages until stop() is called.
+
+        Sending runs in a worker thread so the event loop is never blocked
+        by SMTP. Wakes up every ``poll_interval`` seconds for retries, and
+        immediately when notify() is called.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        logging.info("📮 Email outbox dispatcher started")
+        while not self._stopping:
+            try:
+                await asyncio.to_thread(self.dispatch_due)
+            except Exception as e:
+                logging.error(f"❌ Email outbox dispatch failed: {e}")
+            self._close_idle_connections()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+        self._close_idle_connections(max_age=0.0)
+        logging.info("📮 Email outbox dispatcher stopped")
+
+    def stop(self):
+        """Ask the run() loop to exit after the current pass."""
+        self._stopping = True
+        self.notify()
+
+    def stats(self) -> dict:
+        """Get delivery counters for monitoring."""
+        stats = {'sent': self.sent, 'retried': self.retried, 'failed': self.failed}
+        pool = getattr(self.email_service, 'pool', None)
+        if pool is not None:
+            stats['smtp'] = pool.stats()
+        return stats
+
+
+# Singleton instance
+_dispatcher = None
+
+def get_outbox_dispatcher() -> OutboxDispatcher:
+    """Get or create the outbox dispatcher singleton (configured from environment)."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = OutboxDispatcher(
+            max_attempts=int(os.environ.get('EMAIL_MAX_ATTEMPTS', '5')),
+            backoff_base=float(os.environ.get('EMAIL_RETRY_BACKOFF', '30')),
+            backoff_max=float(os.environ.get('EMAIL_RETRY_BACKOFF_MAX', '3600')),
+        )
+    return _dispatcher
+
+
+def dispatcher_mode() -> str:
+    """Get EMAIL_DISPATCHER: 'inprocess' (default) or 'worker'."""
+    return os.environ.get('EMAIL_DISPATCHER', 'inprocess').lower()
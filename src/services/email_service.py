@@ -6,11 +6,146 @@ Handles sending contact form submissions via email.
 import os
 import logging
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.utils import formataddr
 
 
+# Errors meaning a pooled connection was dropped by the server (idle timeout,
+# relay restart); the message is retried once on a fresh connection
+STALE_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class SMTPConnectionPool:
+    """Reuses authenticated SMTP sessions across messages.
+
+    Connecting, STARTTLS and login dominate the cost of a send, so finished
+    connections are kept for ``idle_timeout`` seconds instead of quitting.
+    Each reused connection is checked with NOOP first; connections the server
+    dropped in the meantime are replaced transparently.
+    """
+
+    def __init__(self, connect, max_idle: int = 2, idle_timeout: float = 60.0):
+        """
+        Args:
+            connect: Callable returning a new, logged-in smtplib.SMTP.
+            max_idle: Maximum number of idle connections kept open.
+            idle_timeout: Seconds an idle connection is kept before closing.
+                Should stay below the server's own idle timeout.
+        """
+        self.connect = connect
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+
+        self._lock = threading.Lock()
+        self._idle = []  # (connection, released_at), most recently used last
+
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.connections_closed = 0
+        self.stale_recovered = 0
+        self.messages_sent = 0
+
+    def _close(self, server):
+        self.connections_closed += 1
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _is_alive(self, server) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _take_idle(self):
+        """Pop the most recently used idle connection, closing expired ones."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [s for s, t in self._idle if now - t >= self.idle_timeout]
+            self._idle = [(s, t) for s, t in self._idle if now - t < self.idle_timeout]
+            server = self._idle.pop()[0] if self._idle else None
+        for s in expired:
+            self._close(s)
+        return server
+
+    def acquire(self):
+        """Get a live connection, reusing an idle one when possible."""
+        while True:
+            server = self._take_idle()
+            if server is None:
+                break
+            if self._is_alive(server):
+                self.connections_reused += 1
+                return server
+            self.stale_recovered += 1
+            self._close(server)
+
+        logging.info("📧 Opening SMTP connection")
+        server = self.connect()
+        self.connections_opened += 1
+        return server
+
+    def release(self, server):
+        """Return a healthy connection for reuse (or close it if the pool is full)."""
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append((server, time.monotonic()))
+                return
+        self._close(server)
+
+    def send(self, msg):
+        """Send a message over a pooled connection.
+
+        A connection dropped by the server mid-send is replaced and the send
+        retried once. Other errors close the connection and propagate.
+        """
+        server = self.acquire()
+        try:
+            server.send_message(msg)
+        except STALE_CONNECTION_ERRORS:
+            self.stale_recovered += 1
+            self._close(server)
+            server = self.acquire()
+            try:
+                server.send_message(msg)
+            except Exception:
+                self._close(server)
+                raise
+        except Exception:
+            self._close(server)
+            raise
+        self.messages_sent += 1
+        self.release(server)
+
+    def close_idle(self, max_age: float = 0.0):
+        """Close idle connections older than ``max_age`` seconds (all by default)."""
+        now = time.monotonic()
+        with self._lock:
+            closing = [s for s, t in self._idle if now - t >= max_age]
+            self._idle = [(s, t) for s, t in self._idle if now - t < max_age]
+        for s in closing:
+            self._close(s)
+        return len(closing)
+
+    def stats(self) -> dict:
+        """Get connection and message counters for monitoring."""
+        return {
+            'connections_opened': self.connections_opened,
+            'connections_reused': self.connections_reused,
+            'connections_closed': self.connections_closed,
+            'stale_recovered': self.stale_recovered,
+            'messages_sent': self.messages_sent,
+            'idle': len(self._idle),
+        }
+
+
 class EmailService:
     """Service for sending emails via SMTP."""
     
@@ -24,6 +159,13 @@ class EmailService:
         self.from_name = os.environ.get('SMTP_FROM_NAME', 'Бюрократ - Форма обратной связи')
         self.to_email = os.environ.get('SMTP_TO_EMAIL')
         self.use_tls = os.environ.get('SMTP_USE_TLS', 'true').lower() == 'true'
+        # starttls (port 587), ssl (port 465) or none (local relay / test server)
+        self.security = os.environ.get('SMTP_SECURITY', 'starttls' if self.use_tls else 'ssl').lower()
+        self.pool = SMTPConnectionPool(
+            self._connect,
+            max_idle=int(os.environ.get('SMTP_POOL_SIZE', '2')),
+            idle_timeout=float(os.environ.get('SMTP_IDLE_TIMEOUT', '60')),
+        )
         
         if not self.smtp_username:
             logging.warning("⚠️  SMTP_USERNAME not found in environment variables")
@@ -32,6 +174,35 @@ class EmailService:
         if not self.to_email:
             logging.warning("⚠️  SMTP_TO_EMAIL not found in environment variables")
     
+    def _connect(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP connection."""
+        logging.info(f"📧 Connecting to SMTP server {self.smtp_host}:{self.smtp_port}")
+        
+        if self.security == 'starttls':
+            # Use STARTTLS (most common for port 587)
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10)
+            server.ehlo()
+            server.starttls()
+            server.ehlo()
+        elif self.security == 'ssl':
+            # Use SSL (for port 465)
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=10)
+        else:
+            # Plain SMTP (local relay on a trusted network)
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10)
+            server.ehlo()
+        
+        try:
+            server.login(self.smtp_username, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def close_idle_connections(self, max_age: float = 0.0) -> int:
+        """Close pooled SMTP connections idle for at least ``max_age`` seconds."""
+        return self.pool.close_idle(max_age)
+    
     def send_contact_form_email(self, form_data: dict) -> tuple[bool, str]:
         """
         Send contact form submission via email.
@@ -125,23 +296,7 @@ Email: {sender_email}
             msg.attach(part1)
             msg.attach(part2)
             
-            # Connect to SMTP server and send email
-            logging.info(f"📧 Connecting to SMTP server {self.smtp_host}:{self.smtp_port}")
-            
-            if self.use_tls:
-                # Use STARTTLS (most common for port 587)
-                server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10)
-                server.ehlo()
-                server.starttls()
-                server.ehlo()
-            else:
-                # Use SSL (for port 465)
-                server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=10)
-            
-            # Login and send
-            server.login(self.smtp_username, self.smtp_password)
-            server.send_message(msg)
-            server.quit()
+            self.pool.send(msg)
             
             logging.info(f"✅ Email sent successfully to {self.to_email}")
             return True, "Email sent successfully"
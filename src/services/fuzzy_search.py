@@ -0,0 +1,229 @@
+"""
+Typo-tolerant search over product names, category names and FAQ questions.
+
+Text is split into folded words (``text.fold``) and every distinct word gets
+its set of trigrams (``"  ш", " шт", "шта", ..., "мп "``). A query word
+matches a vocabulary word when the Jaccard similarity of their trigram sets
+reaches ``threshold``, so "штам" finds "штампы" and "печадь" finds "печать".
+
+Matching works on the vocabulary rather than on documents: the number of
+distinct words grows much more slowly than the catalog. Candidates come from
+an inverted index (trigram -> ``array`` of word ids): the postings of the
+query's trigrams are merged into per-word overlap counts, and only words
+sharing at least ``ceil(threshold * n)`` of the query's ``n`` trigrams -
+the minimum for the threshold to be reachable - are scored at all.
+
+A document's score is the mean over query words of its best word similarity.
+"""
+
+import heapq
+import math
+import operator
+import threading
+from array import array
+from collections import Counter
+from typing import Callable, List, Optional
+from urllib.parse import urlencode
+
+from .text import WORD_RE, fold
+
+
+def trigrams(word: str) -> set:
+    """Get the padded trigrams of a folded word."""
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Immutable trigram index over a list of documents."""
+
+    def __init__(self, documents: list, threshold: float = 0.3):
+        """
+        Args:
+            documents: Dicts with at least 'label' (the searched text); any
+                other fields are returned with the results. An optional
+                'rank' (lower is better) breaks score ties.
+            threshold: Minimum trigram similarity for two words to match.
+        """
+        # Doc ids follow the rank order, so ties need no extra sort key
+        self.documents = sorted(documents, key=lambda doc: doc.get('rank', 0))
+        self.threshold = threshold
+
+        vocabulary = {}          # word -> word id
+        word_docs = []           # word id -> doc ids
+        for doc_id, doc in enumerate(self.documents):
+            for word in {fold(w) for w in WORD_RE.findall(doc['label'])}:
+                word_id = vocabulary.setdefault(word, len(vocabulary))
+                if word_id == len(word_docs):
+                    word_docs.append(array('I'))
+                word_docs[word_id].append(doc_id)
+
+        self.words = list(vocabulary)
+        self.word_docs = word_docs
+
+        gram_ids = {}            # trigram -> gram id
+        postings = []            # gram id -> word ids
+        word_sizes = array('B')  # word id -> number of trigrams
+        for word_id, word in enumerate(self.words):
+            grams = trigrams(word)
+            for gram in grams:
+                gram_id = gram_ids.setdefault(gram, len(gram_ids))
+                if gram_id == len(postings):
+                    postings.append(array('I'))
+                postings[gram_id].append(word_id)
+            word_sizes.append(min(len(grams), 255))
+        self.gram_ids = gram_ids
+        self.postings = postings
+        self.word_sizes = word_sizes
+
+    def similar_words(self, word: str) -> dict:
+        """Get {word_id: similarity} for vocabulary words similar to ``word``."""
+        query = [self.gram_ids[g] for g in trigrams(word) if g in self.gram_ids]
+        n = len(trigrams(word))
+
+        # Jaccard >= t needs at least ceil(t*n) shared trigrams
+        min_overlap = max(1, math.ceil(self.threshold * n))
+        if len(query) < min_overlap:
+            return {}
+
+        # Shared-trigram counts per word, merged from the postings at C speed
+        overlaps = Counter()
+        for gram in query:
+            overlaps.update(self.postings[gram])
+
+        threshold = self.threshold
+        sizes = self.word_sizes
+        found = {}
+        for word_id, overlap in overlaps.items():
+            if overlap < min_overlap:
+                continue
+            similarity = overlap / (n + sizes[word_id] - overlap)
+            if similarity >= threshold:
+                found[word_id] = similarity
+        return found
+
+    def search(self, query: str, limit: int = 10, types: Optional[set] = None) -> List[dict]:
+        """Find documents similar to the query, best first.
+
+        Args:
+            query: Search text, possibly misspelled.
+            limit: Maximum number of results.
+            types: Only return documents whose 'type' is in this set.
+
+        Returns:
+            Document dicts with an added 'score' (0..1).
+        """
+        query_words = list(dict.fromkeys(fold(w) for w in WORD_RE.findall(query or '')))
+        if not query_words:
+            return []
+
+        scores = None
+        for word in query_words:
+            # Best similarity per document; dict updates run at C speed, and
+            # going from the least to the most similar word keeps the best
+            similar = self.similar_words(word)
+            best = {}
+            for word_id in sorted(similar, key=similar.__getitem__):
+                best.update(dict.fromkeys(self.word_docs[word_id], similar[word_id]))
+            if scores is None:
+                scores = best
+            else:
+                for doc_id, similarity in best.items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + similarity
+
+        if types is not None:
+            scores = {d: s for d, s in scores.items() if self.documents[d].get('type') in types}
+        # (-score, doc_id) tuples compare natively; doc ids are in rank order
+        ranked = heapq.nsmallest(limit, zip(map(operator.neg, scores.values()), scores.keys()))
+        return [
+            {**self.documents[doc_id], 'score': round(-total / len(query_words), 3)}
+            for total, doc_id in ranked
+        ]
+
+
+def site_documents(catalog_index, faq_data) -> list:
+    """Build the searchable documents: products, categories and FAQ questions."""
+    documents = []
+    for p in catalog_index.active_products:
+        documents.append({
+            'type': 'product',
+            'id': p['id'],
+            'label': p['name'],
+            'url': catalog_index.product_url(p) or '/products-and-services?' + urlencode({'q': p['name']}),
+            'rank': -(p['rating'] or 0.0),
+        })
+    for c in catalog_index.active_categories:
+        if c['id'] == 'all':
+            continue
+        documents.append({
+            'type': 'category',
+            'id': c['id'],
+            'label': c['name'],
+            'url': '/products-and-services?' + urlencode({'category': c['id']}),
+            'rank': -5.0,
+        })
+    for i, item in enumerate((faq_data or {}).get('items', [])):
+        documents.append({
+            'type': 'faq',
+            'id': i,
+            'label': item.get('question', ''),
+            'url': f'/contact#faq-item-{i}',
+            'rank': 0.0,
+        })
+    return documents
+
+
+class FuzzySearch:
+    """Keeps a TrigramIndex in step with the catalog and FAQ data."""
+
+    def __init__(
+        self,
+        source: Optional[Callable[[], tuple]] = None,
+        threshold: float = 0.3,
+    ):
+        """
+        Args:
+            source: Callable returning (version, documents); defaults to the
+                catalog index plus faq.yaml.
+            threshold: Minimum trigram similarity for a word to match.
+        """
+        self.source = source or _site_source
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._version = object()
+        self._index: Optional[TrigramIndex] = None
+
+    @property
+    def index(self) -> TrigramIndex:
+        """Get the index, rebuilding it if the catalog or FAQ changed."""
+        version, documents = self.source()
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._index = TrigramIndex(documents(), self.threshold)
+                    self._version = version
+        return self._index
+
+    def search(self, query: str, limit: int = 10, types: Optional[set] = None) -> List[dict]:
+        """Search all documents, optionally only the given types ('product', 'category', 'faq')."""
+        return self.index.search(query, limit, types)
+
+
+def _site_source():
+    from src.config.data_loader import get_data_version, get_faq_data
+    from src.services.catalog import get_catalog
+
+    catalog_index = get_catalog().index
+    version = (catalog_index.version, get_data_version())
+    return version, lambda: site_documents(catalog_index, get_faq_data())
+
+
+# Singleton instance
+_fuzzy_search = None
+
+def get_fuzzy_search() -> FuzzySearch:
+    """Get or create the fuzzy search singleton."""
+    global _fuzzy_search
+    if _fuzzy_search is None:
+        _fuzzy_search = FuzzySearch()
+    return _fuzzy_search
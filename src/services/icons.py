@@ -0,0 +1,199 @@
+"""
+SVG icon sprite.
+
+Icons used to be pasted into components as full ``<svg>`` markup, once per
+use: a products page with 50 cards carried 50 copies of the star. They are
+now ``<symbol>`` elements of one sprite file, ``assets/images/icons.svg``,
+and components emit a short reference::
+
+    icon('star', size=16)
+    # <svg width="16" height="16" aria-hidden="true"><use href="/assets/images/icons.<hash>.svg#star"></use></svg>
+
+The sprite holds the built-in ``ICONS`` plus every small SVG in
+``assets/images/`` (symbol id = file stem, e.g. ``pen``). Larger SVGs are
+illustrations and stay separate files. The sprite is regenerated whenever
+those files change and goes through the asset manifest like any other file,
+so its fingerprinted URL is cached for good.
+"""
+
+import html
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastcore.basics import NotStr
+
+from .assets import AssetManifest, get_asset_manifest
+
+
+SPRITE_PATH = 'images/icons.svg'
+
+# SVG files above this size are illustrations, not icons
+SPRITE_MAX_FILE = 4 * 1024
+
+# Presentation attributes of the stroked (lucide-style) icons
+STROKE = {
+    'fill': 'none',
+    'stroke': 'currentColor',
+    'stroke-width': '2',
+    'stroke-linecap': 'round',
+    'stroke-linejoin': 'round',
+}
+FILL = {'fill': 'currentColor', 'stroke': 'none'}
+
+# Built-in icons: name -> (viewBox, presentation attributes, inner markup)
+ICONS = {
+    'star': ('0 0 24 24', FILL, '<polygon points="12 2 15.09 8.26 22 9.27 17 14.14 18.18 21.02 12 17.77 5.82 21.02 7 14.14 2 9.27 8.91 8.26 12 2"/>'),
+    'search': ('0 0 24 24', STROKE, '<circle cx="11" cy="11" r="8"/><path d="m21 21-4.35-4.35"/>'),
+    'chevron-down': ('0 0 24 24', STROKE, '<polyline points="6 9 12 15 18 9"/>'),
+    'check': ('0 0 24 24', STROKE, '<polyline points="20 6 9 17 4 12"/>'),
+    'message-circle': ('0 0 24 24', STROKE, '<path d="M7.9 20A9 9 0 1 0 4 16.1L2 22Z"/>'),
+    'send': ('0 0 24 24', STROKE, '<path d="m22 2-7 20-4-9-9-4Z"/><path d="M22 2 11 13"/>'),
+    'check-circle': ('0 0 24 24', STROKE, '<path d="M22 11.08V12a10 10 0 1 1-5.93-9.14"/><polyline points="22 4 12 14.01 9 11.01"/>'),
+    'alert-circle': ('0 0 24 24', STROKE, '<circle cx="12" cy="12" r="10"/><line x1="12" y1="8" x2="12" y2="12"/><line x1="12" y1="16" x2="12.01" y2="16"/>'),
+    'map-pin': ('0 0 24 24', STROKE, '<path d="M20 10c0 6-8 12-8 12s-8-6-8-12a8 8 0 0 1 16 0Z"/><circle cx="12" cy="10" r="3"/>'),
+    'phone': ('0 0 24 24', STROKE, '<path d="M22 16.92v3a2 2 0 0 1-2.18 2 19.79 19.79 0 0 1-8.63-3.07 19.5 19.5 0 0 1-6-6 19.79 19.79 0 0 1-3.07-8.67A2 2 0 0 1 4.11 2h3a2 2 0 0 1 2 1.72 12.84 12.84 0 0 0 .7 2.81 2 2 0 0 1-.45 2.11L8.09 9.91a16 16 0 0 0 6 6l1.27-1.27a2 2 0 0 1 2.11-.45 12.84 12.84 0 0 0 2.81.7A2 2 0 0 1 22 16.92z"/>'),
+    'clock': ('0 0 24 24', STROKE, '<circle cx="12" cy="12" r="10"/><polyline points="12 6 12 12 16 14"/>'),
+    'mail': ('0 0 24 24', STROKE, '<rect width="20" height="16" x="2" y="4" rx="2"/><path d="m22 7-8.97 5.7a1.94 1.94 0 0 1-2.06 0L2 7"/>'),
+}
+
+_SVG_RE = re.compile(r'^\s*(?:<\?xml[^>]*\?>\s*)?<svg\b([^>]*)>(.*)</svg>\s*$', re.S)
+_ATTR_RE = re.compile(r'([\w:-]+)\s*=\s*"([^"]*)"')
+_PRESENTATION = ('fill', 'stroke', 'stroke-width', 'stroke-linecap', 'stroke-linejoin')
+
+
+def _symbol(name: str, view_box: str, attrs: dict, inner: str) -> str:
+    # Presentation attributes go on a group: symbols do not pass them on everywhere
+    group = ''.join(f' {k}="{v}"' for k, v in attrs.items())
+    return f'<symbol id="{name}" viewBox="{view_box}"><g{group}>{inner}</g></symbol>'
+
+
+def svg_file_symbol(path: Path) -> Optional[tuple]:
+    """Parse a small standalone SVG file into (viewBox, attributes, inner markup).
+
+    Returns None if the file is not a plain single-<svg> document or uses ids
+    (which would clash once several files share one sprite).
+    """
+    match = _SVG_RE.match(path.read_text(encoding='utf-8'))
+    if not match or ' id=' in match.group(2):
+        return None
+    attrs = dict(_ATTR_RE.findall(match.group(1)))
+    view_box = attrs.get('viewBox') or f"0 0 {attrs.get('width', '24')} {attrs.get('height', '24')}"
+    presentation = {k: attrs[k] for k in _PRESENTATION if k in attrs}
+    inner = re.sub(r'>\s+<', '><', match.group(2).strip())
+    return view_box, presentation, inner
+
+
+class IconSprite:
+    """Builds the sprite file and renders references to its symbols."""
+
+    def __init__(self, manifest: AssetManifest, max_file_size: int = SPRITE_MAX_FILE):
+        """
+        Args:
+            manifest: Asset manifest of the directory the sprite is written to.
+            max_file_size: Largest assets/images/*.svg file included.
+        """
+        self.manifest = manifest
+        self.max_file_size = max_file_size
+        self._symbols: Dict[str, str] = {}
+        self._version = None
+
+    def symbols(self) -> Dict[str, str]:
+        """Get {symbol id: <symbol> markup}, rebuilt when assets change."""
+        self.manifest.refresh()
+        if self._version != self.manifest.version:
+            symbols = {name: _symbol(name, *spec) for name, spec in ICONS.items()}
+            sprite_file = self.manifest.root / SPRITE_PATH
+            for path in sorted(sprite_file.parent.glob('*.svg')):
+                if path == sprite_file or path.stem in symbols or path.stat().st_size > self.max_file_size:
+                    continue
+                parsed = svg_file_symbol(path)
+                if parsed is not None:
+                    symbols[path.stem] = _symbol(path.stem, *parsed)
+            self._symbols = symbols
+            self._version = self.manifest.version
+            self.write()
+        return self._symbols
+
+    def sprite(self) -> str:
+        """Get the sprite document."""
+        self.symbols()
+        return self._document()
+
+    def _document(self) -> str:
+        body = ''.join(self._symbols.values())
+        return f'<svg xmlns="http://www.w3.org/2000/svg" style="display:none">{body}</svg>\n'
+
+    def write(self) -> bool:
+        """Write the sprite file if its content changed; returns True if written."""
+        target = self.manifest.root / SPRITE_PATH
+        content = self._document()
+        try:
+            if target.exists() and target.read_text(encoding='utf-8') == content:
+                return False
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(content, encoding='utf-8')
+        except OSError as e:
+            logging.error(f"❌ Could not write icon sprite {target}: {e}")
+            return False
+        logging.info(f"🖼️  Wrote icon sprite with {len(self._symbols)} symbols")
+        self.manifest.refresh(force=True)
+        self._version = self.manifest.version
+        return True
+
+    def has(self, name: str) -> bool:
+        """Check whether the sprite has a symbol."""
+        return name in self.symbols()
+
+    def url(self, name: str) -> str:
+        """Fingerprinted URL of a symbol, e.g. '/assets/images/icons.<hash>.svg#star'."""
+        self.symbols()
+        return self.manifest.url('/assets/' + SPRITE_PATH) + '#' + name
+
+    def icon(self, name: str, size: Optional[int] = None, cls: Optional[str] = None,
+             label: Optional[str] = None, **attrs) -> NotStr:
+        """Render an <svg> referencing a sprite symbol.
+
+        Args:
+            name: Symbol id (see ICONS, or an assets/images/*.svg stem).
+            size: Width and height in pixels.
+            cls: CSS class of the <svg>.
+            label: Accessible name; without one the icon is hidden from
+                assistive technology.
+            **attrs: Further attributes, e.g. style (underscores become dashes).
+        """
+        parts = []
+        if cls:
+            parts.append(f'class="{html.escape(cls)}"')
+        if size:
+            parts.append(f'width="{size}" height="{size}"')
+        if label:
+            parts.append(f'role="img" aria-label="{html.escape(label)}"')
+        else:
+            parts.append('aria-hidden="true"')
+        parts += [f'{k.replace("_", "-")}="{html.escape(str(v))}"' for k, v in attrs.items()]
+        return NotStr(f'<svg {" ".join(parts)}><use href="{self.url(name)}"></use></svg>')
+
+    def image_icon(self, src: str) -> Optional[str]:
+        """Symbol id of an /assets/images/*.svg URL if the sprite has it."""
+        match = re.fullmatch(r'/assets/images/([\w-]+)\.svg', src or '')
+        if match and self.has(match.group(1)):
+            return match.group(1)
+        return None
+
+
+# Singleton instance
+_icon_sprite = None
+
+def get_icon_sprite() -> IconSprite:
+    """Get or create the icon sprite singleton."""
+    global _icon_sprite
+    if _icon_sprite is None:
+        _icon_sprite = IconSprite(get_asset_manifest())
+    return _icon_sprite
+
+
+def icon(name: str, size: Optional[int] = None, cls: Optional[str] = None, **attrs) -> NotStr:
+    """Render a sprite icon reference (see IconSprite.icon)."""
+    return get_icon_sprite().icon(name, size=size, cls=cls, **attrs)
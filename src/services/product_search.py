@@ -0,0 +1,269 @@
+"""
+Full-text product search backed by an SQLite FTS5 table.
+
+``products_fts`` holds the normalized (folded and stemmed, see ``text.py``)
+name and description of every product, keyed by ``rowid = products.id``.
+The tables are created with the others by ``create_db_and_tables()``. The
+indexer task started in the app's lifespan (``run()``) keeps them up to
+date: when the catalog version changes, rows with a newer ``updated_at`` are
+re-indexed in a worker thread and deleted products are dropped. If the row
+counts still disagree afterwards (e.g. rows inserted by hand with old
+timestamps) the table is rebuilt. Requests only query the index.
+
+Queries are normalized with the same pipeline, every term is matched as a
+prefix, and results are ranked with BM25 (name weighted over description).
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Callable, List, Optional
+
+from sqlalchemy import text
+
+from .text import highlight, normalize, terms
+
+
+FTS_TABLE = 'products_fts'
+FTS_STATE_TABLE = 'products_fts_state'
+
+# BM25 column weights: name, description
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Longest query we bother matching
+MAX_QUERY_TERMS = 8
+
+# Seconds between catalog version checks of the indexer task
+DEFAULT_SYNC_INTERVAL = 2.0
+
+_SCHEMA = (
+    # Content is pre-normalized in Python, so the tokenizer only splits on
+    # whitespace; remove_diacritics=0 keeps й distinct from и
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description,
+        tokenize = 'unicode61 remove_diacritics 0',
+        prefix = '2 3'
+    )""",
+    f"""CREATE TABLE IF NOT EXISTS {FTS_STATE_TABLE} (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        synced_updated_at TEXT
+    )""",
+)
+
+
+# Active products matching an FTS expression, best BM25 rank first
+SEARCH_SQL = f"""
+    SELECT f.rowid, bm25({FTS_TABLE}, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT}) AS score
+    FROM {FTS_TABLE} f
+    JOIN products p ON p.id = f.rowid
+    WHERE {FTS_TABLE} MATCH :match AND p.active
+    ORDER BY score
+    LIMIT :limit
+"""
+
+
+def create_search_tables(bind):
+    """Create the FTS index and its sync state table if they are missing."""
+    with bind.begin() as conn:
+        for statement in _SCHEMA:
+            conn.execute(text(statement))
+
+
+class ProductSearch:
+    """Keeps the FTS index in sync with the products table and queries it."""
+
+    def __init__(
+        self,
+        engine=None,
+        read_engine=None,
+        version_func: Optional[Callable[[], object]] = None,
+        catalog=None,
+    ):
+        """
+        Args:
+            engine: Engine used to create and update the index; defaults to
+                src.db.engine.
+            read_engine: Engine used for queries; defaults to src.db.read_engine.
+            version_func: Callable returning the catalog version; the index is
+                synced when it changes. Defaults to the catalog's version.
+            catalog: ProductCatalog providing original names/descriptions for
+                snippets; defaults to the catalog singleton.
+        """
+        if engine is None:
+            from src.db import engine
+        if read_engine is None:
+            from src.db import read_engine
+        if catalog is None:
+            from src.services.catalog import get_catalog
+            catalog = get_catalog()
+        self.engine = engine
+        self.read_engine = read_engine
+        self.catalog = catalog
+        self.version_func = version_func or (lambda: self.catalog.version)
+
+        self._lock = threading.Lock()
+        self._synced_version = object()
+        self._stopping = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self.syncs = 0
+        self.rebuilds = 0
+
+    def ensure_synced(self):
+        """Sync the index if the catalog changed since the last sync."""
+        version = self.version_func()
+        if version == self._synced_version:
+            return
+        with self._lock:
+            if version == self._synced_version:
+                return
+            self.sync()
+            self._synced_version = version
+
+    async def run(self, poll_interval: float = DEFAULT_SYNC_INTERVAL):
+        """Keep the index in sync with the catalog until stop() is called.
+
+        Syncing runs in a worker thread, so the event loop is never blocked
+        by the SQLite writes. Checks the catalog version every
+        ``poll_interval`` seconds.
+        """
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        logging.info("🔎 Product search indexer started")
+        while not self._stopping:
+            try:
+                await asyncio.to_thread(self.ensure_synced)
+            except Exception as e:
+                logging.error(f"❌ Product search sync failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+        logging.info("🔎 Product search indexer stopped")
+
+    def stop(self):
+        """Ask the run() loop to exit (call from the loop it runs on)."""
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def sync(self):
+        """Re-index changed products and drop deleted ones."""
+        with self.engine.begin() as conn:
+            synced = conn.execute(
+                text(f"SELECT synced_updated_at FROM {FTS_STATE_TABLE} WHERE id = 1")
+            ).scalar()
+            latest = conn.execute(text("SELECT MAX(updated_at) FROM products")).scalar()
+
+            if synced is None:
+                changed = conn.execute(text("SELECT id, name, description FROM products")).all()
+            else:
+                changed = conn.execute(
+                    text("SELECT id, name, description FROM products WHERE updated_at > :synced"),
+                    {'synced': synced},
+                ).all()
+            self._index_rows(conn, changed)
+            conn.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid NOT IN (SELECT id FROM products)"))
+
+            indexed = conn.execute(text(f"SELECT COUNT(*) FROM {FTS_TABLE}")).scalar()
+            total = conn.execute(text("SELECT COUNT(*) FROM products")).scalar()
+            if indexed != total:
+                logging.info(f"🔎 Product search index out of step ({indexed}/{total}), rebuilding")
+                conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+                self._index_rows(conn, conn.execute(text("SELECT id, name, description FROM products")).all())
+                self.rebuilds += 1
+
+            conn.execute(
+                text(f"INSERT OR REPLACE INTO {FTS_STATE_TABLE} (id, synced_updated_at) VALUES (1, :latest)"),
+                {'latest': latest},
+            )
+        self.syncs += 1
+        if changed:
+            logging.info(f"🔎 Indexed {len(changed)} products for search")
+
+    def _index_rows(self, conn, rows):
+        if not rows:
+            return
+        conn.execute(
+            text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"),
+            [{'id': row.id} for row in rows],
+        )
+        conn.execute(
+            text(f"INSERT INTO {FTS_TABLE} (rowid, name, description) VALUES (:id, :name, :description)"),
+            [
+                {'id': row.id, 'name': normalize(row.name), 'description': normalize(row.description or '')}
+                for row in rows
+            ],
+        )
+
+    @staticmethod
+    def match_expression(query: str) -> Optional[str]:
+        """Build the FTS5 MATCH expression for a user query (None if empty)."""
+        query_terms = terms(query)[:MAX_QUERY_TERMS]
+        if not query_terms:
+            return None
+        # Terms are \w+ only, so quoting is enough to neutralize FTS syntax
+        return ' '.join(f'"{term}"*' for term in query_terms)
+
+    def search_ids(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """Get ids of active products matching the query, best match first."""
+        return [product_id for product_id, _ in self._ranked(query, limit)]
+
+    def _ranked(self, query: str, limit: Optional[int]) -> list:
+        match = self.match_expression(query)
+        if match is None:
+            return []
+        with self.read_engine.connect() as conn:
+            rows = conn.execute(text(SEARCH_SQL), {'match': match, 'limit': limit or -1}).all()
+        return [(row[0], row[1]) for row in rows]
+
+    def search(self, query: str, limit: int = 20) -> List[dict]:
+        """Search active products.
+
+        Returns:
+            List of {'id', 'name', 'score', 'snippet'} dicts, best match first.
+            ``score`` is the BM25 rank (lower is better); ``snippet`` is HTML
+            with matching words wrapped in <mark>.
+        """
+        ranked = self._ranked(query, limit)
+        query_terms = terms(query)[:MAX_QUERY_TERMS]
+        products = self.catalog.index.products_by_id
+
+        results = []
+        for product_id, score in ranked:
+            product = products.get(product_id)
+            if product is None:
+                continue
+            snippet = (
+                highlight(product['description'] or '', query_terms)
+                or highlight(product['name'], query_terms)
+            )
+            results.append({
+                'id': product_id,
+                'name': product['name'],
+                'score': round(score, 4),
+                'snippet': snippet,
+            })
+        return results
+
+
+# Singleton instance
+_product_search = None
+
+def get_product_search() -> ProductSearch:
+    """Get or create the product search singleton."""
+    global _product_search
+    if _product_search is None:
+        _product_search = ProductSearch()
+    return _product_search
+
+
+def search_enabled() -> bool:
+    """Check PRODUCT_SEARCH ('fts' by default, 'substring' to disable FTS)."""
+    return os.environ.get('PRODUCT_SEARCH', 'fts').lower() == 'fts'
+
+
+def sync_interval() -> float:
+    """Seconds between catalog checks of the indexer (PRODUCT_SEARCH_SYNC_INTERVAL)."""
+    return float(os.environ.get('PRODUCT_SEARCH_SYNC_INTERVAL', str(DEFAULT_SYNC_INTERVAL)))
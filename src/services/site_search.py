@@ -0,0 +1,320 @@
+"""
+Site-wide search over the informational YAML pages.
+
+Every page in ``SEARCH_PAGES`` is split into documents: one per anchored
+section (a ``clients.yaml`` section, an FAQ item, a numbered privacy or
+agreement section) or one for the whole page when it has no anchors. Each
+document links to its route and anchor.
+
+The inverted index maps every normalized term (see ``text.py``) to the
+documents containing it and the term's positions there, so quoted phrases
+("гарантия на печати") match only consecutive terms. Title terms come first,
+followed by a gap, so a phrase never spans the title and the text. Hits are
+ranked with BM25, with title occurrences weighted up.
+
+The index is rebuilt whenever the data store publishes a new version, and it
+serializes to plain JSON: ``to_dict()`` for a single file, ``shards()`` for a
+manifest plus one postings file per leading character of the terms, as
+emitted by ``build_static.py``.
+"""
+
+import math
+import re
+import threading
+from typing import Callable, List, NamedTuple, Optional
+
+from .text import highlight, terms
+
+
+class SearchPage(NamedTuple):
+    """How a YAML data file maps to a page of the site."""
+    route: str
+    sections: Optional[str] = None           # list field holding anchored sections
+    anchor: Optional[Callable] = None        # (index, section) -> element id
+
+
+# Data keys (see data_store.DATA_FILES) that are searched, and where they render
+SEARCH_PAGES = {
+    'hero': SearchPage('/'),
+    'about': SearchPage('/about'),
+    'clients': SearchPage('/clients', 'sections', lambda i, section: section.get('id')),
+    'faq': SearchPage('/contact', 'items', lambda i, item: f'faq-item-{i}'),
+    'contact': SearchPage('/contact'),
+    'privacy': SearchPage('/privacy-statement', 'sections', lambda i, section: f'privacy-section-{i + 1}'),
+    'agreement': SearchPage('/agreement', 'sections', lambda i, section: f'agreement-section-{i + 1}'),
+    'seals_stamps': SearchPage('/seals-and-stamps'),
+    'self_inking_stamps': SearchPage('/self-inking-stamps'),
+    'stationery': SearchPage('/stationery'),
+}
+
+# Fields that hold markup hints, links or form plumbing rather than content
+SKIP_KEYS = frozenset({
+    'id', 'icon', 'color', 'image', 'link', 'url', 'href', 'button_action',
+    'submit_endpoint', 'form', 'page_title',
+})
+
+# Keys naming a section, in order of preference
+HEADING_KEYS = ('heading', 'question', 'title')
+
+# Title occurrences count this many times in BM25 term frequency
+TITLE_WEIGHT = 3.0
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_MARKDOWN_RE = re.compile(r'\*\*')
+_PHRASE_RE = re.compile(r'"([^"]*)"?')
+
+
+def _strings(value, key=None) -> List[str]:
+    """Collect the text content of a YAML value, depth first."""
+    if key in SKIP_KEYS:
+        return []
+    if isinstance(value, str):
+        text = _MARKDOWN_RE.sub('', value).strip()
+        return [text] if text else []
+    if isinstance(value, dict):
+        return [s for k, v in value.items() for s in _strings(v, k)]
+    if isinstance(value, (list, tuple)):
+        return [s for v in value for s in _strings(v)]
+    return []
+
+
+def _heading(section) -> str:
+    if isinstance(section, dict):
+        for key in HEADING_KEYS:
+            if section.get(key):
+                return str(section[key])
+    return ''
+
+
+def page_documents(key: str, data) -> list:
+    """Split one YAML data file into searchable documents."""
+    page = SEARCH_PAGES[key]
+    data = data or {}
+    page_title = str(data.get('title') or data.get('page_title') or '').split(' | ')[0]
+
+    def document(anchor, title, value):
+        return {
+            'page': key,
+            'route': page.route,
+            'anchor': anchor,
+            'url': page.route + (f'#{anchor}' if anchor else ''),
+            'page_title': page_title,
+            'title': title or page_title,
+            'text': '\n'.join(_strings(value)),
+        }
+
+    sections = data.get(page.sections) if page.sections else None
+    if not sections:
+        rest = {k: v for k, v in data.items() if k != 'title'}
+        return [document(None, page_title, rest)]
+
+    documents = []
+    rest = {k: v for k, v in data.items() if k not in ('title', page.sections)}
+    if _strings(rest):
+        documents.append(document(None, page_title, rest))
+    for i, section in enumerate(sections):
+        heading = _heading(section)
+        body = {k: v for k, v in section.items() if k not in HEADING_KEYS} if isinstance(section, dict) else section
+        documents.append(document(page.anchor(i, section), heading, body))
+    return documents
+
+
+def parse_query(query: str) -> List[List[str]]:
+    """Split a query into phrases of normalized terms.
+
+    Quoted parts are phrases; every other word is a phrase of its own.
+    """
+    phrases = []
+    position = 0
+    for match in _PHRASE_RE.finditer(query or ''):
+        phrases.extend([term] for term in terms(query[position:match.start()]))
+        phrase = terms(match.group(1))
+        if phrase:
+            phrases.append(phrase)
+        position = match.end()
+    phrases.extend([term] for term in terms((query or '')[position:]))
+    return phrases
+
+
+class SiteIndex:
+    """Positional inverted index over page documents."""
+
+    def __init__(self, documents: list, version=None):
+        """
+        Args:
+            documents: Dicts from page_documents() ('title' and 'text' are indexed).
+            version: Data version the documents were built from.
+        """
+        self.version = version
+        self.documents = documents
+        self.postings = {}        # term -> {doc_id: [positions]}
+        self.title_lengths = []   # doc_id -> number of title terms
+        self.lengths = []         # doc_id -> total number of terms
+        for doc_id, doc in enumerate(documents):
+            title_terms = terms(doc['title'])
+            text_terms = terms(doc['text'])
+            # One position of gap keeps phrases from spanning title and text
+            offset = len(title_terms) + 1
+            positioned = list(enumerate(title_terms)) + [(offset + i, t) for i, t in enumerate(text_terms)]
+            for position, term in positioned:
+                self.postings.setdefault(term, {}).setdefault(doc_id, []).append(position)
+            self.title_lengths.append(len(title_terms))
+            self.lengths.append(len(positioned))
+        self.average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _phrase_docs(self, phrase: List[str]) -> dict:
+        """Get {doc_id: start positions} of documents containing the phrase."""
+        postings = [self.postings.get(term) for term in phrase]
+        if not all(postings):
+            return {}
+        doc_ids = set(postings[0]).intersection(*postings[1:])
+        found = {}
+        for doc_id in doc_ids:
+            following = [set(p[doc_id]) for p in postings[1:]]
+            starts = [
+                start for start in postings[0][doc_id]
+                if all(start + k in positions for k, positions in enumerate(following, 1))
+            ]
+            if starts:
+                found[doc_id] = starts
+        return found
+
+    def _term_score(self, term: str, doc_id: int) -> float:
+        positions = self.postings[term][doc_id]
+        title_length = self.title_lengths[doc_id]
+        tf = sum(TITLE_WEIGHT if p < title_length else 1.0 for p in positions)
+        df = len(self.postings[term])
+        idf = math.log(1 + (len(self.documents) - df + 0.5) / (df + 0.5))
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[doc_id] / (self.average_length or 1))
+        return idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+    def search(self, query: str, limit: int = 20) -> List[dict]:
+        """Find documents containing every word and phrase of the query.
+
+        Returns:
+            Document dicts, best first, with 'score' and an HTML 'snippet'
+            (matching words wrapped in <mark>).
+        """
+        phrases = parse_query(query)
+        if not phrases:
+            return []
+        matches = sorted((self._phrase_docs(phrase) for phrase in phrases), key=len)
+        doc_ids = set(matches[0]).intersection(*matches[1:])
+
+        query_terms = [term for phrase in phrases for term in phrase]
+        scored = sorted(
+            ((sum(self._term_score(t, d) for t in set(query_terms)), d) for d in doc_ids),
+            key=lambda item: (-item[0], item[1]),
+        )[:limit]
+
+        results = []
+        for score, doc_id in scored:
+            doc = self.documents[doc_id]
+            results.append({
+                **doc,
+                'score': round(score, 4),
+                'snippet': highlight(doc['text'], query_terms) or highlight(doc['title'], query_terms),
+            })
+        return results
+
+    def to_dict(self) -> dict:
+        """Serialize to JSON-compatible data (see from_dict)."""
+        return {
+            'version': self.version,
+            'documents': self.documents,
+            'title_lengths': self.title_lengths,
+            'lengths': self.lengths,
+            'postings': {
+                term: [[doc_id, positions] for doc_id, positions in docs.items()]
+                for term, docs in sorted(self.postings.items())
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SiteIndex':
+        """Rebuild an index from to_dict() output without re-tokenizing."""
+        index = cls.__new__(cls)
+        index.version = data.get('version')
+        index.documents = list(data['documents'])
+        index.title_lengths = list(data['title_lengths'])
+        index.lengths = list(data['lengths'])
+        index.postings = {
+            term: {doc_id: list(positions) for doc_id, positions in docs}
+            for term, docs in data['postings'].items()
+        }
+        index.average_length = sum(index.lengths) / len(index.lengths) if index.lengths else 0.0
+        return index
+
+    def shards(self) -> tuple:
+        """Split the serialized index for static hosting.
+
+        Returns:
+            (manifest, {shard_name: postings}). The manifest holds everything
+            but the postings, plus the shard names; postings are grouped by
+            the hex code point of the term's first character, so a client
+            fetches only the shards for the words it is looking up.
+        """
+        data = self.to_dict()
+        shards = {}
+        for term, docs in data.pop('postings').items():
+            shards.setdefault(shard_name(term), {})[term] = docs
+        data['shards'] = sorted(shards)
+        return data, shards
+
+
+def shard_name(term: str) -> str:
+    """Name of the postings shard holding a term (e.g. 'р' -> '440')."""
+    return format(ord(term[0]), 'x')
+
+
+def site_documents(get_data: Callable) -> list:
+    """Build documents for every page in SEARCH_PAGES from a data getter."""
+    return [doc for key in SEARCH_PAGES for doc in page_documents(key, get_data(key))]
+
+
+class SiteSearch:
+    """Keeps a SiteIndex in step with the YAML data store."""
+
+    def __init__(self, store=None):
+        """
+        Args:
+            store: DataStore to index; defaults to the data store singleton.
+        """
+        if store is None:
+            from src.config import get_data_store
+            store = get_data_store()
+        self.store = store
+        self._lock = threading.Lock()
+        self._index: Optional[SiteIndex] = None
+
+    @property
+    def index(self) -> SiteIndex:
+        """Get the index, rebuilding it if any data file was (re)loaded."""
+        version = self.store.version
+        index = self._index
+        if index is None or index.version != version:
+            with self._lock:
+                index = self._index
+                if index is None or index.version != version:
+                    index = SiteIndex(site_documents(self.store.get), version)
+                    self._index = index
+        return index
+
+    def search(self, query: str, limit: int = 20) -> List[dict]:
+        """Search all informational pages."""
+        return self.index.search(query, limit)
+
+
+# Singleton instance
+_site_search = None
+
+def get_site_search() -> SiteSearch:
+    """Get or create the site search singleton."""
+    global _site_search
+    if _site_search is None:
+        _site_search = SiteSearch()
+    return _site_search
@@ -0,0 +1,116 @@
+"""
+Text normalization for search.
+
+Russian product names and descriptions are matched on normalized terms:
+case folded, with ё folded to е, and reduced by a light suffix-stripping
+stemmer so that "ручка", "ручки", "ручкой" and "ручек" all become "ручк".
+The same pipeline is applied to indexed text and to queries.
+
+The stemmer only strips common noun/adjective/verb endings from Cyrillic
+words; it is intentionally simple and never reduces a word below
+``MIN_STEM_LENGTH`` characters. Latin words and numbers are only case folded.
+"""
+
+import html
+import re
+from typing import Iterator, List, Tuple
+
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+CYRILLIC_RE = re.compile(r'[а-я]')
+
+MIN_STEM_LENGTH = 3
+
+RUSSIAN_VOWELS = frozenset('аеиоуыэюя')
+
+# Longest endings first, so "ями" is stripped before "и"
+RUSSIAN_ENDINGS = tuple(sorted((
+    # Adjectives and participles
+    'ыми', 'ими', 'ого', 'его', 'ому', 'ему', 'ая', 'яя', 'ое', 'ее',
+    'ые', 'ие', 'ый', 'ий', 'ой', 'ую', 'юю', 'ых', 'их', 'ым', 'им',
+    # Nouns
+    'иями', 'ями', 'ами', 'иях', 'ях', 'ах', 'ией', 'ей', 'ом',
+    'ем', 'ам', 'ям', 'ов', 'ев', 'ью', 'ия', 'ию', 'ии',
+    'а', 'я', 'о', 'е', 'ы', 'и', 'у', 'ю', 'ь', 'й',
+    # Verbs
+    'ться', 'тся', 'ешь', 'ете', 'ите', 'ить', 'ать', 'ять', 'еть',
+    'ет', 'ит', 'ут', 'ют', 'ат', 'ят',
+), key=len, reverse=True))
+
+# Endings grouped by their last letter, so stem() only tries plausible ones
+_ENDINGS_BY_LAST = {}
+for _ending in RUSSIAN_ENDINGS:
+    _ENDINGS_BY_LAST.setdefault(_ending[-1], []).append(_ending)
+
+
+def fold(text: str) -> str:
+    """Case fold text and replace ё with е."""
+    return text.casefold().replace('ё', 'е')
+
+
+def stem(word: str) -> str:
+    """Reduce a folded word to its search stem."""
+    if not CYRILLIC_RE.search(word):
+        return word
+    for ending in _ENDINGS_BY_LAST.get(word[-1], ()):
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM_LENGTH:
+            return word[:-len(ending)]
+    # Fleeting vowel in -ек/-ок: "ручек" -> "ручк" to match "ручка"
+    if (len(word) >= 5 and word[-1] == 'к' and word[-2] in 'ео'
+            and word[-3] not in RUSSIAN_VOWELS):
+        return word[:-2] + 'к'
+    return word
+
+
+def tokenize(text: str) -> Iterator[Tuple[int, int, str]]:
+    """Yield (start, end, stem) for every word in the original text."""
+    for match in WORD_RE.finditer(text or ''):
+        yield match.start(), match.end(), stem(fold(match.group()))
+
+
+def terms(text: str) -> List[str]:
+    """Get the normalized search terms of a text, in order."""
+    return [term for _, _, term in tokenize(text)]
+
+
+def normalize(text: str) -> str:
+    """Get the normalized form of a text as space-separated terms."""
+    return ' '.join(terms(text))
+
+
+def highlight(text: str, query_terms, context: int = 8, mark: str = 'mark') -> str:
+    """Build an HTML snippet of ``text`` around the first matching word.
+
+    Words whose stem starts with one of ``query_terms`` are wrapped in
+    ``<mark>``; everything else is escaped. Returns an empty string when no
+    word matches.
+
+    Args:
+        text: Original (not normalized) text.
+        query_terms: Normalized query terms, as returned by terms().
+        context: Words of context to keep on each side of the first match.
+        mark: Tag used for highlighting.
+    """
+    query_terms = tuple(query_terms)
+    words = list(tokenize(text))
+    matches = [i for i, (_, _, term) in enumerate(words) if term.startswith(query_terms)]
+    if not matches:
+        return ''
+
+    first = max(0, matches[0] - context)
+    last = min(len(words) - 1, matches[0] + context)
+    matched = set(matches)
+
+    parts = ['…'] if first > 0 else []
+    position = words[first][0]
+    for i in range(first, last + 1):
+        start, end, _ = words[i]
+        parts.append(html.escape(text[position:start]))
+        word = html.escape(text[start:end])
+        parts.append(f'<{mark}>{word}</{mark}>' if i in matched else word)
+        position = end
+    if last < len(words) - 1:
+        parts.append('…')
+    else:
+        parts.append(html.escape(text[position:]))
+    return ''.join(parts)
@@ -0,0 +1,244 @@
+"""
+In-memory prefix index for search-box suggestions.
+
+Every word of every active product and category name is stored in one
+sorted list of ``(word, entry_key)`` pairs, so the entries whose names have a
+word starting with the typed prefix form a contiguous slice found with
+``bisect``. Matches are ranked by rating, then review count. The ranked top
+results of every word prefix up to ``PRECOMPUTED_PREFIX`` letters are kept
+precomputed, so a single typed word is answered with one dict lookup.
+
+The index follows the catalog: when the catalog version changes, only the
+products and categories that were added, removed or edited are re-indexed.
+A few changed entries are inserted into the sorted list in place; the first
+build and large changes sort the whole list once instead.
+"""
+
+import heapq
+import threading
+from bisect import bisect_left
+from typing import Optional
+from urllib.parse import urlencode
+
+from src.config.snapshot import FrozenDict
+
+from .text import WORD_RE, fold
+
+
+# Prefixes up to this length get their ranked top results precomputed;
+# longer prefixes select short ranges of the sorted word list
+PRECOMPUTED_PREFIX = 6
+
+# Changes to more than this share of the entries rebuild the sorted word
+# list in one sort instead of inserting each word in place
+BULK_UPDATE_SHARE = 0.1
+
+# Sorts after every character, so (prefix + _MAX_CHAR,) bounds a prefix range
+_MAX_CHAR = '\U0010ffff'
+
+
+def _words(name: str) -> list:
+    return [fold(w) for w in WORD_RE.findall(name or '')]
+
+
+def _rank(entry) -> tuple:
+    """Sort key: best rated first, then most reviewed, then by name."""
+    return (-entry['rating'], -entry['reviews'], entry['label'])
+
+
+def product_entry(product, url=None) -> FrozenDict:
+    """Build the suggestion for a product dict from the catalog index.
+
+    Args:
+        product: Product dict
+        url: The product's page; without one, a products search for its name
+    """
+    return FrozenDict({
+        'type': 'product',
+        'id': product['id'],
+        'label': product['name'],
+        'url': url or '/products-and-services?' + urlencode({'q': product['name']}),
+        'rating': product['rating'] or 0.0,
+        'reviews': product['reviews'] or 0,
+    })
+
+
+def category_entry(category, products) -> FrozenDict:
+    """Build the suggestion for a category, ranked by its best products."""
+    return FrozenDict({
+        'type': 'category',
+        'id': category['id'],
+        'label': category['name'],
+        'url': '/products-and-services?' + urlencode({'category': category['id']}),
+        'rating': max((p['rating'] or 0.0 for p in products), default=0.0),
+        'reviews': sum(p['reviews'] or 0 for p in products),
+    })
+
+
+class TypeaheadIndex:
+    """Prefix index over product and category names."""
+
+    def __init__(self, top_n: int = 10):
+        """
+        Args:
+            top_n: Results precomputed per prefix (upper bound for limit).
+        """
+        self.top_n = top_n
+        self.version = None
+        self._entries = {}     # entry_key -> suggestion
+        self._rank = {}        # entry_key -> sort key
+        self._words = {}       # entry_key -> folded words of the label
+        self._keys = []        # sorted (word, entry_key)
+        self._key_entries = []  # entry_key of each _keys item, for C-speed slicing
+        self._top = {}         # prefix -> ranked entry keys
+        self._order = []       # all entry keys, best ranked first
+
+    def __len__(self):
+        return len(self._entries)
+
+    def update(self, catalog_index):
+        """Bring the index in line with a CatalogIndex, re-indexing only changes.
+
+        Returns:
+            Number of entries added, removed or changed.
+        """
+        entries = {
+            ('product', p['id']): product_entry(p, catalog_index.product_url(p))
+            for p in catalog_index.active_products
+        }
+        for category in catalog_index.active_categories:
+            if category['id'] == 'all':
+                continue
+            products = catalog_index.products_by_category.get(category['id'], ())
+            entries[('category', category['id'])] = category_entry(category, products)
+
+        removed = [k for k, e in self._entries.items() if entries.get(k) != e]
+        added = [k for k, e in entries.items() if self._entries.get(k) != e]
+
+        bulk = len(removed) + len(added) > BULK_UPDATE_SHARE * max(len(self._entries), len(entries))
+
+        touched = set()
+        for key in removed:
+            for word in self._words.pop(key):
+                if not bulk:
+                    i = bisect_left(self._keys, (word, key))
+                    if i < len(self._keys) and self._keys[i] == (word, key):
+                        del self._keys[i]
+                        del self._key_entries[i]
+                touched.add(word)
+            del self._entries[key]
+            del self._rank[key]
+        for key in added:
+            entry = entries[key]
+            words = sorted(set(_words(entry['label'])))
+            self._entries[key] = entry
+            self._rank[key] = _rank(entry)
+            self._words[key] = words
+            for word in words:
+                if not bulk:
+                    i = bisect_left(self._keys, (word, key))
+                    self._keys.insert(i, (word, key))
+                    self._key_entries.insert(i, key)
+                touched.add(word)
+        if bulk:
+            self._keys = sorted((word, key) for key, words in self._words.items() for word in words)
+            self._key_entries = [key for _, key in self._keys]
+
+        if removed or added:
+            self._order = sorted(self._entries, key=self._rank.__getitem__)
+
+        # Refresh the precomputed results of every prefix a change touched
+        prefixes = {w[:n] for w in touched for n in range(1, min(len(w), PRECOMPUTED_PREFIX) + 1)}
+        for prefix in prefixes:
+            top = self._ranked(self._matching(prefix), self.top_n)
+            if top:
+                self._top[prefix] = top
+            else:
+                self._top.pop(prefix, None)
+
+        self.version = catalog_index.version
+        return len(set(removed) | set(added))
+
+    def _range(self, prefix: str) -> tuple:
+        """Slice bounds of the _keys items whose word starts with prefix."""
+        return (
+            bisect_left(self._keys, (prefix,)),
+            bisect_left(self._keys, (prefix + _MAX_CHAR,)),
+        )
+
+    def _matching(self, prefix: str) -> set:
+        """Entry keys having a word that starts with prefix."""
+        lo, hi = self._range(prefix)
+        return set(self._key_entries[lo:hi])
+
+    def _ranked(self, entry_keys: set, limit: int) -> list:
+        """Best ranked ``limit`` of a set of entry keys."""
+        if len(entry_keys) * 20 < len(self._order):
+            return heapq.nsmallest(limit, entry_keys, key=self._rank.__getitem__)
+        # Large sets: walk the global ranking, which finds hits quickly
+        top = []
+        for key in self._order:
+            if key in entry_keys:
+                top.append(key)
+                if len(top) == limit:
+                    break
+        return top
+
+    def suggest(self, query: str, limit: int = 8) -> list:
+        """Get up to ``limit`` suggestions for what has been typed so far.
+
+        Every typed word must be the start of a word in the name; the last
+        one may be incomplete.
+        """
+        words = _words(query)
+        if not words:
+            return []
+        limit = min(limit, self.top_n)
+
+        if len(words) == 1 and len(words[0]) <= PRECOMPUTED_PREFIX:
+            keys = self._top.get(words[0], [])[:limit]
+        else:
+            # Entries matching every typed word, smallest set first
+            matches = sorted((self._matching(w) for w in set(words)), key=len)
+            candidates = matches[0].intersection(*matches[1:])
+            keys = self._ranked(candidates, limit)
+        return [self._entries[k] for k in keys]
+
+
+class Typeahead:
+    """Keeps a TypeaheadIndex in step with the product catalog."""
+
+    def __init__(self, catalog=None, top_n: int = 10):
+        """
+        Args:
+            catalog: ProductCatalog to follow; defaults to the catalog singleton.
+            top_n: Maximum suggestions per query.
+        """
+        if catalog is None:
+            from src.services.catalog import get_catalog
+            catalog = get_catalog()
+        self.catalog = catalog
+        self.index = TypeaheadIndex(top_n=top_n)
+        self._lock = threading.Lock()
+        self._indexed = None  # CatalogIndex the prefix index reflects
+
+    def suggest(self, query: str, limit: int = 8) -> list:
+        """Get suggestions, re-indexing changed catalog rows first if needed."""
+        catalog_index = self.catalog.index
+        # The index is mutated in place, so lookups and updates share the lock
+        with self._lock:
+            if catalog_index is not self._indexed:
+                self.index.update(catalog_index)
+                self._indexed = catalog_index
+            return self.index.suggest(query, limit)
+
+
+# Singleton instance
+_typeahead: Optional[Typeahead] = None
+
+def get_typeahead() -> Typeahead:
+    """Get or create the typeahead singleton."""
+    global _typeahead
+    if _typeahead is None:
+        _typeahead = Typeahead()
+    return _typeahead
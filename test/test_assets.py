@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Test fingerprinted asset URLs, the manifest, and cache headers of the assets route"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.assets import AssetManifest, hashed_name, split_hashed
+
+
+def _write(path, text, mtime):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+
+def test_names():
+    """Hashes go before the extension and can be split off again"""
+    assert hashed_name('styles/main.css', 'abcdef0123456789') == 'styles/main.abcdef0123.css'
+    assert hashed_name('LICENSE', 'abcdef0123456789') == 'LICENSE.abcdef0123'
+    assert split_hashed('styles/main.abcdef0123.css') == ('styles/main.css', 'abcdef0123')
+    assert split_hashed('styles/main.css') == ('styles/main.css', None)
+    assert split_hashed('vendor/lib.min.js') == ('vendor/lib.min.js', None)
+
+
+def test_urls_follow_content():
+    """A changed file gets a new URL and bumps the manifest version"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write(root / 'styles/main.css', 'body { color: red }', 1_000_000)
+        manifest = AssetManifest(root, check_interval=0)
+
+        url = manifest.url('/assets/styles/main.css')
+        assert url.startswith('/assets/styles/main.') and url.endswith('.css') and url != '/assets/styles/main.css'
+        assert manifest.url('/assets/styles/main.css?v=2') == url + '?v=2'
+        assert manifest.url('/assets/missing.css') == '/assets/missing.css'
+        assert manifest.url('https://example.com/a.css') == 'https://example.com/a.css'
+        version = manifest.version
+
+        # Same content, new mtime: same URL
+        _write(root / 'styles/main.css', 'body { color: red }', 2_000_000)
+        assert manifest.url('/assets/styles/main.css') == url and manifest.version == version
+
+        _write(root / 'styles/main.css', 'body { color: blue }', 3_000_000)
+        assert manifest.url('/assets/styles/main.css') != url and manifest.version == version + 1
+
+        # The old hash still resolves, but no longer as immutable
+        asset, immutable = manifest.resolve(url[len('/assets/'):])
+        assert asset.path == 'styles/main.css' and immutable is False
+        asset, immutable = manifest.resolve(manifest.url('/assets/styles/main.css')[len('/assets/'):])
+        assert immutable is True
+        assert manifest.resolve('styles/main.css')[1] is False
+        assert manifest.resolve('../secret.css') == (None, False)
+
+        disabled = AssetManifest(root, enabled=False)
+        assert disabled.url('/assets/styles/main.css') == '/assets/styles/main.css'
+
+
+def test_route_headers():
+    """Hashed URLs are immutable; plain URLs are revalidated with 304"""
+    from fasthtml.common import fast_app
+    from starlette.testclient import TestClient
+    from src.routes.static_files import register_static_route
+    from src.services.assets import asset_url
+
+    app, rt = fast_app()
+    register_static_route(rt)
+    client = TestClient(app)
+
+    hashed = client.get(asset_url('/assets/styles/main.css'))
+    assert hashed.status_code == 200
+    assert 'immutable' in hashed.headers['cache-control']
+
+    plain = client.get('/assets/styles/main.css')
+    assert plain.headers['cache-control'] == 'public, max-age=0, must-revalidate'
+    assert plain.headers['etag'] == hashed.headers['etag']
+
+    assert client.get('/assets/styles/main.css', headers={'If-None-Match': plain.headers['etag']}).status_code == 304
+    assert client.get('/assets/styles/main.css', headers={'If-None-Match': '"other"'}).status_code == 200
+    assert client.get('/assets/missing.css').status_code == 404
+
+
+if __name__ == '__main__':
+    test_names()
+    test_urls_follow_content()
+    test_route_headers()
+    print("✅ Asset tests passed")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Test the incremental build cache: skipped writes, cached pages and the changes manifest"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.build_cache import BuildCache, inputs_digest
+
+
+def _build(tmp, files, pages=()):
+    """One build: write files {path: content}, store pages [(name, inputs, html)]."""
+    cache = BuildCache(Path(tmp) / 'dist', Path(tmp) / 'cache')
+    for path, content in files.items():
+        cache.write(path, content)
+    for name, inputs, html in pages:
+        cache.store_page(name, inputs, html, ['about'])
+    return cache, cache.finish(Path(tmp) / 'changes.json')
+
+
+def test_unchanged_files_are_not_rewritten():
+    """Only files with new content are written and listed as changed"""
+    with tempfile.TemporaryDirectory() as tmp:
+        dist = Path(tmp) / 'dist'
+        _, changes = _build(tmp, {'index.html': 'home', 'assets/a.css': 'a{}'})
+        assert changes == {'changed': ['assets/a.css', 'index.html'], 'deleted': [], 'unchanged': 0}
+        mtime = (dist / 'index.html').stat().st_mtime_ns
+
+        cache, changes = _build(tmp, {'index.html': 'home', 'assets/a.css': 'a{color:red}'})
+        assert (cache.written, cache.skipped) == (1, 1)
+        assert changes == {'changed': ['assets/a.css'], 'deleted': [], 'unchanged': 1}
+        assert (dist / 'index.html').stat().st_mtime_ns == mtime
+        assert json.loads((Path(tmp) / 'changes.json').read_text()) == changes
+
+        # A file changed behind the cache's back is written again
+        (dist / 'index.html').write_text('tampered')
+        cache, changes = _build(tmp, {'index.html': 'home', 'assets/a.css': 'a{color:red}'})
+        assert cache.written == 1 and (dist / 'index.html').read_text() == 'home'
+        assert changes['changed'] == []
+
+
+def test_stale_outputs_are_deleted():
+    """Files no longer produced are removed, compressed siblings go with their file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        dist = Path(tmp) / 'dist'
+        _build(tmp, {'index.html': 'home', 'search/terms-ab.json': '{}'})
+        (dist / 'index.html.gz').write_bytes(b'gz')
+        (dist / 'search/terms-ab.json.gz').write_bytes(b'gz')
+        _, changes = _build(tmp, {'index.html': 'home'})
+        assert changes == {'changed': ['index.html.gz'], 'deleted': ['search/terms-ab.json'], 'unchanged': 1}
+        assert sorted(p.name for p in dist.rglob('*')) == ['index.html', 'index.html.gz']
+
+
+def test_cached_pages():
+    """Pages are reused only while their inputs digest matches"""
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = inputs_digest('/about', {'about': 'abc'})
+        _build(tmp, {}, [('about.html', inputs, '<p>About</p>'), ('faq.html', 'x', '<p>FAQ</p>')])
+
+        cache = BuildCache(Path(tmp) / 'dist', Path(tmp) / 'cache')
+        assert cache.page_reads('about.html') == ['about']
+        assert cache.cached_page('about.html', inputs) == '<p>About</p>'
+        assert cache.cached_page('about.html', inputs_digest('/about', {'about': 'abd'})) is None
+        cache.finish()
+
+        # faq.html was not built, so it is forgotten
+        cache = BuildCache(Path(tmp) / 'dist', Path(tmp) / 'cache')
+        assert cache.cached_page('faq.html', 'x') is None
+        assert cache.cached_page('about.html', inputs) == '<p>About</p>'
+
+
+if __name__ == '__main__':
+    test_unchanged_files_are_not_rewritten()
+    test_stale_outputs_are_deleted()
+    test_cached_pages()
+    print("✅ Build cache tests passed")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Test the in-memory catalog index used by get_products_from_db"""
+
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from src.db import get_catalog_version, install_catalog_triggers
+from src.models import Category, Product
+from src.services.catalog import CatalogIndex, ProductCatalog
+
+
+def _product(id, category, sort_order=0, featured=False, active=True):
+    return SimpleNamespace(
+        id=id, name=f'Товар {id}', category_id=category, price=10.0 + id, image='',
+        rating=4.5, reviews=10, badge='', in_stock=True, description='',
+        featured=featured, active=active, sort_order=sort_order,
+    )
+
+
+def _category(id, sort_order=0, active=True):
+    return SimpleNamespace(
+        id=id, name=id, description='', icon='', color='', url=f'/products/{id}',
+        sort_order=sort_order, active=active,
+    )
+
+
+def _index():
+    products = [
+        _product(3, 'pens', sort_order=1, featured=True),
+        _product(1, 'pens', sort_order=2),
+        _product(2, 'paper', sort_order=1, featured=True, active=False),
+        _product(4, 'paper', sort_order=0),
+    ]
+    categories = [_category('paper', 2), _category('all', 0), _category('old', 1, active=False)]
+    return CatalogIndex(1, products, categories)
+
+
+def test_products_sorted_and_filtered():
+    """Lookups match the SQL query semantics, ordered by (sort_order, id)"""
+    index = _index()
+    ids = lambda rows: [p['id'] for p in rows]
+
+    assert ids(index.products()) == [4, 3, 1]
+    assert ids(index.products(active_only=False)) == [4, 2, 3, 1]
+    assert ids(index.products(category_id='pens')) == [3, 1]
+    assert ids(index.products(category_id='all')) == [4, 3, 1]
+    assert ids(index.products(featured_only=True)) == [3]
+    assert ids(index.products(featured_only=True, active_only=False)) == [2, 3]
+    assert ids(index.products(category_id='paper', featured_only=True, active_only=False)) == [2]
+    assert ids(index.products(limit=2)) == [4, 3]
+    assert index.products_by_id[2]['category'] == 'paper'
+
+
+def test_categories():
+    """Categories are sorted and 'all' is pre-checked"""
+    index = _index()
+    assert [c['id'] for c in index.categories()] == ['all', 'paper']
+    assert [c['id'] for c in index.categories(active_only=False)] == ['all', 'old', 'paper']
+    assert index.categories()[0]['checked'] is True
+
+
+def test_query_filters_sorts_and_paginates():
+    """Server-side grid queries filter, sort and paginate the active products"""
+    index = _index()
+    ids = lambda page: [p['id'] for p in page.items]
+
+    assert ids(index.query()) == [4, 3, 1]
+    assert ids(index.query(categories=['pens'])) == [3, 1]
+    assert ids(index.query(categories=['all', 'pens'])) == [4, 3, 1]
+    assert ids(index.query(price_min=12, price_max=13.5)) == [3]
+    assert ids(index.query(q='ТОВАР 4')) == [4]
+    assert ids(index.query(sort='price-desc')) == [4, 3, 1]
+    assert ids(index.query(sort='price-asc')) == [1, 3, 4]
+    assert ids(index.query(sort='unknown')) == [4, 3, 1]
+    assert index.price_range == (11.0, 14.0)
+
+    page = index.query(sort='price-asc', page=2, page_size=2)
+    assert ids(page) == [4] and page.total == 3 and page.pages == 2
+    # Out-of-range pages are clamped; an empty result still has page 1
+    assert index.query(page=9, page_size=2).page == 2
+    empty = index.query(q='нет такого')
+    assert empty.items == [] and empty.total == 0 and empty.pages == 1
+
+
+def test_reload_on_version_change():
+    """The index is rebuilt only when the catalog version changes"""
+    version = {'v': 1}
+    catalog = ProductCatalog(version_func=lambda: version['v'], check_interval=0)
+    catalog._load = lambda v: CatalogIndex(v, [], [])
+
+    first = catalog.index
+    assert catalog.index is first
+    version['v'] = 2
+    assert catalog.index is not first and catalog.version == 2
+
+
+def test_reload_on_in_place_edits():
+    """Editing a product or category in place, via the ORM or raw SQL, reloads the index"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    install_catalog_triggers(engine)
+    with Session(engine) as session:
+        session.add(Category(id='pens', name='Ручки', url='/products/pens'))
+        session.add(Product(id=1, name='Ручка', category_id='pens', price=10.0, image=''))
+        session.commit()
+
+    def load(version):
+        with Session(engine) as session:
+            return CatalogIndex(version, session.exec(select(Product)).all(), session.exec(select(Category)).all())
+
+    catalog = ProductCatalog(version_func=lambda: get_catalog_version(engine), check_interval=0)
+    catalog._load = load
+    assert catalog.index.products_by_id[1]['price'] == 10.0
+
+    # The "Update Products" recipe: change fields and commit, updated_at untouched
+    with Session(engine) as session:
+        product = session.get(Product, 1)
+        product.price = 7.5
+        session.commit()
+    assert catalog.index.products_by_id[1]['price'] == 7.5
+
+    # Raw SQL: the trigger bumps updated_at (it has millisecond resolution)
+    time.sleep(0.002)
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE products SET in_stock = 0 WHERE id = 1"))
+    assert catalog.index.products_by_id[1]['in_stock'] is False
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE categories SET name = 'Перья' WHERE id = 'pens'"))
+    assert catalog.index.categories_by_id['pens']['name'] == 'Перья'
+
+
+if __name__ == '__main__':
+    test_products_sorted_and_filtered()
+    test_categories()
+    test_query_filters_sorts_and_paginates()
+    test_reload_on_version_change()
+    test_reload_on_in_place_edits()
+    print("✅ Catalog tests passed")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Test category and product page components"""
+
+import json
+import re
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fasthtml.common import fast_app, to_xml
+from starlette.testclient import TestClient
+
+import build_static
+from src.pages.catalog import api
+from src.components.products.catalog_pages import create_category_page, create_product_detail
+from src.components.products.products_page import category_urls, create_product_card, product_url
+from src.pages.products_services import view as products_view
+from src.routes.products_services import register_products_services_route
+from src.routes.static_export import is_exported
+from src.services.catalog import ProductPage
+
+
+CATEGORIES = [
+    {'id': 'all', 'name': 'Все товары', 'url': '/products-and-services'},
+    {'id': 'pens', 'name': 'Ручки', 'description': 'Для письма', 'url': '/products/pens'},
+    {'id': 'paper', 'name': 'Бумага', 'description': '', 'url': ''},
+]
+
+
+def _product(id, category='pens', in_stock=True):
+    return {
+        'id': id, 'name': f'Товар {id}', 'category': category, 'price': 10.0 + id, 'image': '',
+        'rating': 4.5, 'reviews': 10, 'badge': '', 'in_stock': in_stock, 'description': f'Описание {id}',
+    }
+
+
+def test_product_urls():
+    """Products link below their category's page, if it has one"""
+    urls = category_urls(CATEGORIES)
+    assert urls == {'pens': '/products/pens'}
+    assert product_url(_product(3), urls) == '/products/pens/3'
+    assert product_url(_product(4, 'paper'), urls) is None
+
+    assert '<a href="/products/pens/3">Товар 3</a>' in to_xml(create_product_card(_product(3), url='/products/pens/3'))
+    assert '<h3 class="product-name">Товар 4</h3>' in to_xml(create_product_card(_product(4, 'paper')))
+
+
+def test_category_page():
+    """A category page holds its cards and links, but no filters or scripts"""
+    html = to_xml(create_category_page({}, CATEGORIES[1], [_product(1), _product(2)], CATEGORIES))
+    assert html.count('class="product-card"') == 2
+    assert 'href="/products/pens/1"' in html and 'href="/products/pens/2"' in html
+    assert 'data-products-url="/products/pens.json"' in html
+    assert 'aria-current="page" class="category-link active"' in html
+    assert 'href="/products/paper"' not in html
+    assert 'filters-sidebar' not in html and '<script' not in html
+
+    empty = to_xml(create_category_page({}, CATEGORIES[1], [], CATEGORIES))
+    assert 'no-results-message' in empty
+
+
+def test_product_detail():
+    """A product page shows the product, its stock and related products"""
+    html = to_xml(create_product_detail({}, _product(1, in_stock=False), CATEGORIES[1], [_product(2)]))
+    assert '<h1 class="product-detail-title">Товар 1</h1>' in html
+    assert 'Описание 1' in html and '$11.00' in html
+    assert 'stock-status out-of-stock' in html and 'disabled' in html
+    assert 'href="/products/pens"' in html
+    assert html.count('class="product-card"') == 1 and 'href="/products/pens/2"' in html
+
+    alone = to_xml(create_product_detail({}, _product(1), CATEGORIES[1]))
+    assert 'stock-status in-stock' in alone and 'related-products' not in alone
+
+
+def test_static_filenames():
+    """Pages get .html files; paths with an extension keep their name"""
+    assert build_static.page_filename('/') == 'index.html'
+    assert build_static.page_filename('/products/pens') == 'products/pens.html'
+    assert build_static.page_filename('/products/pens/3') == 'products/pens/3.html'
+    assert build_static.page_filename('/products/pens.json') == 'products/pens.json'
+
+
+def _catalog_files(products):
+    """catalog_files() over a stand-in catalog"""
+    originals = api.get_categories_from_db, api.get_products_from_db, api.get_catalog
+    api.get_categories_from_db = lambda: CATEGORIES
+    api.get_products_from_db = lambda: products
+    api.get_catalog = lambda: SimpleNamespace(index=SimpleNamespace(price_range=(11.0, 14.0), version=1))
+    try:
+        return {name: json.loads(body) for name, body in api.catalog_files().items()}
+    finally:
+        api.get_categories_from_db, api.get_products_from_db, api.get_catalog = originals
+
+
+def test_catalog_api():
+    """The catalog is split into an index, category shards and a search index"""
+    pen = {**_product(1), 'name': 'Ручка гелевая', 'badge': 'Новинка'}
+    products = [pen, _product(3, 'paper'), _product(2)]
+    files = _catalog_files(products)
+
+    index = files.pop(api.INDEX_NAME)
+    assert index['total'] == 3 and index['price_range'] == [11.0, 14.0]
+    assert [(c['id'], c['ids']) for c in index['categories']] == [('pens', [1, 2]), ('paper', [3])]
+    shards = {c['id']: c['shard'] for c in index['categories']}
+    assert sorted(f'{api.CATALOG_URL}{name}.json' for name in files) == sorted([*shards.values(), index['search']])
+    assert shards['pens'].startswith('/catalog/products-pens.')
+
+    pens = files[shards['pens'][len(api.CATALOG_URL):-len('.json')]]
+    assert [(p['id'], p['rank'], p['url']) for p in pens] == [(1, 0, '/products/pens/1'), (2, 2, '/products/pens/2')]
+    assert pens[0]['badge_class'] == 'badge-new' and 'description' not in pens[0]
+
+    search = files[index['search'][len(api.CATALOG_URL):-len('.json')]]
+    assert search['ручк'] == [1] and search['описан'] == [1, 3, 2]
+
+    # Shard names change with their content only
+    changed = _catalog_files([pen, _product(3, 'paper'), {**_product(2), 'price': 99.0}])[api.INDEX_NAME]
+    assert [c['shard'] for c in changed['categories']] != [c['shard'] for c in index['categories']]
+    assert changed['categories'][1]['shard'] == shards['paper'] and changed['search'] == index['search']
+    assert api.INDEX_URL == f'{api.CATALOG_URL}{api.INDEX_NAME}.json'
+
+
+def test_exported_products_page():
+    """The exported products page is marked static and pages through plain page URLs"""
+    app, rt = fast_app(live=False)
+    register_products_services_route(rt)
+    originals = products_view._page_data, products_view._query, products_view.get_product_price_range
+    products_view._page_data = lambda: {'categories': CATEGORIES}
+    products_view._query = lambda data, filters: ProductPage([_product(1), _product(2)], 5, filters['page'], 2)
+    products_view.get_product_price_range = lambda: (11.0, 15.0)
+    try:
+        build_static._app = app
+        _, status, html, _, _ = build_static.render_page('/products-and-services', 'products-and-services.html')
+        served = TestClient(app).get('/products-and-services').text
+    finally:
+        products_view._page_data, products_view._query, products_view.get_product_price_range = originals
+
+    assert status == 200 and 'data-static="true"' in html
+    assert 'data-static' not in served
+    # product-filters.js takes page links over from HTMX: their grid URL is not exported
+    links = re.findall(r'<a href="([^"]+)" hx-get="([^"]+)"[^>]*class="pagination-link', html)
+    assert links[1] == ('/products-and-services?page=2', '/products-and-services/grid?page=2')
+    assert is_exported('/products-and-services') and not is_exported('/products-and-services/grid')
+    assert 'data-query=""' in html
+
+
+if __name__ == '__main__':
+    test_product_urls()
+    test_category_page()
+    test_product_detail()
+    test_static_filenames()
+    test_catalog_api()
+    test_exported_products_page()
+    print("✅ Catalog page tests passed")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Test Accept-Encoding negotiation, pre-compressed siblings and encoded asset responses"""
+
+import gzip
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.assets import AssetManifest
+from src.services.compression import fresh_sibling, negotiate, precompress, precompress_tree, sibling
+
+CSS = 'body { color: red; margin: 0 auto; }\n' * 100
+
+
+def _write(path, text, mtime):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+
+def test_negotiate():
+    """The preferred accepted coding wins; q=0 and identity preferences are honoured"""
+    both = ('br', 'gzip')
+    assert negotiate('gzip, deflate, br', both) == 'br'
+    assert negotiate('gzip, deflate, br', ('gzip',)) == 'gzip'
+    assert negotiate('br;q=0.5, gzip', both) == 'gzip'
+    assert negotiate('br;q=0, gzip;q=0', both) is None
+    assert negotiate('identity', both) is None
+    assert negotiate('', both) is None
+    assert negotiate(None, both) is None
+    assert negotiate('*', both) == 'br'
+    assert negotiate('gzip;q=0.5, identity', both) is None
+    assert negotiate('gzip', ()) is None
+
+
+def test_precompress_siblings():
+    """Siblings are written once, rewritten when stale, and skipped for tiny files"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write(root / 'styles/main.css', CSS, 1_000_000)
+        _write(root / 'scripts/tiny.js', 'x=1', 1_000_000)
+        _write(root / 'images/logo.png', CSS, 1_000_000)
+
+        stats = precompress_tree(root, ['gzip'])
+        assert stats['files'] == 2 and stats['written'] == 1
+        css = root / 'styles/main.css'
+        assert gzip.decompress(sibling(css, 'gzip').read_bytes()).decode() == CSS
+        assert stats['saved']['gzip'] == len(CSS) - sibling(css, 'gzip').stat().st_size
+        assert not sibling(root / 'scripts/tiny.js', 'gzip').exists()
+        assert not sibling(root / 'images/logo.png', 'gzip').exists()
+
+        assert precompress(css, ['gzip']) == []
+
+        # Edited after compression: the sibling is stale until rewritten
+        os.utime(sibling(css, 'gzip'), (1_500_000, 1_500_000))
+        _write(css, CSS + 'p {}\n', 2_000_000)
+        assert fresh_sibling(css, 'gzip') is None
+        assert precompress(css, ['gzip']) == [sibling(css, 'gzip')]
+        assert gzip.decompress(fresh_sibling(css, 'gzip').read_bytes()).decode() == CSS + 'p {}\n'
+
+
+def test_bodies_in_memory():
+    """Encoded bodies come from fresh siblings or are compressed once, then from memory"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write(root / 'styles/main.css', CSS, 1_000_000)
+        _write(root / 'images/logo.png', CSS, 1_000_000)
+        manifest = AssetManifest(root, check_interval=0)
+
+        css = manifest.get('styles/main.css')
+        assert 'gzip' in manifest.encodings(css)
+        assert manifest.encodings(manifest.get('images/logo.png')) == ()
+
+        body = manifest.body(css, 'gzip')
+        assert gzip.decompress(body).decode() == CSS
+        assert manifest.body(css, 'gzip') is body
+        assert manifest.body(css) == CSS.encode()
+        assert manifest.stats()['body_hits'] == 1 and manifest.stats()['body_misses'] == 2
+
+        # Siblings are never assets of their own
+        precompress(root / 'styles/main.css', ['gzip'])
+        assert manifest.get('styles/main.css.gz') is None
+
+        # Over budget: least recently used bodies are dropped
+        small = AssetManifest(root, check_interval=0, memory_bytes=len(CSS))
+        small.body(css)
+        small.body(css, 'gzip')
+        assert small.stats()['bodies'] == 1
+
+
+def test_route_encodings():
+    """The assets route negotiates the coding and varies ETag and headers by it"""
+    from fasthtml.common import fast_app
+    from starlette.testclient import TestClient
+    from src.routes.static_files import register_static_route
+
+    app, rt = fast_app()
+    register_static_route(rt)
+    client = TestClient(app)
+
+    plain = client.get('/assets/styles/main.css', headers={'Accept-Encoding': 'identity'})
+    assert plain.status_code == 200
+    assert 'content-encoding' not in plain.headers
+    assert plain.headers['vary'] == 'Accept-Encoding'
+
+    gzipped = client.get('/assets/styles/main.css', headers={'Accept-Encoding': 'gzip'})
+    assert gzipped.headers['content-encoding'] == 'gzip'
+    assert gzipped.headers['vary'] == 'Accept-Encoding'
+    assert gzipped.content == plain.content  # decoded by the client
+    assert int(gzipped.headers['content-length']) < len(plain.content)
+    assert gzipped.headers['etag'] != plain.headers['etag']
+
+    # Validators are per coding
+    revalidate = {'Accept-Encoding': 'gzip', 'If-None-Match': gzipped.headers['etag']}
+    assert client.get('/assets/styles/main.css', headers=revalidate).status_code == 304
+    revalidate['Accept-Encoding'] = 'identity'
+    assert client.get('/assets/styles/main.css', headers=revalidate).status_code == 200
+
+    # Already-compressed formats are sent as they are
+    image = client.get('/assets/images/logo.png', headers={'Accept-Encoding': 'gzip'})
+    assert 'content-encoding' not in image.headers and 'vary' not in image.headers
+
+
+if __name__ == '__main__':
+    test_negotiate()
+    test_precompress_siblings()
+    test_bodies_in_memory()
+    test_route_encodings()
+    print("✅ Compression tests passed")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Test the response compression middleware: negotiation, body-hash cache, ETags and pass-through"""
+
+import gzip
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from starlette.applications import Starlette
+from starlette.responses import HTMLResponse, JSONResponse, Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.middleware import PageCache, PageCacheMiddleware
+from src.middleware.compression import CompressionCache, CompressionMiddleware, is_compressible_type
+
+PAGE = '<html><body>' + '<div class="product-card">Печать</div>' * 200 + '</body></html>'
+
+
+def _client(cache, renders=None):
+    renders = renders if renders is not None else []
+
+    def page(request):
+        renders.append(request.url.path)
+        return HTMLResponse(PAGE)
+
+    routes = [
+        Route('/', page),
+        Route('/tiny', lambda request: HTMLResponse('<p>hi</p>')),
+        Route('/api', lambda request: JSONResponse({'items': ['печать'] * 200})),
+        Route('/image', lambda request: Response(b'\x89PNG' * 500, media_type='image/png')),
+        Route('/assets/main.css', lambda request: Response(
+            gzip.compress(PAGE.encode()), media_type='text/css',
+            headers={'Content-Encoding': 'gzip', 'ETag': '"asset-gzip"'},
+        )),
+    ]
+    inner = PageCacheMiddleware(Starlette(routes=routes), PageCache(version_func=lambda: 1))
+    return TestClient(CompressionMiddleware(inner, cache))
+
+
+def test_content_types():
+    assert is_compressible_type(b'text/html; charset=utf-8')
+    assert is_compressible_type(b'application/json')
+    assert not is_compressible_type(b'image/png')
+    assert not is_compressible_type(b'text/event-stream')
+
+
+def test_negotiation_and_cache():
+    """Pages are gzipped per Accept-Encoding and compressed once per distinct body"""
+    cache = CompressionCache(min_size=256)
+    client = _client(cache)
+
+    plain = client.get('/', headers={'Accept-Encoding': 'identity'})
+    assert 'content-encoding' not in plain.headers and plain.text == PAGE
+    assert 'Accept-Encoding' in plain.headers['vary']
+
+    for _ in range(3):
+        response = client.get('/', headers={'Accept-Encoding': 'gzip, deflate'})
+        assert response.headers['content-encoding'] == 'gzip'
+        assert response.text == PAGE  # decoded by the client
+        assert int(response.headers['content-length']) < len(PAGE.encode()) / 5
+    assert cache.misses == 1 and cache.hits == 2
+
+    json_response = client.get('/api', headers={'Accept-Encoding': 'gzip'})
+    assert json_response.headers['content-encoding'] == 'gzip' and json_response.json()['items'][0] == 'печать'
+
+    stats = cache.stats()
+    assert stats['compressed'] == 4 and 0 < stats['ratio'] < 0.2 and stats['cpu_seconds'] >= 0
+
+
+def test_skipped_responses():
+    """Small bodies, binary types and already-encoded responses are left alone"""
+    cache = CompressionCache(min_size=256)
+    client = _client(cache)
+
+    tiny = client.get('/tiny', headers={'Accept-Encoding': 'gzip'})
+    assert 'content-encoding' not in tiny.headers and tiny.text == '<p>hi</p>'
+    assert cache.stats()['skipped'] == 1
+
+    image = client.get('/image', headers={'Accept-Encoding': 'gzip'})
+    assert 'content-encoding' not in image.headers and 'vary' not in image.headers
+
+    encoded = client.get('/assets/main.css', headers={'Accept-Encoding': 'gzip'})
+    assert encoded.headers['etag'] == '"asset-gzip"' and encoded.text == PAGE
+    assert cache.stats()['compressed'] == 0
+
+
+def test_conditional_requests():
+    """The encoded ETag revalidates to a 304 through the page cache without rendering"""
+    renders = []
+    client = _client(CompressionCache(), renders)
+
+    plain = client.get('/', headers={'Accept-Encoding': 'identity'})
+    gzipped = client.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert gzipped.headers['etag'] == plain.headers['etag'][:-1] + '-gzip"'
+
+    revalidated = client.get('/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzipped.headers['etag']})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['etag'] == gzipped.headers['etag']
+    assert 'Accept-Encoding' in revalidated.headers['vary']
+
+    identity = client.get('/', headers={'Accept-Encoding': 'identity', 'If-None-Match': plain.headers['etag']})
+    assert identity.status_code == 304 and identity.headers['etag'] == plain.headers['etag']
+    assert renders == ['/']
+
+
+def test_head_matches_get():
+    """HEAD is negotiated like GET: same encoding, Vary, ETag and length, no body"""
+    client = _client(CompressionCache(min_size=256))
+    for accept in ('gzip', 'identity'):
+        get = client.get('/', headers={'Accept-Encoding': accept})
+        head = client.head('/', headers={'Accept-Encoding': accept})
+        assert head.status_code == 200 and head.content == b''
+        for name in ('content-encoding', 'vary', 'etag', 'content-length'):
+            assert head.headers.get(name) == get.headers.get(name), (accept, name)
+
+
+def test_large_bodies_off_the_event_loop():
+    """Missed bodies above the thread threshold are compressed in a worker thread"""
+    cache = CompressionCache(min_size=256, thread_min_size=4096)
+    client = _client(cache)
+
+    client.get('/', headers={'Accept-Encoding': 'gzip'})
+    client.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert cache.stats()['threaded'] == 1 and cache.hits == 1
+
+    client.get('/api', headers={'Accept-Encoding': 'gzip'})
+    assert cache.stats()['threaded'] == 1 and cache.misses == 2
+
+
+if __name__ == '__main__':
+    test_content_types()
+    test_negotiation_and_cache()
+    test_skipped_responses()
+    test_conditional_requests()
+    test_head_matches_get()
+    test_large_bodies_off_the_event_loop()
+    print("✅ Compression middleware tests passed")
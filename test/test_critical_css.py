@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Test the CSS parser, selector matching, purge names and per-page critical CSS inlining"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fasthtml.common import Body, Div, Head, Header, Html, Link, Main, NotStr, Span, Title, to_xml
+from starlette.applications import Starlette
+from starlette.responses import HTMLResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.middleware import CriticalCssMiddleware
+from src.services.assets import AssetManifest
+from src.services.critical_css import CriticalCss, fold_html
+from src.services.css import (
+    PageTokens, allowlisted_tokens, filter_rules, html_tokens, parse_stylesheet,
+    script_tokens, selector_matches, serialize,
+)
+
+CSS = """
+/* Variables */
+:root { --primary: #080aa6; }
+* { margin: 0; }
+body { color: red; }
+.header-content { display: flex; }
+.hero, .products-layout { padding: 1rem; }
+.product-card:hover > .star-icon { fill: gold; }
+#faq-item-0 .accordion-body { display: none; }
+input[type="search"] { border: 0; }
+.site-search-form:not(.hidden) { display: block; }
+@media (min-width: 640px) {
+    .hero { padding: 2rem; }
+    .error-404-page { margin: 0; }
+}
+@keyframes fadeIn { from { opacity: 0; } to { opacity: 1; } }
+@keyframes unused { from { opacity: 0; } }
+.hero-title { animation: fadeIn 0.3s ease; }
+"""
+
+
+def test_parse_and_serialize():
+    """Rules, selector lists and nested @media blocks survive a round trip"""
+    rules = parse_stylesheet(CSS)
+    assert rules[0].selectors == (':root',)
+    assert rules[4].selectors == ('.hero', '.products-layout')
+    media = next(rule for rule in rules if rule.at.startswith('@media'))
+    assert media.is_grouping and [child.selectors for child in media.children] == [('.hero',), ('.error-404-page',)]
+    assert serialize(parse_stylesheet(serialize(rules))) == serialize(rules)
+    assert rules[4].line == 7 and media.children[1].line == 14
+    assert 'Variables' not in serialize(rules)
+
+
+def test_selector_matching():
+    """Every required class, id, tag and attribute must occur on the page"""
+    tokens = html_tokens('<div class="product-card"><svg class="star-icon"></svg><input type="search"></div>')
+    assert selector_matches('.product-card:hover > .star-icon', tokens)
+    assert selector_matches('input[type="search"]', tokens)
+    assert selector_matches(':root', tokens) and selector_matches('*', tokens)
+    assert selector_matches('div:not(.missing)', tokens)
+    assert not selector_matches('.product-card .missing', tokens)
+    assert not selector_matches('#faq-item-0', tokens)
+    assert not selector_matches('section.product-card', tokens)
+
+
+def test_filter_rules():
+    """Unused rules, empty @media blocks and unreferenced @keyframes are dropped"""
+    tokens = PageTokens.of(tags=['html', 'body', 'h1'], classes=['hero', 'hero-title'])
+    removed = []
+    css = serialize(filter_rules(parse_stylesheet(CSS), tokens, removed))
+    assert '.hero{padding: 1rem;}' in css and '.products-layout' not in css
+    assert '@media (min-width: 640px){.hero{padding: 2rem;}}' in css
+    assert '@keyframes fadeIn' in css and '@keyframes unused' not in css
+    assert ':root' in css and 'body{' in css
+    assert '.error-404-page' not in css and '.accordion-body' not in css
+    assert any(context.startswith('@media') and rule.selectors == ('.error-404-page',) for context, rule in removed)
+    assert any(rule.selectors == ('.products-layout',) for _, rule in removed)
+
+
+def test_purge_names():
+    """Names used by scripts and allowlisted patterns keep their rules"""
+    html = (
+        '<div id="faq-item-0" onclick="this.classList.add(\'products-layout\')"></div>'
+        '<script>document.body.classList.toggle("hero-title")</script>'
+    )
+    assert 'products-layout' not in html_tokens(html).classes
+    tokens = html_tokens(html, scripts=True)
+    assert {'products-layout', 'hero-title'} <= tokens.classes
+
+    tokens |= script_tokens("container.innerHTML = '<div class=\"accordion-body\">';")
+    rules = parse_stylesheet(CSS)
+    tokens |= allowlisted_tokens(rules, ['error-*'])
+    assert 'error-404-page' in tokens.classes and 'error-*' not in tokens.classes
+
+    removed = []
+    css = serialize(filter_rules(rules, tokens, removed))
+    for name in ('.products-layout', '#faq-item-0 .accordion-body', '.error-404-page', '@keyframes fadeIn'):
+        assert name in css
+    assert {rule.line for _, rule in removed} == {6, 7, 8, 10, 11, 13, 17}
+
+
+def _page(manifest, *body):
+    return to_xml(Html(
+        Head(Title('Бюрократ'), Link(rel='stylesheet', href=manifest.url('/assets/styles/main.css'))),
+        Body(*body),
+    ))
+
+
+def _critical_css(root):
+    (root / 'styles').mkdir()
+    css_file = root / 'styles/main.css'
+    css_file.write_text(CSS, encoding='utf-8')
+    os.utime(css_file, (1_000_000, 1_000_000))
+    return css_file, CriticalCss(AssetManifest(root, check_interval=0))
+
+
+def test_fold_html():
+    """Only elements above the fold count; raw SVG markup is parsed too"""
+    page = to_xml(Html(Head(Title('x')), Body(
+        Header(Div(NotStr('<svg class="star-icon"><use href="#star"></use></svg>'), cls='header-content')),
+        Main(Div(cls='hero'), *[Span(cls=f'item-{i}') for i in range(10)], Div(cls='footer-links')),
+    )))
+    tokens = html_tokens(fold_html(page, fold=9))
+    assert {'header-content', 'star-icon', 'hero', 'item-0'} <= tokens.classes
+    assert 'footer-links' not in tokens.classes and 'title' not in tokens.tags
+    assert 'footer-links' in html_tokens(fold_html(page, fold=None)).classes
+
+
+def test_inline():
+    """The stylesheet link is replaced by the critical rules and a non-blocking load"""
+    with tempfile.TemporaryDirectory() as tmp:
+        _, critical = _critical_css(Path(tmp))
+        html = _page(critical.manifest, Header(Div(cls='header-content')), Main(Div(cls='hero')))
+
+        inlined = critical.inline(html)
+        css = inlined[inlined.index('<style>'):inlined.index('</style>')]
+        assert '.header-content' in css and '.products-layout' not in css
+        assert 'rel="preload"' in inlined and 'as="style"' in inlined and '<noscript>' in inlined
+        assert inlined.count('rel="stylesheet"') == 1
+
+        fragment = to_xml(Div(cls='hero'))
+        assert critical.inline(fragment) is fragment
+
+        critical.enabled = False
+        assert critical.inline(html) is html
+
+
+def test_cached_extraction():
+    """Extraction is cached per page and per set of names, and redone when main.css changes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        css_file, critical = _critical_css(Path(tmp))
+        html = _page(critical.manifest, Header(Div(cls='header-content')), Main(Div(cls='hero')))
+
+        css = critical.for_html(html, '/')
+        assert critical.for_html(html, '/') is css and critical.page_hits == 1 and critical.misses == 1
+        assert critical.for_html(html, '/about') is css and critical.hits == 1
+
+        changed = _page(critical.manifest, Header(Div(cls='header-content')), Main(Div(cls='products-layout')))
+        assert '.products-layout' in critical.for_html(changed, '/') and critical.misses == 2
+
+        css_file.write_text(CSS + '.hero { color: blue; }\n', encoding='utf-8')
+        os.utime(css_file, (2_000_000, 2_000_000))
+        assert 'color: blue' in critical.for_html(html, '/about')
+        assert critical.stats()['pages'] == 1
+
+
+def test_middleware():
+    """Served pages get their critical CSS; fragments and other responses pass through"""
+    with tempfile.TemporaryDirectory() as tmp:
+        _, critical = _critical_css(Path(tmp))
+        html = _page(critical.manifest, Header(Div(cls='header-content')), Main(Div(cls='hero')))
+        routes = [
+            Route('/', lambda request: HTMLResponse(html)),
+            Route('/fragment', lambda request: HTMLResponse('<div class="hero"></div>')),
+            Route('/missing', lambda request: HTMLResponse(html, status_code=404)),
+        ]
+        client = TestClient(CriticalCssMiddleware(Starlette(routes=routes), critical))
+
+        for _ in range(2):
+            response = client.get('/')
+            assert '<style>' in response.text and 'rel="preload"' in response.text
+            assert int(response.headers['content-length']) == len(response.content)
+        assert critical.page_hits == 1
+
+        assert client.get('/fragment').text == '<div class="hero"></div>'
+        assert '<style>' not in client.get('/missing').text
+
+
+if __name__ == '__main__':
+    test_parse_and_serialize()
+    test_selector_matching()
+    test_filter_rules()
+    test_purge_names()
+    test_fold_html()
+    test_inline()
+    test_cached_extraction()
+    test_middleware()
+    print("✅ Critical CSS tests passed")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Test the versioned DataStore (lazy loading, hot reload, failed reloads) and the compiled data bundle"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.data_store import DataStore
+from src.config.data_bundle import DataBundle, compile_bundle
+from src.config.reads import recording_reads
+
+
+def _write(path, text, mtime):
+    path.write_text(text, encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+
+def test_reload_bumps_version():
+    """Changed files are reloaded into a new snapshot with a higher version"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _write(tmp / 'faq.yaml', 'title: Старый\n', 1_000_000)
+        _write(tmp / 'hero.yaml', 'title: Герой\n', 1_000_000)
+        store = DataStore(tmp, files={'faq': 'faq.yaml', 'hero': 'hero.yaml'}, check_interval=0)
+
+        assert store.get('faq') == {'title': 'Старый'}
+        assert store.version == 0
+        hero = store.get('hero')
+
+        _write(tmp / 'faq.yaml', 'title: Новый\n', 2_000_000)
+        assert store.get('faq') == {'title': 'Новый'}
+        assert store.version == 1
+        # Unchanged files keep their parsed objects
+        assert store.get('hero') is hero
+
+        assert store.refresh() is False
+        assert store.version == 1
+
+
+def test_broken_file_keeps_last_version():
+    """A file that fails to parse does not replace the loaded data"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _write(tmp / 'faq.yaml', 'title: Старый\n', 1_000_000)
+        store = DataStore(tmp, files={'faq': 'faq.yaml'}, check_interval=0)
+        store.get('faq')
+
+        _write(tmp / 'faq.yaml', 'title: [не закрыто\n', 2_000_000)
+        assert store.get('faq') == {'title': 'Старый'}
+        assert store.version == 0
+
+
+def test_hot_reload_disabled():
+    """With hot reload off, files are read once"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _write(tmp / 'faq.yaml', 'title: Старый\n', 1_000_000)
+        store = DataStore(tmp, files={'faq': 'faq.yaml'}, hot_reload=False)
+        store.get('faq')
+        _write(tmp / 'faq.yaml', 'title: Новый\n', 2_000_000)
+        assert store.get('faq') == {'title': 'Старый'}
+
+
+def test_bundle_matches_content_hash():
+    """The bundle is used only while a file's content matches what was compiled"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _write(tmp / 'faq.yaml', 'title: Старый\n', 1_000_000)
+        bundle = DataBundle(compile_bundle(tmp))
+
+        found, data = bundle.lookup('faq.yaml', (tmp / 'faq.yaml').read_bytes())
+        assert found and data == {'title': 'Старый'}
+
+        found, _ = bundle.lookup('faq.yaml', 'title: Новый\n'.encode('utf-8'))
+        assert not found
+        found, _ = bundle.lookup('hero.yaml', b'')
+        assert not found
+
+
+def test_reads_recorded_only_when_asked():
+    """Reads are collected inside recording_reads(), across tasks and worker threads, and nowhere else"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _write(tmp / 'faq.yaml', 'title: Вопросы\n', 1_000_000)
+        _write(tmp / 'hero.yaml', 'title: Герой\n', 1_000_000)
+        store = DataStore(tmp, files={'faq': 'faq.yaml', 'hero': 'hero.yaml'}, check_interval=0)
+
+        store.get('hero')
+        assert not hasattr(store, 'reads')
+
+        async def render():
+            store.version
+            await asyncio.to_thread(store.get, 'faq')
+
+        with recording_reads() as reads:
+            asyncio.run(render())
+        assert reads == {'*', 'faq'}
+
+        store.get('hero')
+        assert reads == {'*', 'faq'}
+
+
+if __name__ == '__main__':
+    test_reload_bumps_version()
+    test_broken_file_keeps_last_version()
+    test_hot_reload_disabled()
+    test_bundle_matches_content_hash()
+    test_reads_recorded_only_when_asked()
+    print("✅ Data store tests passed")
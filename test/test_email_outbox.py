@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Test the contact email outbox: retries with backoff, failure after max attempts, SMTP delivery"""
+
+import socket
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from src.models import ContactSubmission, EmailOutbox
+from src.services.email_outbox import OutboxDispatcher
+
+
+class FakeEmailService:
+    """Fails the first `failures` sends, then succeeds"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.sent = []
+
+    def send_contact_form_email(self, form_data):
+        if self.failures > 0:
+            self.failures -= 1
+            return False, "SMTP error occurred: relay busy"
+        self.sent.append(form_data)
+        return True, "Email sent successfully"
+
+
+def _engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def _submit(engine):
+    with Session(engine) as session:
+        submission = ContactSubmission(name="Иван", email="ivan@example.com", message="Нужна печать")
+        session.add(submission)
+        session.flush()
+        OutboxDispatcher.enqueue(session, submission)
+        session.commit()
+        return submission.id
+
+
+def test_retry_then_send():
+    """A failed send is retried after the backoff and then marks the submission as sent"""
+    engine = _engine()
+    service = FakeEmailService(failures=1)
+    dispatcher = OutboxDispatcher(engine=engine, email_service=service, backoff_base=60)
+    submission_id = _submit(engine)
+
+    assert dispatcher.dispatch_due() == 1
+    # Not due again until the backoff has passed
+    assert dispatcher.dispatch_due() == 0
+    assert dispatcher.dispatch_due(now=datetime.utcnow() + timedelta(seconds=61)) == 1
+
+    with Session(engine) as session:
+        submission = session.get(ContactSubmission, submission_id)
+        assert submission.email_sent and submission.email_error is None
+    assert len(service.sent) == 1 and service.sent[0]['name'] == "Иван"
+
+
+def test_fails_after_max_attempts():
+    """After max attempts the error is recorded on the submission"""
+    engine = _engine()
+    dispatcher = OutboxDispatcher(engine=engine, email_service=FakeEmailService(failures=10), max_attempts=2, backoff_base=0)
+    submission_id = _submit(engine)
+
+    dispatcher.dispatch_due()
+    dispatcher.dispatch_due(now=datetime.utcnow() + timedelta(seconds=1))
+
+    with Session(engine) as session:
+        submission = session.get(ContactSubmission, submission_id)
+        assert not submission.email_sent
+        assert "relay busy" in submission.email_error
+        item = session.get(EmailOutbox, 1)
+        assert item.status == 'failed' and item.attempts == 2
+
+
+def test_smtp_delivery():
+    """End-to-end delivery through EmailService to a local aiosmtpd server"""
+    try:
+        from aiosmtpd.controller import Controller
+        from aiosmtpd.smtp import AuthResult
+    except ImportError:
+        print("⚠️  aiosmtpd not installed, skipping SMTP delivery test")
+        return
+
+    from src.services.email_service import EmailService
+
+    class Handler:
+        def __init__(self):
+            self.messages = []
+
+        async def handle_DATA(self, server, session, envelope):
+            self.messages.append(envelope)
+            return '250 OK'
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    handler = Handler()
+    controller = Controller(
+        handler, hostname='127.0.0.1', port=port,
+        authenticator=lambda *args: AuthResult(success=True),
+        auth_require_tls=False,
+    )
+    controller.start()
+    try:
+        service = EmailService()
+        service.smtp_host, service.smtp_port = '127.0.0.1', port
+        service.security = 'none'
+        service.smtp_username, service.smtp_password = 'form', 'secret'
+        service.from_email, service.to_email = 'form@burokrat.site', 'office@burokrat.site'
+
+        engine = _engine()
+        dispatcher = OutboxDispatcher(engine=engine, email_service=service)
+        submission_id = _submit(engine)
+        dispatcher.dispatch_due()
+
+        assert len(handler.messages) == 1
+        assert handler.messages[0].rcpt_tos == ['office@burokrat.site']
+        with Session(engine) as session:
+            assert session.get(ContactSubmission, submission_id).email_sent
+    finally:
+        controller.stop()
+
+
+if __name__ == '__main__':
+    test_retry_then_send()
+    test_fails_after_max_attempts()
+    test_smtp_delivery()
+    print("✅ Email outbox tests passed")
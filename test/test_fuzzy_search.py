@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Test trigram typo-tolerant search: misspellings, document types, pre-filter and scaling
+
+Run directly to also print the 1k / 10k / 100k products benchmark.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.catalog import CatalogIndex
+from src.services.fuzzy_search import FuzzySearch, TrigramIndex, site_documents, trigrams
+
+
+DOCUMENTS = [
+    {'type': 'product', 'id': 1, 'label': 'Печать круглая с оснасткой', 'rank': -4.8},
+    {'type': 'product', 'id': 2, 'label': 'Штамп самонаборный', 'rank': -4.5},
+    {'type': 'product', 'id': 3, 'label': 'Кожаный деловой блокнот', 'rank': -4.9},
+    {'type': 'category', 'id': 'notebooks', 'label': 'Блокноты и журналы', 'rank': -5.0},
+    {'type': 'faq', 'id': 0, 'label': 'Как быстро вы можете изготовить печать или штамп?', 'rank': 0.0},
+]
+
+# Misspelled and truncated queries of the benchmark
+QUERIES = ['штам', 'печадь', 'блакнот', 'степлир кларнадаш', 'ластик', 'канверт']
+
+WORDS = ['ручка', 'блокнот', 'тетрадь', 'маркер', 'папка', 'степлер', 'карандаш', 'ластик',
+         'печать', 'штамп', 'оснастка', 'конверт', 'скрепки', 'линейка', 'пенал', 'клей']
+
+
+def _catalog(size, seed=7):
+    """Synthetic product names with a realistically growing vocabulary."""
+    rnd = random.Random(seed)
+    documents = []
+    for i in range(size):
+        model = ''.join(rnd.choice('абвгдежзиклмнопрстуфхцчшщэюя') for _ in range(rnd.randint(4, 9)))
+        documents.append({
+            'type': 'product',
+            'id': i,
+            'label': f'{rnd.choice(WORDS)} {rnd.choice(WORDS)} {model}',
+            'rank': -rnd.random() * 5,
+        })
+    return documents
+
+
+def test_trigrams():
+    """Words are padded so that short words still have several trigrams"""
+    assert trigrams('шт') == {'  ш', ' шт', 'шт '}
+    assert len(trigrams('штамп')) == 6
+
+
+def test_misspellings():
+    """Truncated and misspelled words find the intended documents"""
+    index = TrigramIndex(DOCUMENTS)
+    labels = lambda q, **kw: [r['label'] for r in index.search(q, **kw)]
+
+    assert labels('штам', types={'product'}) == ['Штамп самонаборный']
+    assert labels('печадь', types={'product'}) == ['Печать круглая с оснасткой']
+    assert labels('блакнот') == ['Кожаный деловой блокнот', 'Блокноты и журналы']
+    assert labels('ШТАМП', types={'faq'}) == ['Как быстро вы можете изготовить печать или штамп?']
+    assert labels('печадь оснаска')[0] == 'Печать круглая с оснасткой'
+    assert index.search('') == [] and index.search('xyzzy') == []
+
+    result = index.search('штамп', limit=1)[0]
+    assert result['id'] == 2 and result['score'] == 1.0
+
+
+def _count_scored(index) -> list:
+    """Make the index note every word id it computes a similarity for."""
+    scored = []
+    index.word_sizes = type('Counting', (list,), {
+        '__getitem__': lambda self, i: (scored.append(i), list.__getitem__(self, i))[1],
+    })(index.word_sizes)
+    return scored
+
+
+def test_prefilter_skips_most_words():
+    """Only words sharing enough trigrams to reach the threshold are scored"""
+    index = TrigramIndex(_catalog(10000))
+    scored = _count_scored(index)
+
+    assert index.similar_words('степлир')
+    assert len(scored) < len(index.words) / 20
+
+
+def test_queries_score_few_words():
+    """Each benchmark query over 10k products scores a tiny fraction of the vocabulary"""
+    index = TrigramIndex(_catalog(10000))
+    scored = _count_scored(index)
+    for q in QUERIES:
+        scored.clear()
+        assert index.search(q, limit=10), q
+        assert len(scored) < len(index.words) / 100, (q, len(scored))
+
+
+def test_follows_source_version():
+    """The index is rebuilt only when the source version changes"""
+    state = {'version': 1, 'documents': DOCUMENTS[:2], 'builds': 0}
+
+    def source():
+        def documents():
+            state['builds'] += 1
+            return state['documents']
+        return state['version'], documents
+
+    search = FuzzySearch(source)
+    assert [r['id'] for r in search.search('штамп')] == [2]
+    search.search('печать')
+    assert state['builds'] == 1
+
+    state['version'], state['documents'] = 2, DOCUMENTS[2:3]
+    assert search.search('штамп') == []
+    assert [r['id'] for r in search.search('блокнот')] == [3]
+    assert state['builds'] == 2
+
+
+def test_site_documents():
+    """Product hits open their page; without a category page, a search for their name"""
+    product = lambda id, name, category: SimpleNamespace(
+        id=id, name=name, category_id=category, price=10.0, image='', rating=4.5, reviews=1,
+        badge='', in_stock=True, description='', featured=False, active=True, sort_order=0,
+    )
+    category = lambda id, url: SimpleNamespace(
+        id=id, name=id, description='', icon='', color='', url=url, sort_order=0, active=True,
+    )
+    catalog_index = CatalogIndex(1, [product(1, 'Штамп', 'stamps'), product(2, 'Клей', 'misc')], [
+        category('stamps', '/products/stamps'), category('misc', ''),
+    ])
+    urls = {(d['type'], d['id']): d['url'] for d in site_documents(catalog_index, {'items': [{'question': '?'}]})}
+    assert urls[('product', 1)] == '/products/stamps/1'
+    assert urls[('product', 2)] == '/products-and-services?q=%D0%9A%D0%BB%D0%B5%D0%B9'
+    assert urls[('faq', 0)] == '/contact#faq-item-0'
+
+
+def benchmark(sizes=(1000, 10000, 100000)):
+    """Print build time and average query time per catalog size."""
+    for size in sizes:
+        start = time.perf_counter()
+        index = TrigramIndex(_catalog(size))
+        built = time.perf_counter() - start
+
+        rounds = 20
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for q in QUERIES:
+                index.search(q, limit=10)
+        elapsed = (time.perf_counter() - start) / (rounds * len(QUERIES))
+        print(f"   {size:>6} products ({len(index.words):>6} words): "
+              f"build {built * 1000:.0f} ms, {elapsed * 1000:.2f} ms per query")
+
+
+if __name__ == '__main__':
+    test_trigrams()
+    test_misspellings()
+    test_prefilter_skips_most_words()
+    test_queries_score_few_words()
+    test_follows_source_version()
+    test_site_documents()
+    benchmark()
+    print("✅ Fuzzy search tests passed")
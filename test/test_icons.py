@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Test the SVG icon sprite: symbols, regeneration and icon references"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.assets import AssetManifest
+from src.services.icons import ICONS, SPRITE_PATH, IconSprite
+
+PEN = ('<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" '
+       'stroke="currentColor" stroke-width="2"><path d="M17 3a2.85 2.83 0 1 1 4 4L7.5 20.5 2 22l1.5-5.5Z"/></svg>')
+
+
+def _sprite(tmp):
+    root = Path(tmp)
+    (root / 'images').mkdir()
+    (root / 'images/pen.svg').write_text(PEN, encoding='utf-8')
+    (root / 'images/illustration.svg').write_text(PEN.replace('</svg>', '<path d="M0 0"/>' * 1000 + '</svg>'), encoding='utf-8')
+    (root / 'images/drawing.svg').write_text(PEN.replace('<path', '<path id="p1"'), encoding='utf-8')
+    return root, IconSprite(AssetManifest(root, check_interval=0))
+
+
+def test_symbols():
+    """Built-in icons and small image files become symbols; illustrations do not"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root, sprite = _sprite(tmp)
+        symbols = sprite.symbols()
+        assert set(ICONS) < set(symbols)
+        assert 'pen' in symbols and 'illustration' not in symbols and 'drawing' not in symbols
+        assert symbols['pen'].startswith('<symbol id="pen" viewBox="0 0 24 24"><g fill="none" stroke="currentColor"')
+
+        written = (root / SPRITE_PATH).read_text(encoding='utf-8')
+        assert written == sprite.sprite() and written.count('<symbol') == len(symbols)
+        assert sprite.image_icon('/assets/images/pen.svg') == 'pen'
+        assert sprite.image_icon('/assets/images/illustration.svg') is None
+
+
+def test_icon_references():
+    """Icons reference the fingerprinted sprite, which follows its content"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root, sprite = _sprite(tmp)
+        markup = str(sprite.icon('star', size=16, cls='rating-star'))
+        url = sprite.url('star')
+        assert markup == f'<svg class="rating-star" width="16" height="16" aria-hidden="true"><use href="{url}"></use></svg>'
+        assert url.startswith('/assets/images/icons.') and url.endswith('.svg#star') and url != '/assets/images/icons.svg#star'
+
+        labelled = str(sprite.icon('pen', label='Ручки & карандаши', style='color: #3b82f6;'))
+        assert 'role="img" aria-label="Ручки &amp; карандаши"' in labelled and 'aria-hidden' not in labelled
+
+        # A new image changes the sprite and so its URL
+        (root / 'images/stamp.svg').write_text(PEN, encoding='utf-8')
+        os.utime(root / 'images/stamp.svg', (2_000_000, 2_000_000))
+        assert sprite.has('stamp')
+        assert sprite.url('star') != url
+        assert '<symbol id="stamp"' in (root / SPRITE_PATH).read_text(encoding='utf-8')
+
+
+if __name__ == '__main__':
+    test_symbols()
+    test_icon_references()
+    print("✅ Icon sprite tests passed")
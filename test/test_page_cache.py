@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Test the in-process page cache: hits, version invalidation, LRU bounds, opt-outs and validators"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from email.utils import formatdate
+
+from src.middleware.page_cache import PageCache, CachedPage, Validators, make_etag
+
+
+def _page(version, body=b'<html></html>'):
+    return CachedPage(version, 200, [(b'content-type', b'text/html; charset=utf-8')], body)
+
+
+def test_hit_and_version_invalidation():
+    """A page is served until the content version changes"""
+    version = {'v': 1}
+    cache = PageCache(version_func=lambda: version['v'], version_ttl=0)
+
+    assert cache.get('/') is None
+    cache.put('/', _page(cache.current_version()))
+    assert cache.get('/') is not None
+
+    version['v'] = 2
+    assert cache.get('/') is None
+    assert cache.stats()['entries'] == 0
+    assert cache.hits == 1 and cache.misses == 2
+
+
+def test_lru_bounds():
+    """Least recently used pages are evicted by count and by size"""
+    cache = PageCache(version_func=lambda: 1, max_entries=2, max_bytes=100)
+
+    cache.put('/a', _page(1))
+    cache.put('/b', _page(1))
+    cache.get('/a')
+    cache.put('/c', _page(1))
+    assert cache.get('/b') is None
+    assert cache.get('/a') is not None
+
+    cache.put('/big', _page(1, b'x' * 90))
+    assert cache.stats()['bytes'] <= 100
+    assert cache.evictions >= 2
+
+
+def test_excluded_paths():
+    """Admin pages and the contact form handler are never cached"""
+    cache = PageCache(version_func=lambda: 1)
+    assert cache.is_cacheable_path('/')
+    assert cache.is_cacheable_path('/about')
+    assert not cache.is_cacheable_path('/contact/submit')
+    assert not cache.is_cacheable_path('/admin/submissions/3')
+
+    cache.exclude('/featured-products')
+    assert not cache.is_cacheable_path('/featured-products')
+
+
+def test_conditional_validators():
+    """If-None-Match wins over If-Modified-Since; weak tags match too"""
+    etag = make_etag(b'<html></html>')
+    validators = Validators(1, etag, 1_700_000_000.0, [])
+
+    assert validators.matches(etag, None)
+    assert validators.matches(f'"other", W/{etag}', None)
+    assert validators.matches('*', None)
+    assert not validators.matches('"other"', None)
+    assert not validators.matches('"other"', formatdate(1_800_000_000, usegmt=True))
+
+    assert validators.matches(None, formatdate(1_700_000_000, usegmt=True))
+    assert not validators.matches(None, formatdate(1_600_000_000, usegmt=True))
+    assert not validators.matches(None, 'not a date')
+    assert not validators.matches(None, None)
+
+
+def test_validators_follow_version():
+    """Validators from an older content version are not used for 304s"""
+    version = {'v': 1}
+    cache = PageCache(version_func=lambda: version['v'], version_ttl=0)
+    cache.put_validators('/', Validators(1, '"a"', 100.0, []))
+    assert cache.get_validators('/') is not None
+
+    version['v'] = 2
+    assert cache.get_validators('/') is None
+
+    # Same bytes under a new version keep the original Last-Modified
+    kept = cache.put_validators('/', Validators(2, '"a"', 200.0, []))
+    assert kept.last_modified == 100.0
+
+
+if __name__ == '__main__':
+    test_hit_and_version_invalidation()
+    test_lru_bounds()
+    test_excluded_paths()
+    test_conditional_validators()
+    test_validators_follow_version()
+    print("✅ Page cache tests passed")
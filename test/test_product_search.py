@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Test FTS5 product search: Russian normalization, index sync, ranking and query plan
+
+Run directly to also print the 20k products benchmark.
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from src.models import Category, Product
+from src.services.catalog import CatalogIndex
+from src.services.product_search import SEARCH_SQL, ProductSearch, create_search_tables
+from src.services.text import fold, highlight, terms
+
+
+class DbCatalog:
+    """Catalog stand-in that builds the index straight from the database"""
+
+    def __init__(self, engine, version):
+        self.engine = engine
+        self.version = version
+
+    @property
+    def index(self):
+        with Session(self.engine) as session:
+            return CatalogIndex(self.version['v'], session.exec(select(Product)).all(), [])
+
+
+def _search(products):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    create_search_tables(engine)
+    with Session(engine) as session:
+        session.add(Category(id='pens', name='Ручки'))
+        session.commit()
+    # Plain row inserts keep the 20k-row setup fast
+    with engine.begin() as conn:
+        conn.execute(Product.__table__.insert(), [p if isinstance(p, dict) else p.model_dump() for p in products])
+
+    version = {'v': 1}
+    catalog = DbCatalog(engine, version)
+    search = ProductSearch(engine=engine, read_engine=engine, version_func=lambda: version['v'], catalog=catalog)
+    search.ensure_synced()
+    return search, engine, version
+
+
+def _product(id, name, description='', **fields):
+    return Product(id=id, name=name, description=description, category_id='pens', price=10, image='', **fields)
+
+
+def test_normalization():
+    """Case folding, ё→е and stemming map word forms to one term"""
+    assert fold('ЁЛКА') == 'елка'
+    assert terms('Ручка ручки РУЧКОЙ ручек') == ['ручк'] * 4
+    assert terms('перьевая перьевых') == ['перьев', 'перьев']
+    assert terms('A4 pens') == ['a4', 'pens']
+    assert highlight('Набор <гелевых> ручек', terms('ручка')) == 'Набор &lt;гелевых&gt; <mark>ручек</mark>'
+
+
+def test_search_ranking_and_sync():
+    """Name matches outrank description matches; edits and deletes are picked up"""
+    search, engine, version = _search([
+        _product(1, 'Блокнот в клетку', 'Подходит для заметок ручкой'),
+        _product(2, 'Набор перьевых ручек', 'Для каллиграфии'),
+        _product(3, 'Ручка скрытая', active=False),
+    ])
+
+    results = search.search('ручка')
+    assert [r['id'] for r in results] == [2, 1]
+    assert results[1]['snippet'] == 'Подходит для заметок <mark>ручкой</mark>'
+    assert search.search_ids('Ёлочная') == []
+
+    # Update and delete, then bump the catalog version
+    with Session(engine) as session:
+        product = session.get(Product, 1)
+        product.name = 'Ёлочная игрушка'
+        product.description = ''
+        product.updated_at = datetime.utcnow() + timedelta(seconds=1)
+        session.add(product)
+        session.delete(session.get(Product, 2))
+        session.commit()
+    version['v'] = 2
+
+    # Requests only query; the indexer picks the change up
+    assert search.search_ids('елочные') == []
+    search.ensure_synced()
+    assert search.search_ids('елочные') == [1]
+    assert search.search_ids('ручка') == []
+    assert search.rebuilds == 0 and search.syncs == 2
+
+
+def test_indexer_task():
+    """run() syncs on start and on catalog changes until stopped"""
+    search, engine, version = _search([_product(1, 'Блокнот')])
+
+    async def scenario():
+        task = asyncio.create_task(search.run(poll_interval=0.01))
+        await asyncio.sleep(0.05)
+        with engine.begin() as conn:
+            conn.execute(Product.__table__.insert(), [_product(2, 'Степлер').model_dump()])
+        version['v'] = 2
+        for _ in range(100):
+            if search.search_ids('степлер'):
+                break
+            await asyncio.sleep(0.01)
+        search.stop()
+        await asyncio.wait_for(task, timeout=1)
+
+    asyncio.run(scenario())
+    assert search.search_ids('степлер') == [2] and search.syncs == 2
+
+
+def test_grid_uses_search_order():
+    """The catalog query keeps the search ranking with the default sort"""
+    rows = [
+        SimpleNamespace(id=i, name=f'Товар {i}', category_id='pens', price=float(i), image='', rating=4.0,
+                        reviews=0, badge='', in_stock=True, description='', featured=False, active=True, sort_order=i)
+        for i in range(1, 5)
+    ]
+    index = CatalogIndex(1, rows, [])
+    assert [p['id'] for p in index.query(ids=[3, 1, 9]).items] == [3, 1]
+    assert [p['id'] for p in index.query(ids=[3, 1], sort='price-asc').items] == [1, 3]
+
+
+def _catalog(size):
+    words = ['ручка', 'блокнот', 'тетрадь', 'маркер', 'папка', 'степлер', 'карандаш', 'ластик']
+    now = datetime.utcnow()
+    return [
+        dict(id=i, name=f'{words[i % len(words)]} модель {i}', description=f'Описание товара номер {i} для офиса',
+             category_id='pens', price=10.0, image='', rating=0.0, reviews=0, badge='', in_stock=True,
+             featured=False, active=True, sort_order=0, created_at=now, updated_at=now)
+        for i in range(1, size + 1)
+    ]
+
+
+def test_query_uses_fts_index():
+    """Searches are answered from the FTS index, with products looked up by primary key"""
+    search, engine, _ = _search(_catalog(1000))
+    assert len(search.search_ids('степлеры', limit=20)) == 20
+
+    with engine.connect() as conn:
+        plan = [row[-1] for row in conn.execute(
+            text(f"EXPLAIN QUERY PLAN {SEARCH_SQL}"), {'match': search.match_expression('степлеры'), 'limit': 20},
+        )]
+    assert any('VIRTUAL TABLE INDEX' in step for step in plan), plan
+    assert any('INTEGER PRIMARY KEY' in step for step in plan), plan
+    assert not any(step.startswith('SCAN p') or step.startswith('SCAN products') for step in plan), plan
+
+
+def benchmark(size=20000):
+    """Print the average search time over ``size`` products."""
+    search, _, _ = _search(_catalog(size))
+    start = time.perf_counter()
+    for _ in range(20):
+        search.search_ids('степлеры', limit=20)
+    elapsed = (time.perf_counter() - start) / 20
+    print(f"   {size // 1000}k products: {elapsed * 1000:.2f} ms per search")
+
+
+if __name__ == '__main__':
+    test_normalization()
+    test_search_ranking_and_sync()
+    test_grid_uses_search_order()
+    test_indexer_task()
+    test_query_uses_fts_index()
+    benchmark()
+    print("✅ Product search tests passed")
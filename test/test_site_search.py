@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Test the site content index: page documents, phrase queries, reload and serialization"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.data_store import DATA_FILES, DataStore
+from src.services.site_search import SEARCH_PAGES, SiteIndex, SiteSearch, page_documents, parse_query
+
+
+CLIENTS = """
+title: "Клиентам | Бюрократ"
+intro: "Информация для клиентов"
+sections:
+  - id: delivery
+    heading: "Доставка"
+    paragraphs:
+      - "Мы осуществляем доставку по Барнаулу."
+  - id: warranty
+    heading: "Гарантия"
+    paragraphs:
+      - "Гарантия на печати и штампы. Печати служат долго."
+"""
+
+FAQ = """
+title: "Часто задаваемые вопросы"
+items:
+  - question: "Можно ли заказать доставку?"
+    answer: "Да, доставка по городу."
+  - question: "Есть ли гарантия?"
+    answer: "Да, на печати и оснастки."
+"""
+
+ABOUT = """
+title: "О нас | Бюрократ"
+story:
+  heading: "Наша история"
+  paragraphs:
+    - "Семейный бизнес с 1999 года."
+expertise:
+  items:
+    - icon: "🎯"
+      title: "Мастерство"
+"""
+
+
+def _write(path, text, mtime):
+    path.write_text(text, encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+
+def _store(tmp):
+    for key in SEARCH_PAGES:
+        _write(tmp / DATA_FILES[key], 'title: ""\n', 1_000_000)
+    _write(tmp / 'clients.yaml', CLIENTS, 1_000_000)
+    _write(tmp / 'faq.yaml', FAQ, 1_000_000)
+    _write(tmp / 'about.yaml', ABOUT, 1_000_000)
+    return DataStore(tmp, check_interval=0)
+
+
+def test_page_documents():
+    """Anchored sections become documents linking to route#anchor"""
+    import yaml
+    docs = page_documents('clients', yaml.safe_load(CLIENTS))
+    assert [d['url'] for d in docs] == ['/clients', '/clients#delivery', '/clients#warranty']
+    assert docs[1]['title'] == 'Доставка' and docs[1]['page_title'] == 'Клиентам'
+
+    docs = page_documents('faq', yaml.safe_load(FAQ))
+    assert [d['url'] for d in docs] == ['/contact#faq-item-0', '/contact#faq-item-1']
+
+    # No anchors: one document for the page, without icons
+    [doc] = page_documents('about', yaml.safe_load(ABOUT))
+    assert doc['url'] == '/about' and 'Мастерство' in doc['text'] and '🎯' not in doc['text']
+
+
+def test_phrases_and_ranking():
+    """Words must all match, quoted phrases must be consecutive, titles rank first"""
+    assert parse_query('доставка "гарантия на печати"') == [['доставк'], ['гарант', 'на', 'печат']]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        search = SiteSearch(_store(Path(tmp)))
+        urls = lambda q: [r['url'] for r in search.search(q)]
+
+        assert urls('гарантии')[0] == '/clients#warranty'
+        assert urls('доставку') == ['/clients#delivery', '/contact#faq-item-0']
+        assert urls('"гарантия на печати"') == ['/clients#warranty']
+        assert urls('"на гарантия печати"') == []
+        assert urls('гарантия оснастки') == ['/contact#faq-item-1']
+        assert urls('') == []
+        assert '<mark>доставку</mark>' in search.search('доставка')[0]['snippet']
+
+
+def test_rebuilt_on_reload():
+    """A reloaded data file is searchable right away"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        search = SiteSearch(_store(tmp))
+        assert search.search('самовывоз') == []
+        index = search.index
+        assert search.index is index
+
+        _write(tmp / 'clients.yaml', CLIENTS.replace('по Барнаулу', 'и самовывоз'), 2_000_000)
+        assert [r['url'] for r in search.search('самовывоз')] == ['/clients#delivery']
+        assert search.index is not index
+
+
+def test_serialization():
+    """The index round-trips through JSON and splits into shards by first letter"""
+    with tempfile.TemporaryDirectory() as tmp:
+        index = SiteSearch(_store(Path(tmp))).index
+
+    restored = SiteIndex.from_dict(json.loads(json.dumps(index.to_dict(), ensure_ascii=False)))
+    for q in ['доставка', '"гарантия на печати"', 'семейный бизнес']:
+        assert restored.search(q) == index.search(q)
+
+    manifest, shards = index.shards()
+    assert 'postings' not in manifest and len(manifest['documents']) == len(index)
+    assert manifest['shards'] == sorted(shards)
+    assert 'доставк' in shards['434']  # д = U+0434
+    assert sum(len(s) for s in shards.values()) == len(index.postings)
+
+
+if __name__ == '__main__':
+    test_page_documents()
+    test_phrases_and_ranking()
+    test_rebuilt_on_reload()
+    test_serialization()
+    print("✅ Site search tests passed")
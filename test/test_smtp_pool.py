@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Test SMTP connection reuse: one login per burst, NOOP liveness, idle timeout, stale recovery"""
+
+import smtplib
+import socket
+import sys
+import time
+from email.mime.text import MIMEText
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.email_service import SMTPConnectionPool
+
+
+class FakeSMTP:
+    """Records sends; can be told the server dropped the connection"""
+
+    def __init__(self):
+        self.sent = 0
+        self.dropped = False
+        self.closed = False
+
+    def noop(self):
+        if self.dropped:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        return (250, b'OK')
+
+    def send_message(self, msg):
+        if self.dropped:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent += 1
+
+    def quit(self):
+        self.closed = True
+
+    close = quit
+
+
+def _message():
+    msg = MIMEText("Нужна печать", 'plain', 'utf-8')
+    msg['Subject'] = "[FORM] Заказ"
+    msg['From'] = 'form@burokrat.site'
+    msg['To'] = 'office@burokrat.site'
+    return msg
+
+
+def test_reuse_and_recovery():
+    """A burst reuses one connection; dropped and expired connections are replaced"""
+    connections = []
+
+    def connect():
+        connections.append(FakeSMTP())
+        return connections[-1]
+
+    pool = SMTPConnectionPool(connect, idle_timeout=60)
+    for _ in range(10):
+        pool.send(_message())
+    assert pool.connections_opened == 1 and pool.messages_sent == 10
+    assert connections[0].sent == 10
+
+    # Dropped while idle: NOOP fails, a new connection is opened
+    connections[0].dropped = True
+    pool.send(_message())
+    assert pool.connections_opened == 2 and pool.stale_recovered == 1
+    assert connections[0].closed
+
+    # Dropped between NOOP and send: the send is retried once
+    pool._is_alive = lambda server: True
+    connections[1].dropped = True
+    pool.send(_message())
+    assert pool.connections_opened == 3 and pool.messages_sent == 12
+    assert connections[2].sent == 1
+
+    # Idle longer than the timeout: closed instead of reused
+    pool.idle_timeout = 0.01
+    time.sleep(0.02)
+    pool.send(_message())
+    assert pool.connections_opened == 4 and connections[2].closed
+    assert pool.close_idle() == 1 and connections[3].closed
+
+
+def test_smtp_server_burst():
+    """Against a real SMTP server a burst of messages logs in only once"""
+    try:
+        from aiosmtpd.controller import Controller
+        from aiosmtpd.smtp import AuthResult
+    except ImportError:
+        print("⚠️  aiosmtpd not installed, skipping SMTP server test")
+        return
+
+    from src.services.email_service import EmailService
+
+    class Handler:
+        def __init__(self):
+            self.messages = []
+
+        async def handle_DATA(self, server, session, envelope):
+            self.messages.append(envelope)
+            return '250 OK'
+
+    logins = []
+
+    def authenticator(*args):
+        logins.append(args)
+        return AuthResult(success=True)
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    handler = Handler()
+
+    def start():
+        controller = Controller(
+            handler, hostname='127.0.0.1', port=port,
+            authenticator=authenticator, auth_require_tls=False,
+        )
+        controller.start()
+        return controller
+
+    controller = start()
+    try:
+        service = EmailService()
+        service.smtp_host, service.smtp_port = '127.0.0.1', port
+        service.security = 'none'
+        service.smtp_username, service.smtp_password = 'form', 'secret'
+        service.from_email, service.to_email = 'form@burokrat.site', 'office@burokrat.site'
+        form = {'name': "Иван", 'email': 'ivan@example.com', 'subject': "Заказ", 'message': "Нужна печать"}
+
+        for _ in range(5):
+            assert service.send_contact_form_email(form)[0]
+        assert len(handler.messages) == 5 and len(logins) == 1
+        assert service.pool.stats()['connections_opened'] == 1
+
+        # Server restart drops the pooled connection; the next send reconnects
+        controller.stop()
+        controller = start()
+        assert service.send_contact_form_email(form)[0]
+        assert len(handler.messages) == 6 and len(logins) == 2
+        assert service.pool.stats()['stale_recovered'] == 1
+        service.close_idle_connections()
+    finally:
+        controller.stop()
+
+
+if __name__ == '__main__':
+    test_reuse_and_recovery()
+    test_smtp_server_burst()
+    print("✅ SMTP connection pool tests passed")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Test read-only config data and per-request overlays"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.snapshot import freeze, overlay
+
+
+def _raises_type_error(fn):
+    try:
+        fn()
+    except TypeError:
+        return True
+    return False
+
+
+def test_frozen_data_is_read_only():
+    """Frozen YAML data rejects writes but still looks like dicts and lists"""
+    data = freeze({'title': 'Бюрократ', 'items': [{'label': 'С 1998 года'}]})
+
+    assert isinstance(data, dict) and isinstance(data['items'], list)
+    assert json.loads(json.dumps(data)) == {'title': 'Бюрократ', 'items': [{'label': 'С 1998 года'}]}
+    assert _raises_type_error(lambda: data.__setitem__('title', 'x'))
+    assert _raises_type_error(lambda: data['items'].append({}))
+    assert _raises_type_error(lambda: data['items'][0].update(label='x'))
+
+    # Copies are ordinary mutable containers
+    copy = data.copy()
+    copy['title'] = 'x'
+    assert data['title'] == 'Бюрократ'
+
+
+def test_overlay_does_not_touch_base():
+    """Overlays add per-request fields without modifying shared data"""
+    base = freeze({'title': 'Товары', 'products': []})
+    view = overlay(base, products=[{'id': 1}], categories=[])
+
+    assert view['title'] == 'Товары'
+    assert view['products'] == [{'id': 1}]
+    assert view.get('categories') == []
+    assert base['products'] == [] and 'categories' not in base
+    assert _raises_type_error(lambda: view.__setitem__('title', 'x'))
+    assert dict(view.copy()) == {'title': 'Товары', 'products': [{'id': 1}], 'categories': []}
+
+
+if __name__ == '__main__':
+    test_frozen_data_is_read_only()
+    test_overlay_does_not_touch_base()
+    print("✅ Snapshot tests passed")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Test in-process page rendering of build_static.py"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fasthtml.common import Div, P, Titled, fast_app
+from starlette.testclient import TestClient
+
+import build_static
+from src.routes.static_export import static_params
+
+
+@static_params('/items/{slug}')
+def _item_params():
+    yield {'slug': 'pens'}
+    yield {'slug': 'pencils'}
+
+
+def _app():
+    app, rt = fast_app(live=False)
+
+    @rt('/')
+    def get():
+        return Titled('Home', P('Welcome'))
+
+    @rt('/items/{slug}')
+    def get(slug: str, q: str = ''):
+        return Titled(slug, Div(q, cls='query'))
+
+    return app
+
+
+def test_render_matches_http():
+    """Calling handlers in-process gives the bytes an HTTP request would"""
+    app = _app()
+    build_static._app = app
+    client = TestClient(app, base_url='http://localhost')
+    for route in ('/', '/items/pens', '/items/pens?q=blue'):
+        filename, status, html, seconds, reads = build_static.render_page(route, 'page.html')
+        assert (filename, status) == ('page.html', 200)
+        assert html == client.get(route).text
+        assert seconds >= 0
+    assert '<div class="query">blue</div>' in build_static.render_page('/items/pens?q=blue', 'x')[2]
+
+
+def test_render_failures():
+    """Unknown routes and raising handlers are reported, not raised"""
+    app = _app()
+
+    @app.route('/broken')
+    def get():
+        raise ValueError('no data')
+
+    build_static._app = app
+    assert build_static.render_page('/missing', 'missing.html')[1] == 404
+    _, status, message, _, _ = build_static.render_page('/broken', 'broken.html')
+    assert status is None and 'no data' in message
+
+
+def test_render_pages_serial():
+    """One worker renders in-process, in page order"""
+    build_static._app = _app()
+    rendered, timings, reads = build_static.render_pages([('/', 'index.html'), ('/missing', 'missing.html')], 1)
+    assert list(rendered) == ['index.html'] and reads == {'index.html': []}
+    assert [(filename, status) for filename, status, _ in timings] == [('index.html', 200), ('missing.html', 404)]
+
+
+def test_render_records_reads():
+    """A page's inputs are the data files and catalog its handler read"""
+    app, rt = fast_app(live=False)
+
+    @rt('/about')
+    def get():
+        from src.config import get_about_data
+        from src.services.catalog import get_catalog
+        get_about_data()
+        get_catalog().index
+        return P('About')
+
+    @rt('/faq')
+    def get():
+        from src.config import get_faq_data
+        get_faq_data()
+        return P('FAQ')
+
+    build_static._app = app
+    assert build_static.render_page('/about', 'about.html')[4] == ['about', build_static.CATALOG_INPUT]
+    assert build_static.render_page('/faq', 'faq.html')[4] == ['faq']
+
+
+def test_discover_pages():
+    """GET routes are found, expanded with their parameters or left out"""
+    app = _app()
+
+    @app.route('/admin/stats')
+    def get():
+        return P('private')
+
+    @app.route('/orders/{id}')
+    def get(id: int):
+        return P(id)
+
+    assert build_static.discover_pages(app) == [
+        ('/', 'index.html'),
+        ('/items/pens', 'items/pens.html'),
+        ('/items/pencils', 'items/pencils.html'),
+    ]
+
+
+def test_dedupe_pages():
+    """Routes rendering an earlier page are served from its file"""
+    pages = [('/privacy-statement', 'privacy-statement.html'), ('/privacy', 'privacy.html'),
+             ('/about', 'about.html'), ('/broken', 'broken.html')]
+    rendered = {'privacy-statement.html': 'policy', 'privacy.html': 'policy', 'about.html': 'about'}
+    files, routes = build_static.dedupe_pages(pages, rendered)
+    assert files == {'privacy-statement.html': 'policy', 'about.html': 'about'}
+    assert routes == {'/privacy-statement': 'privacy-statement.html', '/privacy': 'privacy-statement.html',
+                      '/about': 'about.html'}
+
+
+def test_snapshot_database_includes_wal():
+    """Commits still in the -wal file make it into the copied database"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / 'shop.db'
+        writer = sqlite3.connect(db)
+        writer.execute("PRAGMA journal_mode=WAL")
+        writer.execute("PRAGMA wal_autocheckpoint=0")
+        writer.execute("CREATE TABLE products (name TEXT)")
+        writer.execute("INSERT INTO products VALUES ('ручка')")
+        writer.commit()
+        assert (Path(tmp) / 'shop.db-wal').stat().st_size > 0
+
+        build_static.snapshot_database(db, Path(tmp) / 'a.db')
+        build_static.snapshot_database(db, Path(tmp) / 'b.db')
+        writer.close()
+
+        copy = sqlite3.connect(Path(tmp) / 'a.db')
+        assert copy.execute("SELECT name FROM products").fetchall() == [('ручка',)]
+        assert copy.execute("PRAGMA journal_mode").fetchone() == ('delete',)
+        copy.close()
+        # Same content, same bytes: incremental builds leave the copy alone
+        assert (Path(tmp) / 'a.db').read_bytes() == (Path(tmp) / 'b.db').read_bytes()
+
+
+if __name__ == '__main__':
+    test_render_matches_http()
+    test_render_failures()
+    test_render_pages_serial()
+    test_render_records_reads()
+    test_discover_pages()
+    test_dedupe_pages()
+    test_snapshot_database_includes_wal()
+    print("✅ Static build rendering tests passed")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Test typeahead suggestions: prefix matching, ranking, bulk and incremental updates
+
+Run directly to also print the 10k products benchmark.
+"""
+
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.catalog import CatalogIndex
+from src.services.typeahead import TypeaheadIndex
+
+
+def _product(id, name, rating=4.0, reviews=10, category='pens', active=True):
+    return SimpleNamespace(
+        id=id, name=name, category_id=category, price=10.0, image='', rating=rating, reviews=reviews,
+        badge='', in_stock=True, description='', featured=False, active=active, sort_order=0,
+    )
+
+
+def _category(id, name, url=''):
+    return SimpleNamespace(id=id, name=name, description='', icon='', color='', url=url, sort_order=0, active=True)
+
+
+CATEGORIES = [_category('all', 'Все товары'), _category('pens', 'Ручки и карандаши', '/products/pens')]
+
+
+def test_prefix_and_ranking():
+    """Any word of a name can be completed; better rated, more reviewed first"""
+    index = TypeaheadIndex()
+    index.update(CatalogIndex(1, [
+        _product(1, 'Набор перьевых ручек', rating=4.9, reviews=124),
+        _product(2, 'Гелевая ручка', rating=4.9, reviews=300),
+        _product(3, 'Ручка шариковая', rating=4.1),
+        _product(4, 'Скрытая ручка', rating=5.0, active=False),
+    ], CATEGORIES))
+
+    labels = lambda rows: [r['label'] for r in rows]
+    # Category "Ручки и карандаши" ranks by its best product (4.9, 434 reviews)
+    assert labels(index.suggest('ру')) == ['Ручки и карандаши', 'Гелевая ручка', 'Набор перьевых ручек', 'Ручка шариковая']
+    assert labels(index.suggest('РУЧКА')) == ['Гелевая ручка', 'Ручка шариковая']
+    assert labels(index.suggest('ручек пер')) == ['Набор перьевых ручек']
+    assert labels(index.suggest('ру', limit=2)) == ['Ручки и карандаши', 'Гелевая ручка']
+    assert index.suggest('') == [] and index.suggest('все') == []
+    assert index.suggest('гел')[0]['url'] == '/products/pens/2'
+
+
+def test_product_urls():
+    """Products open their page; without a category page, a search for their name"""
+    index = TypeaheadIndex()
+    index.update(CatalogIndex(1, [_product(1, 'Гелевая ручка'), _product(2, 'Ластик', category='misc')], [
+        *CATEGORIES, _category('misc', 'Разное'),
+    ]))
+    assert index.suggest('гел')[0]['url'] == '/products/pens/1'
+    assert index.suggest('лас')[0]['url'] == '/products-and-services?q=%D0%9B%D0%B0%D1%81%D1%82%D0%B8%D0%BA'
+
+
+def test_incremental_update():
+    """Only changed rows are re-indexed and short-prefix tables follow them"""
+    products = [_product(i, f'Блокнот {i}', rating=4.0) for i in range(1, 6)]
+    index = TypeaheadIndex()
+    assert index.update(CatalogIndex(1, products, CATEGORIES)) == 6
+
+    products[0] = _product(1, 'Маркер', rating=5.0)
+    products.append(_product(6, 'Блокнот премиум', rating=4.8))
+    assert index.update(CatalogIndex(2, products, CATEGORIES)) == 3  # product 1, product 6, pens ranking
+
+    assert index.suggest('м')[0]['label'] == 'Маркер'
+    assert index.suggest('бл')[0]['label'] == 'Блокнот премиум'
+    assert 'Блокнот 1' not in [r['label'] for r in index.suggest('бло', limit=10)]
+
+
+def _words_catalog(size):
+    words = ['ручка', 'блокнот', 'тетрадь', 'маркер', 'папка', 'степлер', 'карандаш', 'ластик']
+    return [
+        _product(i, f'{words[i % len(words)]} {words[(i // 8) % len(words)]} {i}', rating=(i % 50) / 10, reviews=i)
+        for i in range(1, size + 1)
+    ]
+
+
+def test_bulk_and_incremental_builds_agree():
+    """Sorting the word list once gives the index that in-place inserts and deletes give"""
+    products = _words_catalog(200)
+    bulk = TypeaheadIndex()
+    bulk.update(CatalogIndex(1, products, CATEGORIES))
+
+    incremental = TypeaheadIndex()
+    incremental.update(CatalogIndex(1, products[:-5] + [_product(999, 'Временный')], CATEGORIES))
+    # 6 of 201 entries change: under BULK_UPDATE_SHARE, so the in-place path runs
+    assert incremental.update(CatalogIndex(2, products, CATEGORIES)) == 7
+
+    assert incremental._keys == bulk._keys and incremental._key_entries == bulk._key_entries
+    assert incremental._top == bulk._top and incremental._order == bulk._order
+    assert bulk._keys == sorted(bulk._keys)
+    assert [k for _, k in bulk._keys] == bulk._key_entries
+
+
+def test_single_words_are_precomputed():
+    """Typed words up to PRECOMPUTED_PREFIX letters are answered from the precomputed table"""
+    index = TypeaheadIndex()
+    index.update(CatalogIndex(1, _words_catalog(1000), CATEGORIES))
+    for prefix in ('р', 'ру', 'руч', 'ручка', 'степ'):
+        assert index.suggest(prefix, limit=10) == [index._entries[k] for k in index._top[prefix]]
+    assert 'x' not in index._top and index.suggest('x') == []
+
+
+def benchmark(size=10000):
+    """Print the build time and the average suggestion time over ``size`` products."""
+    products = _words_catalog(size)
+    start = time.perf_counter()
+    index = TypeaheadIndex()
+    index.update(CatalogIndex(1, products, CATEGORIES))
+    built = time.perf_counter() - start
+
+    queries = ['р', 'ру', 'руч', 'ручка', 'ручка бл', 'степ', 'ластик кар', 'x']
+    start = time.perf_counter()
+    for _ in range(50):
+        for q in queries:
+            index.suggest(q)
+    elapsed = (time.perf_counter() - start) / (50 * len(queries))
+    print(f"   {size} products: build {built * 1000:.0f} ms, {elapsed * 1e6:.0f} µs per suggestion")
+
+
+if __name__ == '__main__':
+    test_prefix_and_ranking()
+    test_product_urls()
+    test_incremental_update()
+    test_bulk_and_incremental_builds_agree()
+    test_single_words_are_precomputed()
+    benchmark()
+    print("✅ Typeahead tests passed")